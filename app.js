@@ -15,221 +15,450 @@ const els = {
   modalTitle: document.getElementById("modal-titulo"),
   modalInfo: document.getElementById("modal-info"),
   modalDescripcion: document.getElementById("modal-descripcion"),
+  precioMin: document.getElementById("precio-min"),
+  precioMax: document.getElementById("precio-max"),
 };
 
-let remates = [];
-let rematesFiltrados = [];
+const DATASET_URL = "data/remates.json";
+const SHARDS_MANIFEST_URL = "data/shards/manifest.json";
+// Versión vigente y deltas: el worker guarda los datos en IndexedDB y al
+// volver solo descarga lo que cambió
+const VERSIONES_URL = "data/deltas/manifest.json";
+// Conteos por tipo, región, comuna y mes: basta para armar los filtros
+// sin esperar al dataset
+const FACETAS_URL = "data/remates.facets.json";
+// Espera tras la última tecla antes de consultar
+const ESPERA_ESCRITURA = 200;
+
+// El filtrado corre en filtros-worker.js; esta página solo pinta
+const motor = new Worker("filtros-worker.js");
+
+// Ids (filas de la tabla del worker) que cumplen los filtros, en el orden
+// en que se muestran
+let idsFiltrados = new Uint32Array(0);
+// Objetos de las filas ya recibidas del worker, por id
+const filasRecibidas = new Map();
+const filasPedidas = new Set();
+// Cada consulta lleva un id creciente; los resultados de una consulta
+// anterior se descartan
+let consultaActual = 0;
+let ultimosFiltros = "";
+let temporizadorConsulta = 0;
+// Resumen de facetas; mientras no llegue (o si no existe) los selects se
+// llenan con las opciones que manda el worker, sin conteos
+let facetas = null;
+let opcionesMotor = null;
+
+motor.addEventListener("message", (event) => {
+  const mensaje = event.data;
+  if (mensaje.tipo === "resultado") {
+    if (mensaje.id !== consultaActual) return;
+    guardarFilas(mensaje.filas);
+    idsFiltrados = mensaje.ids;
+    renderizarResultados(mensaje.parcial);
+  } else if (mensaje.tipo === "filas") {
+    guardarFilas(mensaje.filas);
+    programarPintado();
+  } else if (mensaje.tipo === "opciones") {
+    opcionesMotor = mensaje;
+    if (!facetas) poblarFiltros();
+  } else if (mensaje.tipo === "actualizacion") {
+    mostrarActualizacion(mensaje.updatedAt);
+  } else if (mensaje.tipo === "error") {
+    mostrarError(mensaje.mensaje);
+  }
+});
 
-// --- Cargar datos desde data/remates.json --- //
-async function cargarDatos() {
-  try {
-    const res = await fetch("data/remates.json");
-    if (!res.ok) throw new Error(`HTTP ${res.status}`);
-
-    const payload = await res.json();
-
-    // Soportar dos formatos:
-    // - array simple
-    // - objeto { records: [...] }
-    if (Array.isArray(payload)) {
-      remates = payload;
-    } else if (Array.isArray(payload.records)) {
-      remates = payload.records;
-    } else {
-      remates = [];
-    }
+function guardarFilas(filas) {
+  filas.forEach(([id, r]) => {
+    filasRecibidas.set(id, r);
+    filasPedidas.delete(id);
+  });
+}
 
-    rematesFiltrados = [...remates];
+// Pide al worker las filas que faltan para pintar (una sola vez cada una)
+function pedirFilas(ids) {
+  const faltan = ids.filter((id) => !filasPedidas.has(id));
+  if (!faltan.length) return;
+  faltan.forEach((id) => filasPedidas.add(id));
+  motor.postMessage({ tipo: "filas", ids: faltan });
+}
 
-    poblarFiltros();
-    renderizarResultados();
+// --- Cargar datos --- //
+// El worker carga los shards (si hay manifiesto) o data/remates.json
+function cargarDatos() {
+  const base = window.location.href;
+  motor.postMessage({
+    tipo: "iniciar",
+    datasetUrl: new URL(DATASET_URL, base).href,
+    manifestUrl: new URL("data/remates.manifest.json", base).href,
+    shardsManifestUrl: new URL(SHARDS_MANIFEST_URL, base).href,
+    versionesUrl: new URL(VERSIONES_URL, base).href,
+  });
+  cargarFacetas();
+  aplicarFiltros();
+}
 
-    if (payload.updated_at && els.lastUpdate) {
-      els.lastUpdate.textContent = `Actualizado: ${payload.updated_at}`;
-    }
+async function cargarFacetas() {
+  try {
+    const res = await fetch(FACETAS_URL, { cache: "no-cache" });
+    if (!res.ok) return;
+    facetas = await res.json();
   } catch (err) {
-    console.error(err);
-    if (els.error) {
-      els.error.style.display = "block";
-      els.error.textContent =
-        "No se pudo cargar data/remates.json. Verifica que exista y tenga formato correcto.";
-    }
+    console.warn("No se pudo cargar el resumen de facetas", err);
+    return;
+  }
+  poblarFiltros();
+  limitarFechas();
+}
+
+function mostrarError(texto) {
+  if (!els.error) return;
+  els.error.style.display = "block";
+  els.error.textContent = texto;
+}
+
+// --- Fecha de actualización --- //
+function mostrarActualizacion(updatedAt) {
+  if (els.lastUpdate && updatedAt) {
+    els.lastUpdate.textContent = `Actualizado: ${updatedAt}`;
   }
 }
 
 // --- Poblar selects de tipo, región, comuna --- //
-function poblarFiltros() {
-  const tipos = new Set();
-  const regiones = new Set();
-  const comunas = new Set();
-
-  remates.forEach((r) => {
-    if (r.tipo_bien) tipos.add(r.tipo_bien);
-    if (r.region) regiones.add(r.region);
-    if (r.comuna) comunas.add(r.comuna);
+// Cada opción es { value, records }; sin ``records`` se muestra sin conteo
+function llenarSelect(select, opciones, labelTodos, conservar = true) {
+  if (!select) return;
+  const seleccionado = select.value;
+  const porValor = new Map();
+  opciones.forEach((o) => {
+    if (o.value) porValor.set(o.value, o);
   });
+  // Tipo y región se vuelven a llenar a medida que llegan datos: conservar
+  // la selección. La comuna, en cambio, se descarta si no es de la región.
+  if (conservar && seleccionado && !porValor.has(seleccionado)) {
+    porValor.set(seleccionado, { value: seleccionado });
+  }
+  select.innerHTML = "";
+  const optAll = document.createElement("option");
+  optAll.value = "";
+  optAll.textContent = labelTodos;
+  select.appendChild(optAll);
+
+  Array.from(porValor.values())
+    .sort((a, b) => a.value.localeCompare(b.value, "es-CL"))
+    .forEach(({ value, records }) => {
+      const opt = document.createElement("option");
+      opt.value = value;
+      opt.textContent = records == null ? value : `${value} (${records.toLocaleString("es-CL")})`;
+      select.appendChild(opt);
+    });
+  select.value = porValor.has(seleccionado) ? seleccionado : "";
+}
 
-  const fillSelect = (select, values, labelTodos) => {
-    if (!select) return;
-    select.innerHTML = "";
-    const optAll = document.createElement("option");
-    optAll.value = "";
-    optAll.textContent = labelTodos;
-    select.appendChild(optAll);
-
-    Array.from(values)
-      .sort((a, b) => a.localeCompare(b, "es-CL"))
-      .forEach((v) => {
-        const opt = document.createElement("option");
-        opt.value = v;
-        opt.textContent = v;
-        select.appendChild(opt);
+const sinConteo = (valores) => valores.map((value) => ({ value }));
+
+function poblarFiltros() {
+  if (facetas) {
+    llenarSelect(els.tipoRemate, facetas.tipo_bien, "Todos los tipos");
+    llenarSelect(els.region, facetas.region, "Todas las regiones");
+  } else if (opcionesMotor) {
+    llenarSelect(els.tipoRemate, sinConteo(opcionesMotor.tipos), "Todos los tipos");
+    llenarSelect(els.region, sinConteo(opcionesMotor.regiones), "Todas las regiones");
+  }
+  actualizarComunas();
+}
+
+// Comunas de la región elegida (o de todas), sumando sus conteos
+function actualizarComunas() {
+  if (!facetas) {
+    if (opcionesMotor) llenarSelect(els.comuna, sinConteo(opcionesMotor.comunas), "Todas las comunas");
+    return;
+  }
+  const region = els.region?.value || "";
+  const conteos = new Map();
+  facetas.region
+    .filter((r) => !region || r.value === region)
+    .forEach((r) => {
+      r.comunas.forEach(({ value, records }) => {
+        conteos.set(value, (conteos.get(value) || 0) + records);
       });
-  };
+    });
+  const opciones = Array.from(conteos, ([value, records]) => ({ value, records }));
+  llenarSelect(els.comuna, opciones, "Todas las comunas", false);
+}
 
-  fillSelect(els.tipoRemate, tipos, "Todos los tipos");
-  fillSelect(els.region, regiones, "Todas las regiones");
-  fillSelect(els.comuna, comunas, "Todas las comunas");
+function alCambiarRegion() {
+  actualizarComunas();
+  aplicarFiltros();
+}
+
+// Los calendarios solo ofrecen los meses con remates
+function limitarFechas() {
+  const meses = facetas.month.map((m) => m.value).filter(Boolean);
+  if (!meses.length) return;
+  const [anio, mes] = meses[meses.length - 1].split("-").map(Number);
+  const ultimoDia = new Date(Date.UTC(anio, mes, 0)).getUTCDate();
+  const min = `${meses[0]}-01`;
+  const max = `${meses[meses.length - 1]}-${String(ultimoDia).padStart(2, "0")}`;
+  [els.fechaDesde, els.fechaHasta].forEach((el) => {
+    if (!el) return;
+    el.min = min;
+    el.max = max;
+  });
 }
 
 // --- Aplicar filtros --- //
+function leerFiltros() {
+  return {
+    tipo: els.tipoRemate?.value || "",
+    region: els.region?.value || "",
+    comuna: els.comuna?.value || "",
+    desde: els.fechaDesde?.value || "", // formato YYYY-MM-DD
+    hasta: els.fechaHasta?.value || "",
+    precioMin: leerPrecio(els.precioMin),
+    precioMax: leerPrecio(els.precioMax),
+    busqueda: els.busqueda?.value || "", // el worker la normaliza
+  };
+}
+
+function leerPrecio(input) {
+  const valor = input?.value ?? "";
+  return valor === "" || Number.isNaN(Number(valor)) ? null : Number(valor);
+}
+
+// Consulta al worker; la respuesta llega como mensaje "resultado"
 function aplicarFiltros() {
-  const tipo = els.tipoRemate?.value || "";
-  const region = els.region?.value || "";
-  const comuna = els.comuna?.value || "";
-  const desde = els.fechaDesde?.value || ""; // formato YYYY-MM-DD
-  const hasta = els.fechaHasta?.value || "";
-  const busqueda = els.busqueda?.value || "";
-  const palabras = busqueda
-    .toLowerCase()
-    .split(/\s+/)
-    .map((p) => p.trim())
-    .filter(Boolean);
-
-  rematesFiltrados = remates.filter((r) => {
-    if (tipo && r.tipo_bien !== tipo) return false;
-    if (region && r.region !== region) return false;
-    if (comuna && r.comuna !== comuna) return false;
-
-    // fecha_remate (ISO) o fecha_publicacion (YYYY-MM-DD)
-    let fechaBase = r.fecha_remate || r.fecha_publicacion;
-    if (!fechaBase) return true;
-
-    // Normalizamos a string ISO comparable
-    if (typeof fechaBase === "string") {
-      if (fechaBase.length === 10) {
-        // YYYY-MM-DD
-        fechaBase = `${fechaBase}T00:00:00`;
-      }
-    }
+  clearTimeout(temporizadorConsulta);
+  const filtros = leerFiltros();
+  const clave = JSON.stringify(filtros);
+  // Misma consulta que la última (por ejemplo, tras un input sin cambios)
+  if (clave === ultimosFiltros) return;
+  ultimosFiltros = clave;
+  consultaActual += 1;
+  motor.postMessage({ tipo: "consulta", id: consultaActual, filtros });
+}
 
-    if (desde && fechaBase < `${desde}T00:00:00`) return false;
-    if (hasta && fechaBase > `${hasta}T23:59:59`) return false;
-
-    if (palabras.length > 0) {
-      const texto =
-        [
-          r.tipo_bien,
-          r.deudor_nombre,
-          r.region,
-          r.comuna,
-          r.direccion,
-          r.tipo_procedimiento,
-          r.procedimiento,
-          r.fecha_publicacion,
-          r.fecha_remate,
-          r.valor_minimo,
-          r.descripcion,
-          r.tipo_bienes,
-        ]
-          .filter(Boolean)
-          .join(" ")
-          .toLowerCase();
-
-      const todasIncluidas = palabras.every((palabra) =>
-        texto.includes(palabra)
-      );
-      if (!todasIncluidas) return false;
-    }
+// Mientras se escribe se consulta solo cuando hay una pausa
+function programarConsulta(espera) {
+  clearTimeout(temporizadorConsulta);
+  temporizadorConsulta = setTimeout(aplicarFiltros, espera);
+}
 
-    return true;
-  });
+// --- Render virtualizado de tarjetas --- //
+// Solo están en el DOM las tarjetas visibles (más un margen). Dos
+// espaciadores ocupan el lugar del resto, así la barra de desplazamiento
+// corresponde a la lista completa. Las alturas se miden al pintar cada
+// tarjeta; mientras tanto se usa el promedio de las ya medidas.
+const ALTURA_ESTIMADA = 240;
+const MARGEN_TARJETA = 12; // margin-bottom de .remate-card
+const MARGEN_VENTANA = 800; // px pintados por encima y por debajo de la pantalla
+const TARJETAS_POR_CUADRO = 12;
+
+const vista = {
+  lista: null,
+  espacioArriba: null,
+  espacioAbajo: null,
+  alturas: new Float64Array(0), // 0: todavía sin medir
+  posiciones: new Float64Array(1), // posiciones[k]: inicio de la tarjeta k
+  sumaMedidas: 0,
+  cantidadMedidas: 0,
+  tarjetas: new Map(), // posición en idsFiltrados -> <article>
+  libres: [],
+  cuadro: 0,
+};
 
-  renderizarResultados();
+function prepararLista() {
+  if (vista.lista) return;
+  vista.espacioArriba = document.createElement("div");
+  vista.lista = document.createElement("div");
+  vista.espacioAbajo = document.createElement("div");
+  els.results.innerHTML = "";
+  els.results.append(vista.espacioArriba, vista.lista, vista.espacioAbajo);
+  window.addEventListener("scroll", programarPintado, { passive: true });
+  window.addEventListener("resize", programarPintado);
 }
 
-// --- Render de tarjetas --- //
-function renderizarResultados() {
+function renderizarResultados(parcial = false) {
   if (!els.results) return;
+  prepararLista();
 
-  els.results.innerHTML = "";
+  vista.alturas = new Float64Array(idsFiltrados.length);
+  recalcularPosiciones();
+  // Las tarjetas se conservan: si en su posición sigue el mismo remate
+  // (por ejemplo al llegar otra tanda de shards) no se vuelven a llenar.
+  programarPintado();
+
+  if (els.resultCount) {
+    // Resultado parcial: todavía llegan shards para esta consulta
+    els.resultCount.textContent = parcial
+      ? `${idsFiltrados.length} remates encontrados (cargando más…)`
+      : `${idsFiltrados.length} remates encontrados`;
+  }
+}
 
-  rematesFiltrados.forEach((r, index) => {
-    const card = document.createElement("article");
-    card.className = "remate-card";
-
-    const tipoBien = r.tipo_bien || "Remate";
-    const deudor = r.deudor_nombre || "Deudor no indicado";
-    const region = r.region || "-";
-    const comuna = r.comuna || "-";
-    const direccion = r.direccion || "-";
-    const proc = r.tipo_procedimiento || r.procedimiento || "";
-    const fechaPub = r.fecha_publicacion || "-";
-    const fechaRem = r.fecha_remate
-      ? r.fecha_remate.slice(0, 16).replace("T", " ")
-      : "Sin fecha remate";
-
-    const valor = r.valor_minimo
-      ? `$${Number(r.valor_minimo).toLocaleString("es-CL")}`
-      : "Sin mínimo publicado";
-
-    const descripcion =
-      r.descripcion || r.tipo_bienes || "(sin descripción disponible)";
-
-    const urlPdf = r.fuente_url || "#";
-
-    card.innerHTML = `
-      <header class="remate-card__header">
-        <h3>${tipoBien} – ${deudor}</h3>
-        ${
-          proc
-            ? `<span class="remate-card__tag">${proc}</span>`
-            : ""
-        }
-      </header>
-
-      <p class="remate-card__meta">
-        <strong>Publicación:</strong> ${fechaPub} |
-        <strong>Remate:</strong> ${fechaRem}
-      </p>
-      <p class="remate-card__meta">
-        <strong>Ubicación:</strong> ${region} / ${comuna}<br>
-        <strong>Dirección:</strong> ${direccion}
-      </p>
-      <p class="remate-card__meta">
-        <strong>Valor mínimo:</strong> ${valor}
-      </p>
-      <p class="remate-card__desc">
-        ${descripcion}
-      </p>
-      <footer class="remate-card__footer">
-        <a
-          class="btn-pdf"
-          href="#"
-          data-index="${index}"
-          role="button"
-        >
-          Ver detalle del remate
-        </a>
-      </footer>
-    `;
-
-    els.results.appendChild(card);
+function recalcularPosiciones() {
+  const n = vista.alturas.length;
+  const estimada = vista.cantidadMedidas ? vista.sumaMedidas / vista.cantidadMedidas : ALTURA_ESTIMADA;
+  const posiciones = new Float64Array(n + 1);
+  for (let k = 0; k < n; k++) {
+    posiciones[k + 1] = posiciones[k] + (vista.alturas[k] || estimada);
+  }
+  vista.posiciones = posiciones;
+}
+
+// Un solo pintado por cuadro, aunque lleguen muchos eventos de scroll
+function programarPintado() {
+  if (!vista.cuadro) vista.cuadro = requestAnimationFrame(pintarVentana);
+}
+
+// Primera tarjeta k con posiciones[k + 1] > y
+function tarjetaEn(y) {
+  let bajo = 0;
+  let alto = vista.alturas.length;
+  while (bajo < alto) {
+    const medio = (bajo + alto) >>> 1;
+    if (vista.posiciones[medio + 1] <= y) bajo = medio + 1;
+    else alto = medio;
+  }
+  return bajo;
+}
+
+function pintarVentana() {
+  vista.cuadro = 0;
+  const n = idsFiltrados.length;
+  // Desplazamiento de la pantalla dentro de la lista de resultados
+  const arriba = -els.results.getBoundingClientRect().top;
+  const primera = Math.min(tarjetaEn(arriba - MARGEN_VENTANA), n);
+  let ultima = Math.min(tarjetaEn(arriba + window.innerHeight + MARGEN_VENTANA), n - 1);
+
+  // Las tarjetas que salieron de la ventana quedan libres para reutilizarse
+  vista.tarjetas.forEach((card, k) => {
+    if (k < primera || k > ultima) {
+      vista.tarjetas.delete(k);
+      vista.libres.push(card);
+    }
   });
 
-  if (els.resultCount) {
-    els.resultCount.textContent = `${rematesFiltrados.length} remates encontrados`;
+  // Las filas que el worker aún no envió se piden todas juntas; se pinta
+  // hasta la primera que falta y el resto cuando lleguen
+  const faltan = [];
+  for (let k = primera; k <= ultima; k++) {
+    if (!filasRecibidas.has(idsFiltrados[k])) faltan.push(idsFiltrados[k]);
   }
+  pedirFilas(faltan);
+
+  // A lo sumo TARJETAS_POR_CUADRO tarjetas nuevas por cuadro; el resto, en
+  // los cuadros siguientes
+  let llenadas = 0;
+  for (let k = primera; k <= ultima; k++) {
+    let card = vista.tarjetas.get(k);
+    const id = idsFiltrados[k];
+    if (card && card.dataset.fila === String(id)) continue;
+    if (!filasRecibidas.has(id)) {
+      ultima = k - 1;
+      break;
+    }
+    if (llenadas === TARJETAS_POR_CUADRO) {
+      ultima = k - 1;
+      programarPintado();
+      break;
+    }
+    if (!card) card = vista.libres.pop() || document.createElement("article");
+    llenarTarjeta(card, filasRecibidas.get(id), k);
+    card.dataset.fila = String(id);
+    vista.tarjetas.set(k, card);
+    llenadas += 1;
+  }
+  vista.tarjetas.forEach((card, k) => {
+    if (k > ultima) {
+      vista.tarjetas.delete(k);
+      vista.libres.push(card);
+    }
+  });
+
+  const visibles = [];
+  for (let k = primera; k <= ultima; k++) visibles.push(vista.tarjetas.get(k));
+  vista.lista.replaceChildren(...visibles);
+
+  // Medir lo pintado; si alguna altura cambió, se corrigen las posiciones
+  let cambio = false;
+  for (let k = primera; k <= ultima; k++) {
+    const altura = visibles[k - primera].offsetHeight + MARGEN_TARJETA;
+    if (vista.alturas[k] === altura) continue;
+    if (!vista.alturas[k]) {
+      vista.sumaMedidas += altura;
+      vista.cantidadMedidas += 1;
+    }
+    vista.alturas[k] = altura;
+    cambio = true;
+  }
+  if (cambio) {
+    // Con las alturas reales la ventana puede haber quedado corta: otro cuadro
+    recalcularPosiciones();
+    programarPintado();
+  }
+
+  vista.espacioArriba.style.height = `${vista.posiciones[primera]}px`;
+  vista.espacioAbajo.style.height = `${vista.posiciones[n] - vista.posiciones[Math.max(ultima + 1, primera)]}px`;
+}
+
+function llenarTarjeta(card, r, index) {
+  card.className = "remate-card";
+
+  const tipoBien = r.tipo_bien || "Remate";
+  const deudor = r.deudor_nombre || "Deudor no indicado";
+  const region = r.region || "-";
+  const comuna = r.comuna || "-";
+  const direccion = r.direccion || "-";
+  const proc = r.tipo_procedimiento || r.procedimiento || "";
+  const fechaPub = r.fecha_publicacion || "-";
+  const fechaRem = r.fecha_remate
+    ? r.fecha_remate.slice(0, 16).replace("T", " ")
+    : "Sin fecha remate";
+
+  const valor = r.valor_minimo
+    ? `$${Number(r.valor_minimo).toLocaleString("es-CL")}`
+    : "Sin mínimo publicado";
+
+  const descripcion =
+    r.descripcion || r.tipo_bienes || "(sin descripción disponible)";
+
+  card.innerHTML = `
+    <header class="remate-card__header">
+      <h3>${tipoBien} – ${deudor}</h3>
+      ${
+        proc
+          ? `<span class="remate-card__tag">${proc}</span>`
+          : ""
+      }
+    </header>
+
+    <p class="remate-card__meta">
+      <strong>Publicación:</strong> ${fechaPub} |
+      <strong>Remate:</strong> ${fechaRem}
+    </p>
+    <p class="remate-card__meta">
+      <strong>Ubicación:</strong> ${region} / ${comuna}<br>
+      <strong>Dirección:</strong> ${direccion}
+    </p>
+    <p class="remate-card__meta">
+      <strong>Valor mínimo:</strong> ${valor}
+    </p>
+    <p class="remate-card__desc">
+      ${descripcion}
+    </p>
+    <footer class="remate-card__footer">
+      <a
+        class="btn-pdf"
+        href="#"
+        data-index="${index}"
+        role="button"
+      >
+        Ver detalle del remate
+      </a>
+    </footer>
+  `;
 }
 
 function abrirModalRemate(remate) {
@@ -290,6 +519,17 @@ document.addEventListener("DOMContentLoaded", () => {
   if (els.aplicar) {
     els.aplicar.addEventListener("click", aplicarFiltros);
   }
+  // Los filtros se aplican solos: los selects y fechas al cambiar, el texto
+  // y los precios tras una pausa al escribir
+  [els.tipoRemate, els.comuna, els.fechaDesde, els.fechaHasta].forEach((el) => {
+    if (el) el.addEventListener("change", aplicarFiltros);
+  });
+  if (els.region) {
+    els.region.addEventListener("change", alCambiarRegion);
+  }
+  [els.busqueda, els.precioMin, els.precioMax].forEach((el) => {
+    if (el) el.addEventListener("input", () => programarConsulta(ESPERA_ESCRITURA));
+  });
   if (els.results) {
     els.results.addEventListener("click", (event) => {
       const target = event.target;
@@ -297,7 +537,7 @@ document.addEventListener("DOMContentLoaded", () => {
       const link = target.closest(".btn-pdf");
       if (!link) return;
       const index = Number(link.getAttribute("data-index"));
-      const remate = rematesFiltrados[index];
+      const remate = filasRecibidas.get(idsFiltrados[index]);
       if (!remate) return;
 
       event.preventDefault();
@@ -316,4 +556,10 @@ document.addEventListener("DOMContentLoaded", () => {
     }
   }
   cargarDatos();
+  // La página y los scripts quedan en la cache del service worker (sw.js)
+  if ("serviceWorker" in navigator) {
+    navigator.serviceWorker.register("sw.js").catch((err) => {
+      console.warn("No se pudo registrar el service worker", err);
+    });
+  }
 });
@@ -0,0 +1,6 @@
+"""
+Benchmarks offline de Rematierras (no hacen peticiones al Boletín).
+
+    python3 -m backend.benchmarks.parser_fields
+    python3 -m backend.benchmarks.suite --output bench.json
+"""
@@ -0,0 +1,230 @@
+"""
+Compara el extractor de campos de una pasada (parser.extract_fields) con la
+implementación anterior basada en un re.search por campo.
+
+    python3 -m backend.benchmarks.parser_fields --documents 2000
+
+Verifica que ambos produzcan exactamente el mismo RemateDetail para todo el
+corpus de textos sintéticos y muestra el tiempo de cada uno.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from backend.remates_scraper.parser import RemateDetail, _to_ascii, parse_remate_text
+
+
+# ---------------------------------------------------------------------------
+# Implementación de referencia (parser.py antes del extractor de una pasada)
+# ---------------------------------------------------------------------------
+def _search(pattern: str, text: str) -> Optional[str]:
+    match = re.search(pattern, text, re.IGNORECASE)
+    if match:
+        return match.group(1).strip()
+    return None
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    for fmt in ("%d/%m/%Y %H:%M", "%d-%m-%Y %H:%M", "%d/%m/%Y"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_valor_minimo(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    digits = re.sub(r"[^0-9]", "", value)
+    if not digits:
+        return None
+    try:
+        return int(digits)
+    except ValueError:
+        return None
+
+
+def _extract_section(text: str, start_label: str, end_label: str) -> Optional[str]:
+    pattern = rf"{re.escape(start_label)}\n(?P<body>.+?)(?:\n{re.escape(end_label)}|$)"
+    match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+    if not match:
+        return None
+    body = match.group("body").strip()
+    body = re.sub(r"\n[A-Z ]+?:$", "", body)
+    return body.strip() or None
+
+
+def reference_parse_text(codigo_validacion: str, text: str) -> RemateDetail:
+    fecha_remate = _parse_datetime(_search(r"Fecha del Remate:\s*(.+)", text))
+    tipo_procedimiento = _search(r"Tipo Procedimiento:\s*(.+)", text)
+    rol_causa = _search(r"Rol Causa:\s*(.+)", text)
+    tribunal = _search(r"Tribunal:\s*(.+)", text)
+    deudor = _search(r"Deudor:\s*(.+)", text)
+    deudor_rut = _search(r"Deudor Rut:\s*(.+)", text)
+    liquidador = _search(r"Liquidador:\s*(.+)", text)
+
+    region = comuna = None
+    region_match = re.search(r"Region:\s*(.+?)\s+Comuna:\s*(.+)", text, re.IGNORECASE)
+    if region_match:
+        region = region_match.group(1).strip()
+        comuna = region_match.group(2).strip()
+    if not region:
+        region = _search(r"Region:\s*(.+)", text)
+    if not comuna:
+        comuna = _search(r"Comuna:\s*(.+)", text)
+
+    direccion = _search(r"Direccion:\s*(.+)", text)
+    descripcion = _extract_section(text, "Detalle", "Tipo Bienes")
+    tipo_bienes = _extract_section(text, "Tipo Bienes", "Valor Minimo")
+
+    valor_match = re.search(r"Valor Minimo \(pesos\):\s*([0-9\.\s]*)", text, re.IGNORECASE)
+    valor_minimo = _parse_valor_minimo(valor_match.group(1) if valor_match else None)
+
+    comision = _search(r"Comision:\s*(.+)", text)
+
+    return RemateDetail(
+        codigo_validacion=codigo_validacion,
+        fecha_remate=fecha_remate,
+        tipo_procedimiento=tipo_procedimiento,
+        rol_causa=rol_causa,
+        tribunal=tribunal,
+        deudor=deudor,
+        deudor_rut=deudor_rut,
+        liquidador=liquidador,
+        region=region,
+        comuna=comuna,
+        direccion=direccion,
+        descripcion=descripcion,
+        tipo_bienes=tipo_bienes,
+        valor_minimo=valor_minimo,
+        comision=comision,
+        raw_text=text,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Corpus sintético
+# ---------------------------------------------------------------------------
+REGIONES = [
+    ("Metropolitana de Santiago", "Santiago"),
+    ("Valparaíso", "Viña del Mar"),
+    ("Biobío", "Concepción"),
+    ("Los Lagos", "Puerto Montt"),
+    ("Ñuble", "Chillán"),
+]
+FECHAS = [
+    "15/11/2025 10:30",
+    "15-11-2025 10:30",
+    "15/11/2025",
+    "1/2/2025 9:05",
+    "31/02/2025 10:00",
+    "15/11/2025 10:30 hrs",
+    "15/11/2025  10:30",
+    "a confirmar",
+    "",
+]
+DETALLES = [
+    "Casa habitación de dos pisos con patio.",
+    "Lote de vehículos:\n- Camioneta Toyota Hilux 2018\n- Automóvil Kia Rio 2015",
+    "Maquinaria industrial en desuso.\nOBSERVACIONES:",
+    "Bodega en el deudor: Comercial Pérez Ltda.",
+    "",
+]
+
+
+def build_corpus(size: int, seed: int = 7) -> List[str]:
+    """Textos con la forma de extract_text(): ASCII y sin líneas en blanco."""
+    rnd = random.Random(seed)
+    corpus: List[str] = []
+    for index in range(size):
+        region, comuna = rnd.choice(REGIONES)
+        lines = [
+            "BOLETIN CONCURSAL - AVISO DE REMATE",
+            f"Fecha del Remate: {rnd.choice(FECHAS)}",
+            f"Tipo Procedimiento: {rnd.choice(['Liquidacion Voluntaria', 'Liquidacion Forzosa', 'Reorganizacion'])}",
+            f"Rol Causa: C-{rnd.randint(1, 9999)}-{rnd.randint(2018, 2026)}",
+            f"Tribunal: {rnd.randint(1, 30)} Juzgado Civil de {comuna}",
+            f"Deudor: {rnd.choice(['Juan Perez', 'Comercial Ñandú SpA', 'Inversiones Los Álamos'])}",
+            f"Deudor Rut: {rnd.randint(5, 99)}.{rnd.randint(100, 999)}.{rnd.randint(100, 999)}-{rnd.randint(0, 9)}",
+            f"Liquidador: {rnd.choice(['María González', 'Pedro Soto'])}",
+        ]
+        layout = rnd.randrange(4)
+        if layout == 0:
+            lines.append(f"Region: {region} Comuna: {comuna}")
+        elif layout == 1:
+            lines.extend([f"Region: {region}", f"Comuna: {comuna}"])
+        elif layout == 2:
+            lines.append(f"Comuna: {comuna}")
+        else:
+            lines.extend(["Region:", f"Comuna: {comuna}"])
+        lines.append(f"Direccion: {rnd.choice(['Av. Libertad 123', 'Camino a Melipilla km 5', ''])}")
+
+        detalle = rnd.choice(DETALLES)
+        if detalle or rnd.random() < 0.5:
+            lines.extend(["Detalle", detalle])
+        if rnd.random() < 0.8:
+            lines.extend(["Tipo Bienes", rnd.choice(["Inmueble", "Vehiculos", "Muebles y enseres"])])
+        valor = rnd.randint(1, 500) * 1_000_000
+        if rnd.random() < 0.9:
+            lines.append(f"Valor Minimo (pesos): {valor:,}".replace(",", "."))
+        if rnd.random() < 0.7:
+            lines.append(f"Comision: {rnd.choice(['2%', '3% + IVA', ''])}")
+        if rnd.random() < 0.2:
+            lines.append("tribunal: mencion posterior en minusculas")
+
+        text = "\n".join(lines)
+        if index % 5 == 0:
+            text = text.upper()
+        corpus.append(_to_ascii(text))
+    return corpus
+
+
+# ---------------------------------------------------------------------------
+# Ejecución
+# ---------------------------------------------------------------------------
+def time_parser(parse: Callable[[str, str], RemateDetail], corpus: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for index, text in enumerate(corpus):
+            parse(str(index), text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark del extractor de campos del PDF")
+    parser.add_argument("--documents", type=int, default=2000, help="Textos sintéticos a generar")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones (se reporta la mejor)")
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.documents)
+    mismatches = 0
+    for index, text in enumerate(corpus):
+        expected = reference_parse_text(str(index), text)
+        actual = parse_remate_text(str(index), text)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"[DIFF] documento {index}:\n  esperado {expected}\n  obtenido {actual}", file=sys.stderr)
+
+    reference_time = time_parser(reference_parse_text, corpus, args.repeat)
+    current_time = time_parser(parse_remate_text, corpus, args.repeat)
+    print(f"Documentos: {len(corpus)} | diferencias: {mismatches}")
+    print(f"Referencia (re.search por campo): {reference_time * 1000:.1f} ms")
+    print(f"Extractor de una pasada:          {current_time * 1000:.1f} ms")
+    print(f"Aceleración: x{reference_time / current_time:.2f}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
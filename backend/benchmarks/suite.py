@@ -0,0 +1,464 @@
+"""
+Benchmarks de los caminos calientes del pipeline, sin red y con datos
+sintéticos, para comparar entre commits.
+
+    python3 -m backend.benchmarks.suite --output bench-antes.json
+    python3 -m backend.benchmarks.suite --output bench-despues.json --compare bench-antes.json
+    python3 -m backend.benchmarks.suite --sizes 1000 10000 100000 1000000 --repeat 3
+
+Mide ``extract_text`` y ``parse_remate_pdf`` sobre PDFs generados con las
+etiquetas que espera el parser (los textos de ``parser_fields.build_corpus``
+más un párrafo con tildes), y ``filter_records``, ``write_dataset``,
+``render_html`` y ``build_category_stats`` sobre datasets de ``RemateRecord``
+de cada tamaño de ``--sizes``. De cada medición se guarda el mejor tiempo y la
+mediana de ``--repeat`` corridas. Antes de medir se verifica que el parser
+saque de cada PDF los mismos campos que del texto original y que el formato
+columnar (y los shards) acepten fechas de remate fuera de 1970-2106.
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from dataclasses import asdict, dataclass, replace
+from datetime import UTC, date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.benchmarks.parser_fields import REGIONES, build_corpus
+from backend.remates_scraper.main import build_category_stats, filter_records, render_html
+from backend.remates_scraper.parser import extract_text, parse_remate_pdf, parse_remate_text
+from backend.remates_scraper.search import DEFAULT_MATCH_FIELDS
+from backend.remates_scraper.storage import (
+    FUENTE_URL_PREFIX,
+    RemateRecord,
+    decode_columns,
+    encode_columns,
+    write_dataset,
+    write_shards,
+)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_FORMATS = ("pretty", "columnar")
+# Búsquedas de filter_records: (modo, palabras clave)
+KEYWORD_CASES = (
+    ("any", ("departamento", "camion", "retroexcavadora")),
+    ("all", ("casa", "terreno")),
+)
+
+
+# ---------------------------------------------------------------------------
+# PDFs sintéticos
+# ---------------------------------------------------------------------------
+ENCABEZADO = (
+    "El liquidador que suscribe, en cumplimiento de la resolución del tribunal, "
+    "comunica a los acreedores y al público la realización en pública subasta de "
+    "los bienes que se indican, según las bases aprobadas en la causa."
+)
+LINEAS_POR_PAGINA = 60
+ANCHO_LINEA = 95
+
+
+def _pdf_string(line: str) -> bytes:
+    encoded = line.encode("cp1252", errors="replace")
+    return b"(" + encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines: List[str] = []
+    for paragraph in text.split("\n"):
+        current = ""
+        for word in paragraph.split(" "):
+            if current and len(current) + 1 + len(word) > width:
+                lines.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        lines.append(current)
+    return lines
+
+
+def build_pdf(text: str) -> bytes:
+    """PDF mínimo (Helvetica, WinAnsi, contenido comprimido) con una línea de texto por renglón."""
+    lines = _wrap(text, ANCHO_LINEA)
+    pages = [lines[start : start + LINEAS_POR_PAGINA] for start in range(0, len(lines), LINEAS_POR_PAGINA)] or [[]]
+    first_page = 4
+    kids = " ".join(f"{first_page + 2 * index} 0 R" for index in range(len(pages)))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode("ascii"),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for index, page_lines in enumerate(pages):
+        content = b"BT /F1 10 Tf 12 TL 50 800 Td\n" + b"".join(_pdf_string(line) + b" Tj T*\n" for line in page_lines)
+        stream = zlib.compress(content + b"ET\n")
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {first_page + 2 * index + 1} 0 R >>"
+            ).encode("ascii")
+        )
+        objects.append(
+            f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode("ascii") + stream + b"\nendstream"
+        )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets: List[int] = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    output += b"".join(f"{offset:010d} 00000 n \n".encode("ascii") for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii")
+    return bytes(output)
+
+
+def build_pdf_corpus(size: int, seed: int = 7) -> List[Tuple[str, bytes]]:
+    """(texto, PDF) por documento; el párrafo de encabezado no tiene etiquetas."""
+    return [(text, build_pdf(f"{ENCABEZADO}\n{text}")) for text in build_corpus(size, seed)]
+
+
+def check_pdf_corpus(corpus: Sequence[Tuple[str, bytes]]) -> int:
+    """Documentos cuyo PDF no da los mismos campos que su texto (sin contar raw_text)."""
+    mismatches = 0
+    for index, (text, pdf_bytes) in enumerate(corpus):
+        expected = replace(parse_remate_text(str(index), text), raw_text="")
+        actual = replace(parse_remate_pdf(str(index), pdf_bytes), raw_text="")
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"[DIFF] PDF {index}:\n  esperado {expected}\n  obtenido {actual}", file=sys.stderr)
+    return mismatches
+
+
+# ---------------------------------------------------------------------------
+# Datasets sintéticos
+# ---------------------------------------------------------------------------
+PALABRAS = (
+    "casa departamento terreno bodega oficina local comercial parcela sitio estacionamiento "
+    "camion camioneta automovil retroexcavadora grua tolva tractor furgon motocicleta bus "
+    "maquinaria industrial agricola equipos computacionales mobiliario enseres herramientas "
+    "inventario mercaderias stock repuestos acciones derechos marca dominio patente "
+    "con sin dos tres pisos patio quincho piscina ubicado sector rural urbano poniente oriente "
+    "año modelo marca toyota hyundai volvo caterpillar mercedes kia nissan chevrolet ford "
+    "habitación baños dormitorios metros cuadrados construidos según inscripción fojas número "
+    "conservador bienes raíces rol avalúo fiscal estado regular bueno desuso funcionamiento"
+).split()
+TIPOS_BIENES = ("Inmueble", "Vehiculos", "Muebles y enseres", "Maquinaria", "Derechos", None)
+PROCEDIMIENTOS = ("Liquidacion Voluntaria", "Liquidacion Forzosa", "Reorganizacion", None)
+LIQUIDADORES = ("María González", "Pedro Soto", "Carolina Muñoz", "Andrés Rojas", None)
+PUBLICADORES = ("Liquidador", "Tribunal", "Superintendencia")
+COMUNAS_EXTRA = ("Rancagua", "Talca", "Temuco", "Antofagasta", "La Serena", "Iquique", "Osorno", "Curicó")
+HASTA = date(2026, 6, 30)
+
+
+def build_records(size: int, seed: int = 11) -> List[RemateRecord]:
+    """``size`` remates de un año, ordenados como el dataset (más nuevo primero)."""
+    rnd = random.Random(seed)
+    ubicaciones = list(REGIONES) + [(region, comuna) for (region, _), comuna in zip(REGIONES * 2, COMUNAS_EXTRA)]
+    records: List[RemateRecord] = []
+    for index in range(size):
+        tipo_bien = "inmueble" if rnd.random() < 0.45 else "mueble"
+        fecha_publicacion = HASTA - timedelta(days=rnd.randrange(365))
+        fecha_remate = None
+        if rnd.random() < 0.9:
+            fecha_remate = datetime.combine(
+                fecha_publicacion + timedelta(days=rnd.randint(5, 40)), datetime.min.time()
+            ).replace(hour=rnd.randint(9, 15), minute=rnd.choice((0, 30)))
+        region, comuna = rnd.choice(ubicaciones)
+        if rnd.random() < 0.05:
+            region = None
+        codigo = f"BM{index:07d}-{index % 10}"
+        records.append(
+            RemateRecord(
+                codigo_validacion=codigo,
+                tipo_bien=tipo_bien,
+                fecha_publicacion=fecha_publicacion,
+                fecha_remate=fecha_remate,
+                tipo_procedimiento=rnd.choice(PROCEDIMIENTOS),
+                rol_causa=f"C-{rnd.randint(1, 9999)}-{rnd.randint(2018, 2026)}",
+                tribunal=f"{rnd.randint(1, 30)} Juzgado Civil de {comuna}",
+                deudor_nombre=f"Deudor {rnd.randrange(size // 3 + 1)}",
+                deudor_rut=f"{rnd.randint(5, 99)}.{rnd.randint(100, 999)}.{rnd.randint(100, 999)}-{rnd.randint(0, 9)}",
+                liquidador=rnd.choice(LIQUIDADORES),
+                region=region,
+                comuna=comuna,
+                direccion=f"Calle {rnd.randint(1, 500)} #{rnd.randint(1, 9999)}" if rnd.random() < 0.8 else None,
+                descripcion=" ".join(rnd.choices(PALABRAS, k=rnd.randint(6, 40))).capitalize(),
+                tipo_bienes=rnd.choice(TIPOS_BIENES),
+                valor_minimo=rnd.randint(1, 800) * 1_000_000 if rnd.random() < 0.85 else None,
+                comision=rnd.choice(("2%", "3% + IVA", None)),
+                ente_publicador=rnd.choice(PUBLICADORES),
+                procedimiento=rnd.choice(("Concursal", None)),
+                fuente_url=f"{FUENTE_URL_PREFIX}{codigo}",
+            )
+        )
+    records.sort(key=lambda record: (record.fecha_publicacion, record.codigo_validacion), reverse=True)
+    return records
+
+
+# Fechas de remate que un PDF con errores puede traer y el formato columnar
+# debe conservar: (valor, lo que se espera al decodificar)
+FECHAS_BORDE = (
+    (datetime(2205, 10, 10, 10, 0), datetime(2205, 10, 10, 10, 0)),
+    (datetime(1969, 12, 31, 23, 59), datetime(1969, 12, 31, 23, 59)),
+    (datetime(1900, 1, 1, 12, 0), datetime(1900, 1, 1, 12, 0)),
+    (datetime(2026, 3, 5, 11, 30, 0, 250000), datetime(2026, 3, 5, 11, 30, 0, 250000)),
+    (datetime(2026, 3, 5, 11, 30, tzinfo=timezone(timedelta(hours=-3))), datetime(2026, 3, 5, 14, 30)),
+)
+
+
+def check_columnar(workdir: Path) -> int:
+    """Registros con ``FECHAS_BORDE`` que no sobreviven a encode/decode_columns y write_shards."""
+    records = build_records(len(FECHAS_BORDE) + 2)
+    edge = [replace(record, fecha_remate=value) for record, (value, _) in zip(records, FECHAS_BORDE)]
+    records = edge + records[len(edge) :]
+    expected = [replace(record, fecha_remate=fecha) for record, (_, fecha) in zip(edge, FECHAS_BORDE)]
+    expected += records[len(edge) :]
+    try:
+        decoded = decode_columns(json.loads(json.dumps(encode_columns(records))))
+        write_shards(workdir / "shards", records)
+    except (ValueError, OverflowError) as exc:
+        print(f"[DIFF] formato columnar: {type(exc).__name__}: {exc}", file=sys.stderr)
+        return len(records)
+    mismatches = 0
+    for want, got in zip(expected, decoded):
+        if want != got:
+            mismatches += 1
+            print(f"[DIFF] columnar {want.codigo_validacion}: {want.fecha_remate} -> {got.fecha_remate}", file=sys.stderr)
+    return mismatches
+
+
+# ---------------------------------------------------------------------------
+# Medición
+# ---------------------------------------------------------------------------
+@dataclass
+class Result:
+    benchmark: str
+    size: int
+    best_s: float
+    median_s: float
+    runs: int
+
+    @property
+    def per_item_us(self) -> float:
+        return self.best_s / self.size * 1e6 if self.size else 0.0
+
+
+def measure(
+    benchmark: str,
+    size: int,
+    run: Callable[[], object],
+    repeat: int,
+    reset: Optional[Callable[[], None]] = None,
+) -> Result:
+    """Corre ``run`` ``repeat`` veces; ``reset`` prepara cada corrida fuera del tiempo medido."""
+    times: List[float] = []
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    result = Result(benchmark, size, min(times), statistics.median(times), repeat)
+    print(
+        f"  {benchmark:<28} {size:>9,} {result.best_s * 1000:>11.1f} ms {result.per_item_us:>10.2f} us/item",
+        flush=True,
+    )
+    return result
+
+
+def bench_pdfs(documents: int, repeat: int) -> Tuple[List[Result], int]:
+    corpus = build_pdf_corpus(documents)
+    mismatches = check_pdf_corpus(corpus)
+    pdfs = [pdf_bytes for _, pdf_bytes in corpus]
+
+    def extract_all() -> None:
+        for pdf_bytes in pdfs:
+            extract_text(pdf_bytes)
+
+    def parse_all(lazy: bool) -> None:
+        for index, pdf_bytes in enumerate(pdfs):
+            parse_remate_pdf(str(index), pdf_bytes, lazy=lazy)
+
+    results = [
+        measure("extract_text", len(pdfs), extract_all, repeat),
+        measure("parse_remate_pdf", len(pdfs), lambda: parse_all(False), repeat),
+        measure("parse_remate_pdf[lazy]", len(pdfs), lambda: parse_all(True), repeat),
+    ]
+    return results, mismatches
+
+
+def bench_records(size: int, repeat: int, formats: Sequence[str], workdir: Path) -> List[Result]:
+    records = build_records(size)
+    match_fields = list(DEFAULT_MATCH_FIELDS)
+    results: List[Result] = []
+    for mode, keywords in KEYWORD_CASES:
+        results.append(
+            measure(
+                f"filter_records[{mode}]",
+                size,
+                lambda keywords=keywords, mode=mode: filter_records(records, keywords, match_fields, mode),
+                repeat,
+            )
+        )
+
+    for output_format in formats:
+        target = workdir / output_format / "remates.json"
+
+        def clean(directory: Path = target.parent) -> None:
+            # Sin el manifiesto anterior write_dataset siempre reescribe
+            shutil.rmtree(directory, ignore_errors=True)
+            directory.mkdir(parents=True)
+
+        results.append(
+            measure(
+                f"write_dataset[{output_format}]",
+                size,
+                lambda target=target, output_format=output_format: write_dataset(
+                    target, records, output_format=output_format
+                ),
+                repeat,
+                reset=clean,
+            )
+        )
+        shutil.rmtree(target.parent, ignore_errors=True)
+
+    results.append(measure("build_category_stats", size, lambda: build_category_stats(records), repeat))
+    tipo_bien_counts, tipo_bienes_counts = build_category_stats(records)
+    html_path = workdir / "remates.html"
+    results.append(
+        measure(
+            "render_html",
+            size,
+            lambda: render_html(
+                html_path,
+                records,
+                title="Benchmark",
+                generated_at=datetime(2026, 6, 30, tzinfo=UTC),
+                keywords=None,
+                match_fields=match_fields,
+                tipo_bien_counts=tipo_bien_counts,
+                tipo_bienes_counts=tipo_bienes_counts,
+            ),
+            repeat,
+        )
+    )
+    html_path.unlink(missing_ok=True)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Resultados
+# ---------------------------------------------------------------------------
+def git_commit() -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def compare(results: Sequence[Result], previous_path: Path) -> None:
+    previous = json.loads(previous_path.read_text(encoding="utf-8"))
+    before: Dict[Tuple[str, int], float] = {
+        (item["benchmark"], item["size"]): item["best_s"] for item in previous.get("results", [])
+    }
+    print()
+    print(f"Comparación con {previous_path} (commit {previous.get('commit') or '?'}); mejor tiempo:")
+    for result in results:
+        old = before.get((result.benchmark, result.size))
+        if old is None:
+            print(f"  {result.benchmark:<28} {result.size:>9,}  (sin medición previa)")
+            continue
+        ratio = result.best_s / old if old else float("inf")
+        print(
+            f"  {result.benchmark:<28} {result.size:>9,} {old * 1000:>11.1f} ms -> "
+            f"{result.best_s * 1000:>11.1f} ms  x{ratio:.2f}"
+        )
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmarks offline del parser, el filtro, la escritura y el HTML")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="Tamaños de los datasets sintéticos (por defecto 1000 10000 100000; hasta 1000000)",
+    )
+    parser.add_argument("--documents", type=int, default=200, help="PDFs sintéticos para el parser (por defecto 200)")
+    parser.add_argument("--repeat", type=int, default=5, help="Corridas por medición (por defecto 5)")
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=("pretty", "compact", "ndjson", "columnar"),
+        default=list(DEFAULT_FORMATS),
+        help="Formatos de write_dataset a medir (por defecto pretty y columnar)",
+    )
+    parser.add_argument("--skip-pdf", action="store_true", help="No mide extract_text ni parse_remate_pdf")
+    parser.add_argument("--output", type=Path, help="Guarda los resultados en este JSON")
+    parser.add_argument("--compare", type=Path, help="JSON de una corrida anterior para comparar")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    results: List[Result] = []
+    mismatches = 0
+    print(f"  {'benchmark':<28} {'tamaño':>9} {'mejor':>14} {'por item':>16}")
+    if not args.skip_pdf:
+        pdf_results, mismatches = bench_pdfs(args.documents, args.repeat)
+        results.extend(pdf_results)
+    with tempfile.TemporaryDirectory(prefix="remates-bench-") as workdir:
+        columnar_mismatches = check_columnar(Path(workdir))
+        for size in args.sizes:
+            results.extend(bench_records(size, args.repeat, args.formats, Path(workdir)))
+
+    if args.output:
+        payload = {
+            "generated_at": datetime.now(UTC).isoformat() + "Z",
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {
+                "sizes": args.sizes,
+                "documents": 0 if args.skip_pdf else args.documents,
+                "repeat": args.repeat,
+                "formats": args.formats,
+            },
+            "pdf_mismatches": mismatches,
+            "columnar_mismatches": columnar_mismatches,
+            "results": [asdict(result) for result in results],
+        }
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Resultados en {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    if mismatches:
+        print(f"[ERROR] {mismatches} PDFs no dan los mismos campos que su texto", file=sys.stderr)
+    if columnar_mismatches:
+        print(f"[ERROR] {columnar_mismatches} remates no se conservan en el formato columnar", file=sys.stderr)
+    return 1 if mismatches or columnar_mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
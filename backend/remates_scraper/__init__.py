@@ -6,4 +6,8 @@ Se puede ejecutar así desde la raíz del repo:
     python3 -m backend.remates_scraper.main --output data/remates.json
 
 o usando el wrapper backend/scraper_boletin.py
+
+Para volver a parsear los textos ya guardados (sin red) tras corregir el parser:
+
+    python3 -m backend.remates_scraper.main reparse --output data/remates.json
 """
@@ -0,0 +1,321 @@
+"""
+Alertas: búsquedas guardadas que se evalúan solo contra los remates nuevos.
+
+    python3 -m backend.remates_scraper.main alerts --subscriptions alertas.json
+
+``alertas.json`` es una lista de suscripciones, cada una con un ``id`` y
+los mismos criterios de la línea de comandos::
+
+    [
+      {"id": "cliente-1", "keywords": ["camion", "tolva"], "match_mode": "all",
+       "region": "Biobío", "max_price": 50000000},
+      {"id": "cliente-2", "keywords": ["departamento"], "match_fields": ["descripcion"]}
+    ]
+
+``region`` y ``comuna`` se comparan sin tildes ni mayúsculas, igual que las
+palabras clave: "Biobío" coincide con el "Biobio" que guarda el parser.
+
+Todas las suscripciones se compilan en un solo índice: cada palabra clave
+distinta se busca una vez por remate nuevo y cada coincidencia avisa solo a
+las suscripciones que la usan. Los remates ya vistos en la corrida anterior
+(``--state``) no se vuelven a revisar, así que el costo crece con los remates
+nuevos y no con suscripciones × dataset. En cada corrida todas las
+suscripciones reciben su archivo ``<id>.json`` en ``--output-dir`` (con
+``records`` vacío si no hubo coincidencias) y se borran los de suscripciones
+que ya no están en la lista, así que el directorio refleja siempre la última
+corrida.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .search import DEFAULT_MATCH_FIELDS, HaystackCache, normalize_text
+from .storage import RemateRecord, load_dataset
+
+DEFAULT_STATE_PATH = Path(".cache/alerts.json")
+DEFAULT_OUTPUT_DIR = Path("alerts")
+_ID_RE = re.compile(r"[A-Za-z0-9_.-]+")
+
+
+@lru_cache(maxsize=4096)
+def _place_key(value: Optional[str]) -> str:
+    # Regiones y comunas tienen pocos valores distintos: se normalizan una vez
+    return normalize_text(value or "")
+
+
+@dataclass
+class Subscription:
+    id: str
+    keywords: Tuple[str, ...] = ()
+    match_fields: Tuple[str, ...] = DEFAULT_MATCH_FIELDS
+    match_mode: str = "any"
+    tipo_bien: Optional[str] = None
+    region: Optional[str] = None
+    comuna: Optional[str] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        # El parser guarda región y comuna sin tildes ("Biobio"): se
+        # normalizan para que "Biobío" o "biobio" también coincidan
+        self.region = normalize_text(self.region or "") or None
+        self.comuna = normalize_text(self.comuna or "") or None
+
+    @classmethod
+    def from_dict(cls, payload: dict) -> "Subscription":
+        subscription_id = str(payload.get("id") or "")
+        if not _ID_RE.fullmatch(subscription_id):
+            raise ValueError(f"Suscripción con id inválido: {subscription_id!r} (use letras, números, '.', '_' o '-')")
+        match_mode = payload.get("match_mode", "any")
+        if match_mode not in ("any", "all"):
+            raise ValueError(f"Suscripción {subscription_id}: match_mode debe ser 'any' o 'all'")
+        record_fields = set(RemateRecord.__dataclass_fields__)
+        match_fields = tuple(payload.get("match_fields") or DEFAULT_MATCH_FIELDS)
+        invalid = [name for name in match_fields if name not in record_fields]
+        if invalid:
+            raise ValueError(f"Suscripción {subscription_id}: campos inexistentes {', '.join(invalid)}")
+        keywords = tuple(dict.fromkeys(k for k in map(normalize_text, payload.get("keywords") or []) if k))
+        return cls(
+            id=subscription_id,
+            keywords=keywords,
+            match_fields=match_fields,
+            match_mode=match_mode,
+            tipo_bien=payload.get("tipo_bien"),
+            region=payload.get("region"),
+            comuna=payload.get("comuna"),
+            min_price=payload.get("min_price"),
+            max_price=payload.get("max_price"),
+        )
+
+    def accepts(self, record: RemateRecord) -> bool:
+        """Criterios que no son palabras clave (tipo, región, comuna y precio).
+
+        Región y comuna se comparan sin tildes ni mayúsculas.
+        """
+        if self.tipo_bien and record.tipo_bien != self.tipo_bien:
+            return False
+        if self.region and _place_key(record.region) != self.region:
+            return False
+        if self.comuna and _place_key(record.comuna) != self.comuna:
+            return False
+        if self.min_price is not None or self.max_price is not None:
+            if record.valor_minimo is None:
+                return False
+            if self.min_price is not None and record.valor_minimo < self.min_price:
+                return False
+            if self.max_price is not None and record.valor_minimo > self.max_price:
+                return False
+        return True
+
+
+@dataclass
+class _FieldGroup:
+    """Suscripciones que revisan los mismos campos, indexadas por palabra clave."""
+
+    fields: Tuple[str, ...]
+    keywords: List[str] = field(default_factory=list)
+    by_keyword: Dict[str, List[int]] = field(default_factory=dict)
+
+
+class AlertEngine:
+    """Evalúa todas las suscripciones a la vez sobre cada remate."""
+
+    def __init__(self, subscriptions: Sequence[Subscription]) -> None:
+        ids = Counter(subscription.id for subscription in subscriptions)
+        repeated = [subscription_id for subscription_id, count in ids.items() if count > 1]
+        if repeated:
+            raise ValueError(f"Ids de suscripción repetidos: {', '.join(sorted(repeated))}")
+        self.subscriptions = list(subscriptions)
+        self._groups: Dict[Tuple[str, ...], _FieldGroup] = {}
+        # Suscripciones sin palabras clave: solo se revisan sus otros criterios
+        self._without_keywords: List[int] = []
+        for position, subscription in enumerate(self.subscriptions):
+            if not subscription.keywords:
+                self._without_keywords.append(position)
+                continue
+            group = self._groups.setdefault(subscription.match_fields, _FieldGroup(subscription.match_fields))
+            for keyword in subscription.keywords:
+                if keyword not in group.by_keyword:
+                    group.keywords.append(keyword)
+                    group.by_keyword[keyword] = []
+                group.by_keyword[keyword].append(position)
+
+    def match(self, record: RemateRecord, haystacks: HaystackCache) -> List[int]:
+        """Posiciones de las suscripciones que coinciden con ``record``."""
+        hits: Counter = Counter()
+        for group in self._groups.values():
+            haystack = haystacks.get(record, group.fields)
+            for keyword in group.keywords:
+                if keyword in haystack:
+                    hits.update(group.by_keyword[keyword])
+        matched: List[int] = []
+        for position, count in hits.items():
+            subscription = self.subscriptions[position]
+            complete = count == len(subscription.keywords) if subscription.match_mode == "all" else True
+            if complete and subscription.accepts(record):
+                matched.append(position)
+        matched.extend(
+            position for position in self._without_keywords if self.subscriptions[position].accepts(record)
+        )
+        return sorted(matched)
+
+    def run(self, records: Iterable[RemateRecord]) -> Dict[str, List[RemateRecord]]:
+        """Remates de ``records`` que coinciden con cada suscripción (lista vacía si ninguno)."""
+        haystacks = HaystackCache()
+        matches: Dict[str, List[RemateRecord]] = {subscription.id: [] for subscription in self.subscriptions}
+        for record in records:
+            for position in self.match(record, haystacks):
+                matches[self.subscriptions[position].id].append(record)
+        return matches
+
+
+def load_subscriptions(path: Path) -> List[Subscription]:
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    items = payload.get("subscriptions", []) if isinstance(payload, dict) else payload
+    return [Subscription.from_dict(item) for item in items]
+
+
+def load_seen(path: Path) -> Optional[Set[str]]:
+    """Códigos vistos en la corrida anterior, o None si es la primera."""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return set(payload.get("seen", []))
+
+
+def _write_text(target: Path, text: str) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, target)
+
+
+_HEADER_PREFIX = '{"subscription": '
+
+
+def write_matches(directory: Path, matches: Dict[str, List[RemateRecord]], generated_at: datetime) -> int:
+    """Escribe ``<id>.json`` por cada suscripción de ``matches``, con un remate por línea.
+
+    Un mismo remate suele avisar a muchas suscripciones: se serializa una
+    sola vez. Borra los ``.json`` de alertas de suscripciones que no están
+    en ``matches`` (solo los que escribió esta función) y devuelve cuántos.
+    """
+    lines: Dict[str, str] = {}
+    for subscription_id, records in matches.items():
+        for record in records:
+            if record.codigo_validacion not in lines:
+                lines[record.codigo_validacion] = json.dumps(record.as_serializable(), ensure_ascii=False)
+        header = json.dumps(
+            {"subscription": subscription_id, "generated_at": generated_at.isoformat() + "Z"}, ensure_ascii=False
+        )
+        body = ",\n".join(lines[record.codigo_validacion] for record in records)
+        records_json = f"[\n{body}\n]" if body else "[]"
+        _write_text(directory / f"{subscription_id}.json", f'{header[:-1]}, "records": {records_json}}}\n')
+
+    removed = 0
+    if directory.exists():
+        for path in directory.glob("*.json"):
+            if path.stem in matches:
+                continue
+            try:
+                with path.open(encoding="utf-8") as handle:
+                    stale = handle.read(len(_HEADER_PREFIX)) == _HEADER_PREFIX
+            except (OSError, UnicodeDecodeError):
+                continue
+            if stale:
+                path.unlink(missing_ok=True)
+                removed += 1
+    return removed
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main alerts",
+        description="Evalúa búsquedas guardadas contra los remates nuevos desde la corrida anterior",
+    )
+    parser.add_argument(
+        "--subscriptions",
+        type=Path,
+        required=True,
+        help="JSON con la lista de suscripciones (id, keywords, match_fields, match_mode, región, precios...)",
+    )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=Path("data/remates.json"),
+        help="Dataset a revisar (por defecto data/remates.json)",
+    )
+    parser.add_argument(
+        "--state",
+        type=Path,
+        default=DEFAULT_STATE_PATH,
+        help=f"Archivo con los códigos ya revisados (por defecto {DEFAULT_STATE_PATH})",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=DEFAULT_OUTPUT_DIR,
+        help=(
+            "Directorio de los archivos <id>.json, uno por suscripción en cada corrida "
+            f"(por defecto {DEFAULT_OUTPUT_DIR})"
+        ),
+    )
+    parser.add_argument(
+        "--baseline",
+        action="store_true",
+        help="Sin estado previo, marca todo el dataset como visto sin emitir alertas",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        subscriptions = load_subscriptions(args.subscriptions)
+        engine = AlertEngine(subscriptions)
+    except (OSError, ValueError, TypeError, AttributeError) as exc:
+        print(f"[ERROR] No se pudieron leer las suscripciones de {args.subscriptions}: {exc}", file=sys.stderr)
+        return 1
+    try:
+        records = load_dataset(args.dataset)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        print(f"[ERROR] No se pudo leer {args.dataset}: {exc}", file=sys.stderr)
+        return 1
+
+    seen = load_seen(args.state)
+    if seen is None and args.baseline:
+        new_records: List[RemateRecord] = []
+    else:
+        new_records = [record for record in records if seen is None or record.codigo_validacion not in seen]
+    matches = engine.run(new_records)
+    removed = write_matches(args.output_dir, matches, datetime.now(UTC))
+
+    # Solo se recuerdan los códigos del dataset actual: el estado no crece
+    # con los remates que ya salieron del periodo
+    seen_codigos = sorted(record.codigo_validacion for record in records)
+    _write_text(args.state, json.dumps({"seen": seen_codigos}, ensure_ascii=False) + "\n")
+
+    total = sum(len(items) for items in matches.values())
+    notified = sum(1 for items in matches.values() if items)
+    print(
+        f"{len(new_records)} remates nuevos revisados contra {len(subscriptions)} suscripciones: "
+        f"{total} alertas para {notified} suscripciones en {args.output_dir}"
+    )
+    if removed:
+        print(f"Se borraron {removed} archivos de suscripciones que ya no existen")
+    return 0
+
+
+__all__ = ["AlertEngine", "Subscription", "load_subscriptions", "main", "write_matches"]
@@ -0,0 +1,392 @@
+"""
+API HTTP de solo lectura sobre el dataset, cargado e indexado en memoria.
+
+    python3 -m backend.remates_scraper.main serve --dataset data/remates.json --port 8000
+
+Rutas (todas GET, respuestas JSON):
+
+``/remates``
+    Remates filtrados, ordenados y paginados. Filtros: ``tipo_bien``,
+    ``region``, ``comuna``, ``desde``/``hasta`` (YYYY-MM-DD, sobre la fecha
+    del remate o, si falta, la de publicación, como el frontend),
+    ``min_price``/``max_price`` y ``keywords`` (repetible), con
+    ``match_fields`` y ``match_mode`` igual que ``filter_records``. Orden con
+    ``sort`` (``fecha_publicacion``, ``fecha_remate`` o ``valor_minimo``; con
+    ``-`` delante, descendente; por defecto, el del dataset) y páginas con
+    ``page`` y ``page_size``.
+``/facets``
+    Conteos por tipo de bien, región, comuna y mes (como
+    ``remates.facets.json``) de los remates que cumplen los mismos filtros.
+``/health``
+    Cantidad de remates y cuándo se cargó el dataset.
+
+El dataset se vuelve a cargar solo cuando el archivo se reemplaza (como
+hace ``write_dataset``): un hilo revisa su inode, tamaño y fecha, arma el
+índice nuevo y lo cambia de una vez, sin cortar las consultas en curso.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import UTC, date, datetime
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .search import DEFAULT_MATCH_FIELDS, HaystackCache, KeywordMatcher, record_haystack
+from .storage import FacetCounter, RemateRecord, load_dataset, shard_date
+
+FACET_FIELDS = ("tipo_bien", "region", "comuna")
+SORT_FIELDS = ("fecha_publicacion", "fecha_remate", "valor_minimo")
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+# Consultas recientes cuyo resultado se guarda (los tableros repiten mucho)
+QUERY_CACHE_SIZE = 256
+
+
+class QueryError(ValueError):
+    """Parámetros de consulta inválidos (HTTP 400)."""
+
+
+class DatasetIndex:
+    """Los remates de un dataset con sus índices; no cambia una vez armado.
+
+    Las posiciones son las del dataset (publicación y código, del más nuevo
+    al más antiguo). Tipo, región y comuna tienen un índice hash con las
+    posiciones de cada valor, en orden; la fecha del filtro y el valor
+    mínimo, arreglos ordenados para buscar rangos con bisect. Cada remate se
+    serializa una sola vez, al cargar.
+    """
+
+    def __init__(self, records: Sequence[RemateRecord], loaded_at: Optional[datetime] = None) -> None:
+        self.records = list(records)
+        self.loaded_at = loaded_at or datetime.now(UTC)
+        self.json = [json.dumps(record.as_serializable(), ensure_ascii=False) for record in self.records]
+        self.facets: Dict[str, Dict[Optional[str], List[int]]] = {name: {} for name in FACET_FIELDS}
+        for position, record in enumerate(self.records):
+            for name in FACET_FIELDS:
+                self.facets[name].setdefault(getattr(record, name), []).append(position)
+
+        # Fecha del filtro como en el frontend: la del remate o la de publicación
+        self.filter_dates = [shard_date(record) for record in self.records]
+        self._by_date = sorted(range(len(self.records)), key=self.filter_dates.__getitem__)
+        self._sorted_dates = [self.filter_dates[position] for position in self._by_date]
+        priced = [position for position, record in enumerate(self.records) if record.valor_minimo is not None]
+        self._by_price = sorted(priced, key=lambda position: self.records[position].valor_minimo)
+        self._sorted_prices = [self.records[position].valor_minimo for position in self._by_price]
+
+        # Solo los campos por defecto: con match_fields arbitrarios la cache
+        # crecería con cada combinación que pida un cliente
+        self.haystacks = HaystackCache()
+        for record in self.records:
+            self.haystacks.get(record, DEFAULT_MATCH_FIELDS)
+        self._cache: "OrderedDict[Tuple, List[int]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def date_range(self, start: Optional[date], end: Optional[date]) -> List[int]:
+        low = bisect_left(self._sorted_dates, start) if start else 0
+        high = bisect_right(self._sorted_dates, end) if end else len(self._sorted_dates)
+        return self._by_date[low:high]
+
+    def price_range(self, minimum: Optional[int], maximum: Optional[int]) -> List[int]:
+        low = bisect_left(self._sorted_prices, minimum) if minimum is not None else 0
+        high = bisect_right(self._sorted_prices, maximum) if maximum is not None else len(self._sorted_prices)
+        return self._by_price[low:high]
+
+    def search(self, query: "Query") -> List[int]:
+        """Posiciones que cumplen ``query``, ya ordenadas."""
+        key = query.key()
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        positions = self._search(query)
+        with self._cache_lock:
+            self._cache[key] = positions
+            if len(self._cache) > QUERY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return positions
+
+    def _search(self, query: "Query") -> List[int]:
+        # Candidatos: la lista más corta entre los índices que aplican; el
+        # resto de los criterios se revisa remate por remate
+        candidates: List[Tuple[List[int], bool]] = []  # (posiciones, ya en orden del dataset)
+        for name in FACET_FIELDS:
+            value = query.facets.get(name)
+            if value:
+                candidates.append((self.facets[name].get(value, []), True))
+        if query.start or query.end:
+            candidates.append((self.date_range(query.start, query.end), False))
+        if query.min_price is not None or query.max_price is not None:
+            candidates.append((self.price_range(query.min_price, query.max_price), False))
+        if candidates:
+            base, in_order = min(candidates, key=lambda item: len(item[0]))
+        else:
+            base, in_order = range(len(self.records)), True
+
+        matcher = KeywordMatcher(query.keywords, query.match_mode) if query.keywords else None
+        if query.match_fields == DEFAULT_MATCH_FIELDS:
+            haystack_for = partial(self.haystacks.get, fields=DEFAULT_MATCH_FIELDS)
+        else:
+            haystack_for = partial(record_haystack, fields=query.match_fields)
+        if matcher is not None and not matcher:
+            return []
+        facet_checks = [(name, value) for name, value in query.facets.items() if value]
+        positions: List[int] = []
+        for position in base:
+            record = self.records[position]
+            if any(getattr(record, name) != value for name, value in facet_checks):
+                continue
+            filter_date = self.filter_dates[position]
+            if (query.start and filter_date < query.start) or (query.end and filter_date > query.end):
+                continue
+            if query.min_price is not None or query.max_price is not None:
+                price = record.valor_minimo
+                if price is None:
+                    continue
+                if (query.min_price is not None and price < query.min_price) or (
+                    query.max_price is not None and price > query.max_price
+                ):
+                    continue
+            if matcher is not None and not matcher.matches(haystack_for(record)):
+                continue
+            positions.append(position)
+
+        if not in_order:
+            positions.sort()
+        if query.sort:
+            descending = query.sort.startswith("-")
+            field = query.sort.lstrip("-")
+            # Los remates sin el dato van siempre al final
+            present = [p for p in positions if getattr(self.records[p], field) is not None]
+            missing = [p for p in positions if getattr(self.records[p], field) is None]
+            present.sort(key=lambda p: getattr(self.records[p], field), reverse=descending)
+            return present + missing
+        return positions
+
+    def facet_counts(self, positions: Sequence[int]) -> dict:
+        counter = FacetCounter()
+        for position in positions:
+            counter.add(self.records[position])
+        return counter.as_dict()
+
+
+class Query:
+    """Filtros, orden y página de una petición."""
+
+    def __init__(self, params: Dict[str, List[str]]) -> None:
+        def single(name: str) -> Optional[str]:
+            values = params.get(name)
+            return values[-1] if values else None
+
+        def integer(name: str, default: Optional[int] = None) -> Optional[int]:
+            value = single(name)
+            if value is None or value == "":
+                return default
+            try:
+                return int(value)
+            except ValueError:
+                raise QueryError(f"{name} debe ser un número entero") from None
+
+        def day(name: str) -> Optional[date]:
+            value = single(name)
+            if not value:
+                return None
+            try:
+                return date.fromisoformat(value)
+            except ValueError:
+                raise QueryError(f"{name} debe tener formato YYYY-MM-DD") from None
+
+        self.facets = {name: single(name) or None for name in FACET_FIELDS}
+        self.start = day("desde")
+        self.end = day("hasta")
+        self.min_price = integer("min_price")
+        self.max_price = integer("max_price")
+        self.keywords = tuple(params.get("keywords", []))
+        self.match_mode = single("match_mode") or "any"
+        if self.match_mode not in ("any", "all"):
+            raise QueryError("match_mode debe ser any o all")
+        self.match_fields = tuple(params.get("match_fields", [])) or DEFAULT_MATCH_FIELDS
+        invalid = [name for name in self.match_fields if name not in RemateRecord.__dataclass_fields__]
+        if invalid:
+            raise QueryError(f"Campos inexistentes en match_fields: {', '.join(invalid)}")
+        self.sort = single("sort") or None
+        if self.sort and self.sort.lstrip("-") not in SORT_FIELDS:
+            raise QueryError(f"sort debe ser uno de {', '.join(SORT_FIELDS)} (con - para descendente)")
+        self.page = integer("page", 1)
+        self.page_size = integer("page_size", DEFAULT_PAGE_SIZE)
+        if self.page < 1 or not 1 <= self.page_size <= MAX_PAGE_SIZE:
+            raise QueryError(f"page debe ser >= 1 y page_size entre 1 y {MAX_PAGE_SIZE}")
+
+    def key(self) -> Tuple:
+        """Identifica el resultado (sin la página)."""
+        return (
+            tuple(self.facets.items()),
+            self.start,
+            self.end,
+            self.min_price,
+            self.max_price,
+            self.keywords,
+            self.match_mode,
+            self.match_fields,
+            self.sort,
+        )
+
+
+class DatasetHolder:
+    """Índice vigente del dataset; lo reemplaza cuando el archivo cambia."""
+
+    def __init__(self, path: Path, interval: float = 1.0) -> None:
+        self.path = path
+        self.interval = interval
+        self._signature = self._stat()
+        self.index = DatasetIndex(load_dataset(path))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def reload_if_changed(self) -> bool:
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            index = DatasetIndex(load_dataset(self.path))
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            # Un archivo a medio escribir (sin reemplazo atómico) se reintenta
+            # en la próxima vuelta
+            print(f"[WARN] No se pudo recargar {self.path}: {exc}", file=sys.stderr)
+            return False
+        self._signature = signature
+        self.index = index
+        print(f"Dataset recargado: {len(index.records)} remates de {self.path}")
+        return True
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.reload_if_changed()
+
+
+def make_handler(holder: DatasetHolder) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "RematesAPI/1"
+
+        def do_GET(self) -> None:  # noqa: N802 (nombre de http.server)
+            url = urlsplit(self.path)
+            params = parse_qs(url.query)
+            # Una sola referencia por petición: una recarga no la cambia a la mitad
+            index = holder.index
+            try:
+                if url.path == "/remates":
+                    self._send(HTTPStatus.OK, self._remates(index, Query(params)))
+                elif url.path == "/facets":
+                    query = Query(params)
+                    self._send(HTTPStatus.OK, json.dumps(index.facet_counts(index.search(query)), ensure_ascii=False))
+                elif url.path == "/health":
+                    payload = {"records": len(index.records), "loaded_at": index.loaded_at.isoformat() + "Z"}
+                    self._send(HTTPStatus.OK, json.dumps(payload))
+                else:
+                    self._send(HTTPStatus.NOT_FOUND, json.dumps({"error": f"Ruta desconocida: {url.path}"}))
+            except QueryError as exc:
+                self._send(HTTPStatus.BAD_REQUEST, json.dumps({"error": str(exc)}, ensure_ascii=False))
+
+        def _remates(self, index: DatasetIndex, query: Query) -> str:
+            positions = index.search(query)
+            start = (query.page - 1) * query.page_size
+            page = positions[start : start + query.page_size]
+            header = json.dumps({"total": len(positions), "page": query.page, "page_size": query.page_size})
+            # Los remates ya vienen serializados desde la carga
+            return f'{header[:-1]}, "records": [{", ".join(index.json[position] for position in page)}]}}'
+
+        def _send(self, status: HTTPStatus, body: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+            if self.server.verbose:  # type: ignore[attr-defined]
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main serve",
+        description="API HTTP de solo lectura (JSON) sobre el dataset, con recarga al reemplazarse el archivo",
+    )
+    parser.add_argument(
+        "--dataset",
+        type=Path,
+        default=Path("data/remates.json"),
+        help="Dataset a servir, en cualquier formato de write_dataset (por defecto data/remates.json)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección donde escuchar (por defecto 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Puerto (por defecto 8000)")
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=1.0,
+        help="Segundos entre revisiones del archivo del dataset (por defecto 1)",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Registra cada petición en stderr")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    started = time.perf_counter()
+    try:
+        holder = DatasetHolder(args.dataset, args.reload_interval)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        print(f"[ERROR] No se pudo leer {args.dataset}: {exc}", file=sys.stderr)
+        return 1
+    try:
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(holder))
+    except OSError as exc:
+        print(f"[ERROR] No se pudo escuchar en {args.host}:{args.port}: {exc}", file=sys.stderr)
+        return 1
+    print(
+        f"{len(holder.index.records)} remates de {args.dataset} indexados en "
+        f"{time.perf_counter() - started:.2f}s; escuchando en http://{args.host}:{args.port}"
+    )
+    server.daemon_threads = True
+    server.verbose = args.verbose  # type: ignore[attr-defined]
+    holder.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        holder.stop()
+        server.server_close()
+    return 0
+
+
+__all__ = ["DatasetHolder", "DatasetIndex", "Query", "QueryError", "main"]
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import replace
+from typing import AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from .cache import PdfCache
+from .client import (
+    DEFAULT_BASE_URL,
+    DEFAULT_USER_AGENT,
+    PagePlan,
+    PageRequest,
+    SeekResult,
+    _CsrfMixin,
+    _first_fecha,
+    _reaches_mark,
+    _seek_steps,
+    build_page_payload,
+)
+
+
+class AsyncBoletinClient(_CsrfMixin):
+    """Contraparte asyncio de BoletinClient (aiohttp).
+
+    Un semáforo limita las peticiones en vuelo y el conector reutiliza hasta
+    ``max_connections`` conexiones. Si el token CSRF vence (HTTP 403), se
+    vuelve a ejecutar bootstrap() una sola vez y se reintenta la petición.
+
+    Uso::
+
+        async with AsyncBoletinClient() as client:
+            await client.bootstrap()
+            pdf = await client.download_pdf(codigo)
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        user_agent: str = DEFAULT_USER_AGENT,
+        timeout: int = 30,
+        pdf_cache: Optional[PdfCache] = None,
+        max_connections: int = 100,
+        page_concurrency: int = 2,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.pdf_cache = pdf_cache
+        self.max_connections = max_connections
+        self.page_concurrency = max(1, page_concurrency)
+        self._csrf_token: Optional[str] = None
+        self._csrf_header_name: Optional[str] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_connections)
+        self._bootstrap_lock = asyncio.Lock()
+        self._csrf_generation = 0
+
+    async def __aenter__(self) -> "AsyncBoletinClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+    async def open(self) -> None:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                headers={"User-Agent": self.user_agent},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None:
+            raise RuntimeError("Cliente no abierto. Usa 'async with AsyncBoletinClient()' u open().")
+        return self._session
+
+    # ------------------------------------------------------------------
+    # Bootstrap & CSRF
+    # ------------------------------------------------------------------
+    async def bootstrap(self) -> None:
+        """Carga /boletin/remates y captura los tokens CSRF."""
+        async with self._bootstrap_lock:
+            await self._bootstrap()
+
+    async def _bootstrap(self) -> None:
+        url = f"{self.base_url}/boletin/remates"
+        async with self.session.get(url) as response:
+            response.raise_for_status()
+            self._store_csrf(await response.text())
+        self._csrf_generation += 1
+
+    async def _post(self, path: str, data: Dict[str, str], accept: str) -> bytes:
+        url = f"{self.base_url}{path}"
+        for attempt in range(2):
+            generation = self._csrf_generation
+            headers = self._csrf_headers() | {"Accept": accept}
+            async with self._semaphore:
+                async with self.session.post(url, data=data, headers=headers) as response:
+                    if response.status != 403 or attempt:
+                        response.raise_for_status()
+                        return await response.read()
+
+            # Token vencido: aunque fallen muchas peticiones a la vez,
+            # solo la primera vuelve a cargar la página inicial.
+            async with self._bootstrap_lock:
+                if self._csrf_generation == generation:
+                    await self._bootstrap()
+        raise AssertionError("unreachable")
+
+    # ------------------------------------------------------------------
+    # Iterador de DataTables
+    # ------------------------------------------------------------------
+    async def fetch_page(self, page_request: PageRequest, start: int, draw: int) -> Dict:
+        body = await self._post(
+            page_request.endpoint,
+            build_page_payload(page_request, start, draw),
+            "application/json",
+        )
+        return json.loads(body)
+
+    async def _fetch_timed(self, page_request: PageRequest, start: int, draw: int) -> Tuple[Dict, float]:
+        started = time.perf_counter()
+        data = await self.fetch_page(page_request, start, draw)
+        return data, time.perf_counter() - started
+
+    async def iter_pages(self, page_request: PageRequest) -> AsyncIterator[Dict]:
+        """Igual que BoletinClient.iter_pages, con hasta ``page_concurrency`` páginas en vuelo."""
+        plan = PagePlan(page_request, self.page_concurrency)
+        pending: Deque[Tuple[int, int, asyncio.Task]] = deque()
+        draw = page_request.draw
+
+        def launch(offset: int, length: int, first: bool = False) -> None:
+            nonlocal draw
+            request = replace(page_request, length=length)
+            task = asyncio.ensure_future(self._fetch_timed(request, offset, draw))
+            draw += 1
+            if first:
+                pending.appendleft((offset, length, task))
+            else:
+                pending.append((offset, length, task))
+
+        try:
+            launch(*plan.next_request())
+            while pending:
+                offset, length, task = pending.popleft()
+                data, elapsed = await task
+                entries: List[Dict] = data.get("data", [])
+                if not entries:
+                    break
+
+                gap = plan.observe(offset, length, data, elapsed)
+                if gap is not None:
+                    launch(*gap, first=True)
+                reached = bool(page_request.stop_at) and _reaches_mark(entries, page_request.stop_at)
+                if not reached:
+                    window = self.page_concurrency if plan.total is not None else 1
+                    while len(pending) < window and (request := plan.next_request()) is not None:
+                        launch(*request)
+                yield data
+                if reached:
+                    break
+        finally:
+            for _, _, task in pending:
+                task.cancel()
+
+    async def seek(self, endpoint: str, newest: str) -> SeekResult:
+        """Igual que BoletinClient.seek."""
+        probe = PageRequest(endpoint=endpoint, length=1)
+        steps = _seek_steps(newest)
+        offset = next(steps)
+        probes = total = 0
+        try:
+            while True:
+                data = await self.fetch_page(probe, offset, probes + 1)
+                probes += 1
+                total = int(data.get("recordsTotal") or 0)
+                offset = steps.send((total, _first_fecha(data)))
+        except StopIteration as done:
+            return SeekResult(offset=done.value, probes=probes, total=total)
+
+    # ------------------------------------------------------------------
+    # Descarga de PDF
+    # ------------------------------------------------------------------
+    async def download_pdf(self, codigo_validacion: str) -> bytes:
+        """Descarga el PDF de un remate, consultando antes la cache en disco."""
+        # La cache lee y escribe en disco: en un hilo, para no detener el event loop
+        if self.pdf_cache is not None:
+            cached = await asyncio.to_thread(self.pdf_cache.get, codigo_validacion)
+            if cached is not None:
+                return cached
+
+        content = await self._post(
+            "/boletin/downloadDocumentoByCodigo",
+            {"codigoValidacion": codigo_validacion},
+            "application/pdf,application/octet-stream",
+        )
+        if self.pdf_cache is not None and content.startswith(b"%PDF"):
+            await asyncio.to_thread(self.pdf_cache.put, codigo_validacion, content)
+        return content
+
+
+__all__ = ["AsyncBoletinClient"]
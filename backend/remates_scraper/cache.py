@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .parser import RemateDetail, parse_remate_text
+
+DEFAULT_CACHE_DIR = Path(".cache/pdf")
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+DEFAULT_MAX_AGE_DAYS = 180
+
+
+@dataclass
+class CacheEntry:
+    sha256: str
+    size: int
+    stored_at: float
+    last_access: float
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def summary(self) -> str:
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0.0
+        return (
+            f"{self.hits} aciertos, {self.misses} fallos ({ratio:.1f}% aciertos), "
+            f"{self.stores} guardados, {self.evictions} eliminados"
+        )
+
+
+def content_digest(pdf_bytes: bytes) -> str:
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+class PdfCache:
+    """Almacén en disco de PDFs, indexado por código y direccionado por contenido.
+
+    Los PDFs se guardan una sola vez en ``objects/<sha[:2]>/<sha>.pdf`` y el
+    índice ``index.json`` asocia cada ``codigo_validacion`` con su hash. Así un
+    mismo documento publicado bajo varios códigos ocupa espacio una sola vez.
+    El texto extraído de cada objeto se guarda en ``texts/<sha[:2]>/<sha>.json.gz``
+    y se borra junto con el PDF.
+    """
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_CACHE_DIR,
+        *,
+        max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+        max_age_days: Optional[int] = DEFAULT_MAX_AGE_DAYS,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+        self.stats = CacheStats()
+        self._index_path = self.root / "index.json"
+        self._entries: Dict[str, CacheEntry] = self._load_index()
+        self._dirty = False
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Índice
+    # ------------------------------------------------------------------
+    def _load_index(self) -> Dict[str, CacheEntry]:
+        if not self._index_path.exists():
+            return {}
+        try:
+            raw = json.loads(self._index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        entries: Dict[str, CacheEntry] = {}
+        for codigo, item in raw.get("entries", {}).items():
+            try:
+                entries[codigo] = CacheEntry(**item)
+            except TypeError:
+                continue
+        return entries
+
+    def flush(self) -> None:
+        """Guarda el índice en disco (escritura atómica)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.root.mkdir(parents=True, exist_ok=True)
+            payload = {"entries": {codigo: asdict(entry) for codigo, entry in self._entries.items()}}
+            tmp_path = self._index_path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(tmp_path, self._index_path)
+            self._dirty = False
+
+    def _object_path(self, sha256: str) -> Path:
+        return self.root / "objects" / sha256[:2] / f"{sha256}.pdf"
+
+    def _text_path(self, sha256: str) -> Path:
+        return self.root / "texts" / sha256[:2] / f"{sha256}.json.gz"
+
+    # ------------------------------------------------------------------
+    # Lectura / escritura
+    # ------------------------------------------------------------------
+    def digest_for(self, codigo_validacion: str) -> Optional[str]:
+        """Hash del contenido guardado para un código, sin leer el PDF."""
+        with self._lock:
+            entry = self._entries.get(codigo_validacion)
+            if entry is None or self._is_expired(entry, time.time()):
+                return None
+            if not self._object_path(entry.sha256).exists():
+                return None
+            return entry.sha256
+
+    def get(self, codigo_validacion: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(codigo_validacion)
+            now = time.time()
+            if entry is None or self._is_expired(entry, now):
+                self.stats.misses += 1
+                return None
+        try:
+            data = self._object_path(entry.sha256).read_bytes()
+        except OSError:
+            with self._lock:
+                self._entries.pop(codigo_validacion, None)
+                self._dirty = True
+                self.stats.misses += 1
+            return None
+        with self._lock:
+            entry.last_access = now
+            self._dirty = True
+            self.stats.hits += 1
+            return data
+
+    def put(self, codigo_validacion: str, pdf_bytes: bytes) -> str:
+        with self._lock:
+            sha256 = content_digest(pdf_bytes)
+            path = self._object_path(sha256)
+            if not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                tmp_path.write_bytes(pdf_bytes)
+                os.replace(tmp_path, path)
+            now = time.time()
+            self._entries[codigo_validacion] = CacheEntry(
+                sha256=sha256,
+                size=len(pdf_bytes),
+                stored_at=now,
+                last_access=now,
+            )
+            self._dirty = True
+            self.stats.stores += 1
+            return sha256
+
+    def get_text(self, sha256: str) -> Optional[Tuple[str, bool]]:
+        """Texto extraído del PDF con ese hash y si cubre todas sus páginas."""
+        try:
+            payload = json.loads(gzip.decompress(self._text_path(sha256).read_bytes()))
+            return payload["text"], bool(payload["complete"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put_text(self, sha256: str, text: str, complete: bool) -> None:
+        path = self._text_path(sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"text": text, "complete": complete}, ensure_ascii=False).encode("utf-8")
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(gzip.compress(payload, mtime=0))
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # Expiración
+    # ------------------------------------------------------------------
+    def _is_expired(self, entry: CacheEntry, now: float) -> bool:
+        return self.max_age_seconds is not None and now - entry.stored_at > self.max_age_seconds
+
+    def evict(self) -> int:
+        """Aplica las políticas de antigüedad y tamaño. Devuelve los PDFs borrados."""
+        with self._lock:
+            now = time.time()
+            for codigo, entry in list(self._entries.items()):
+                if self._is_expired(entry, now):
+                    del self._entries[codigo]
+                    self._dirty = True
+
+            # Tamaño total por objeto (los objetos compartidos cuentan una vez)
+            last_access: Dict[str, float] = {}
+            sizes: Dict[str, int] = {}
+            for entry in self._entries.values():
+                last_access[entry.sha256] = max(last_access.get(entry.sha256, 0.0), entry.last_access)
+                sizes[entry.sha256] = entry.size
+
+            doomed: set[str] = set()
+            if self.max_bytes is not None:
+                total = sum(sizes.values())
+                for sha256 in sorted(last_access, key=last_access.__getitem__):
+                    if total <= self.max_bytes:
+                        break
+                    doomed.add(sha256)
+                    total -= sizes[sha256]
+
+            if doomed:
+                for codigo, entry in list(self._entries.items()):
+                    if entry.sha256 in doomed:
+                        del self._entries[codigo]
+                self._dirty = True
+
+            # Borra del disco los objetos que ya no referencia ningún código
+            referenced = {entry.sha256 for entry in self._entries.values()}
+            removed = 0
+            objects_dir = self.root / "objects"
+            if objects_dir.exists():
+                for path in objects_dir.glob("*/*.pdf"):
+                    if path.stem not in referenced:
+                        path.unlink(missing_ok=True)
+                        removed += 1
+            texts_dir = self.root / "texts"
+            if texts_dir.exists():
+                for path in texts_dir.glob("*/*.json.gz"):
+                    if path.name[: -len(".json.gz")] not in referenced:
+                        path.unlink(missing_ok=True)
+            self.stats.evictions += removed
+            return removed
+
+    def close(self) -> None:
+        self.evict()
+        self.flush()
+
+
+class DetailCache:
+    """Detalles ya parseados, por hash del contenido del PDF.
+
+    Durante la corrida se guardan en memoria; con un PdfCache, el texto
+    extraído queda además en disco, así que un documento idéntico publicado
+    bajo otro código en una corrida posterior se arma desde ese texto sin
+    volver a pasar por pypdf. Un texto parcial (de ``--lazy-extract``) solo
+    sirve si ``accept_partial``.
+    """
+
+    def __init__(self, pdf_cache: Optional[PdfCache] = None, *, accept_partial: bool = False) -> None:
+        self.pdf_cache = pdf_cache
+        self.accept_partial = accept_partial
+        self.reused = 0
+        self._details: Dict[str, RemateDetail] = {}
+
+    def get(self, digest: str, codigo_validacion: str) -> Optional[RemateDetail]:
+        detail = self._details.get(digest)
+        if detail is None and self.pdf_cache is not None:
+            stored = self.pdf_cache.get_text(digest)
+            if stored is not None and (stored[1] or self.accept_partial):
+                text, complete = stored
+                detail = parse_remate_text(codigo_validacion, text)
+                detail.text_complete = complete
+                self._details[digest] = detail
+        if detail is None:
+            return None
+        self.reused += 1
+        return replace(detail, codigo_validacion=codigo_validacion)
+
+    def put(self, digest: str, detail: RemateDetail) -> None:
+        self._details[digest] = detail
+        if self.pdf_cache is not None:
+            self.pdf_cache.put_text(digest, detail.raw_text, detail.text_complete)
+
+
+__all__ = ["CacheEntry", "CacheStats", "DetailCache", "PdfCache", "content_digest"]
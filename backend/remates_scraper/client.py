@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
-from typing import Dict, Iterator, List, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Deque, Dict, Generator, Iterator, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from .cache import PdfCache
 
 # Dominio del Boletín
 DEFAULT_BASE_URL = "https://boletinconcursal.cl"
@@ -12,6 +19,8 @@ DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
     "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0 Safari/537.36"
 )
+# Tope del tamaño de página al ajustarlo según los tiempos de respuesta
+MAX_PAGE_LENGTH = 1000
 
 
 @dataclass
@@ -20,34 +29,98 @@ class PageRequest:
     start: int = 0
     length: int = 100
     draw: int = 1
+    # Marca de agua (fchPublicacion, codigoValidacion) de una ejecución anterior.
+    # Si se indica, la paginación se detiene tras la página que la alcanza.
+    stop_at: Optional[Tuple[str, str]] = None
+    # Ajusta ``length`` según los tiempos de respuesta (ver PagePlan)
+    adaptive: bool = False
+    max_length: int = MAX_PAGE_LENGTH
 
 
-class BoletinClient:
-    """HTTP client para los remates del Boletín Concursal."""
+class PagePlan:
+    """Offsets de un listado DataTables, planificados a partir de ``recordsTotal``.
 
-    def __init__(
-        self,
-        base_url: str = DEFAULT_BASE_URL,
-        user_agent: str = DEFAULT_USER_AGENT,
-        timeout: int = 30,
-    ) -> None:
-        self.base_url = base_url.rstrip("/")
-        self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": user_agent})
-        self._csrf_token: Optional[str] = None
-        self._csrf_header_name: Optional[str] = None
+    La primera página se pide sola; con ``recordsTotal`` ya se conocen todos
+    los offsets y no hace falta la petición extra que devuelve ``data`` vacío.
+    Con ``adaptive`` el tamaño de página se duplica mientras el rendimiento
+    por petición (registros por segundo) mejore al menos un 25%, y nunca
+    supera lo necesario para repartir lo que falta entre ``concurrency``
+    peticiones simultáneas. Si el servidor devuelve menos registros de los
+    pedidos sin haber llegado al final, se adopta ese tope y se vuelve a
+    pedir el tramo faltante.
+    """
 
-    # ------------------------------------------------------------------
-    # Bootstrap & CSRF
-    # ------------------------------------------------------------------
-    def bootstrap(self) -> None:
-        """Carga /boletin/remates y captura los tokens CSRF."""
-        url = f"{self.base_url}/boletin/remates"
-        response = self.session.get(url, timeout=self.timeout)
-        response.raise_for_status()
-        html = response.text
+    def __init__(self, page_request: PageRequest, concurrency: int = 1) -> None:
+        self.offset = page_request.start
+        self.length = max(1, page_request.length)
+        self.min_length = self.length
+        self.max_length = max(self.length, page_request.max_length)
+        self.adaptive = page_request.adaptive
+        self.concurrency = max(1, concurrency)
+        self.total: Optional[int] = None
+        self._best_rate: Optional[float] = None
+        self._best_length = self.length
+        self._settled = not self.adaptive
+
+    def next_request(self) -> Optional[Tuple[int, int]]:
+        """Siguiente (offset, length) a pedir, o None si ya se cubrió el total."""
+        length = self.length
+        if self.total is not None:
+            remaining = self.total - self.offset
+            if remaining <= 0:
+                return None
+            # Páginas más grandes que esto solo restarían paralelismo
+            length = min(length, max(self.min_length, -(-remaining // self.concurrency)))
+        request = (self.offset, length)
+        self.offset += length
+        return request
+
+    def observe(self, offset: int, length: int, data: Dict, elapsed: float) -> Optional[Tuple[int, int]]:
+        """Registra una respuesta; devuelve el tramo faltante si vino recortada."""
+        rows = len(data.get("data") or [])
+        total = data.get("recordsTotal")
+        if isinstance(total, int) or (isinstance(total, str) and total.isdigit()):
+            self.total = int(total)
+
+        if rows < length and self.total is not None and offset + rows < self.total and rows:
+            # El servidor tiene un tope menor que lo pedido
+            self.max_length = self.length = self.min_length = rows
+            self._settled = True
+            return offset + rows, length - rows
+
+        if self._settled or rows < length or length != self.length or elapsed <= 0:
+            return None
+        rate = rows / elapsed
+        if self._best_rate is None or rate >= self._best_rate * 1.25:
+            self._best_rate, self._best_length = rate, length
+            if length * 2 <= self.max_length:
+                self.length = length * 2
+                return None
+        self.length = self._best_length
+        self._settled = True
+        return None
 
+
+@dataclass
+class SeekResult:
+    """Resultado de buscar por fecha el primer remate de una ventana."""
+
+    offset: int
+    probes: int
+    total: int
+
+    def pages_skipped(self, page_size: int) -> int:
+        return self.offset // page_size
+
+
+class _CsrfMixin:
+    """Estado CSRF compartido por los clientes síncrono y asíncrono."""
+
+    base_url: str
+    _csrf_token: Optional[str] = None
+    _csrf_header_name: Optional[str] = None
+
+    def _store_csrf(self, html: str) -> None:
         token_match = re.search(r'<meta[^>]*name="_csrf"[^>]*content="([^"]+)"[^>]*>', html)
         header_match = re.search(r'<meta[^>]*name="_csrf_header"[^>]*content="([^"]+)"[^>]*>', html)
         if not token_match or not header_match:
@@ -76,65 +149,151 @@ class BoletinClient:
             "Origin": self.base_url,
         }
 
+
+class BoletinClient(_CsrfMixin):
+    """HTTP client para los remates del Boletín Concursal."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        user_agent: str = DEFAULT_USER_AGENT,
+        timeout: int = 30,
+        pdf_cache: Optional[PdfCache] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.pdf_cache = pdf_cache
+        self.page_concurrency = 1
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": user_agent})
+        self._csrf_token: Optional[str] = None
+        self._csrf_header_name: Optional[str] = None
+
+    # ------------------------------------------------------------------
+    # Bootstrap & CSRF
+    # ------------------------------------------------------------------
+    def bootstrap(self) -> None:
+        """Carga /boletin/remates y captura los tokens CSRF."""
+        url = f"{self.base_url}/boletin/remates"
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        self._store_csrf(response.text)
+
     # ------------------------------------------------------------------
     # Iterador de DataTables
     # ------------------------------------------------------------------
+    def fetch_page(self, page_request: PageRequest, start: int, draw: int) -> Dict:
+        url = f"{self.base_url}{page_request.endpoint}"
+        response = self.session.post(
+            url,
+            data=build_page_payload(page_request, start, draw),
+            headers=self._csrf_headers() | {"Accept": "application/json"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_timed(self, page_request: PageRequest, start: int, draw: int) -> Tuple[Dict, float]:
+        started = time.perf_counter()
+        data = self.fetch_page(page_request, start, draw)
+        return data, time.perf_counter() - started
+
+    def _page_executor(self) -> Optional[ThreadPoolExecutor]:
+        """Hilos para pedir páginas en paralelo (ninguno: una a la vez)."""
+        return None
+
     def iter_pages(self, page_request: PageRequest) -> Iterator[Dict]:
-        """Va devolviendo las páginas JSON del listado de remates."""
-        start = page_request.start
+        """Va devolviendo las páginas JSON del listado de remates, en orden.
+
+        Los offsets se planifican con PagePlan. Si el cliente tiene hilos para
+        páginas, se piden varias a la vez y se entregan en el orden del listado.
+        """
+        executor = self._page_executor()
+        concurrency = self.page_concurrency if executor is not None else 1
+        plan = PagePlan(page_request, concurrency)
+        pending: Deque[Tuple[int, int, Future]] = deque()
         draw = page_request.draw
 
-        while True:
-            payload = {
-                "draw": str(draw),
-                "start": str(start),
-                "length": str(page_request.length),
-                "columns[0][data]": "deudorNombre",
-                "columns[0][searchable]": "false",
-                "columns[0][orderable]": "false",
-                "columns[0][search][value]": "",
-                "columns[0][search][regex]": "false",
-                "columns[1][data]": "fchPublicacion",
-                "columns[1][searchable]": "false",
-                "columns[1][orderable]": "false",
-                "columns[1][search][value]": "",
-                "columns[1][search][regex]": "false",
-                "columns[2][data]": "entePublicador",
-                "columns[2][searchable]": "false",
-                "columns[2][orderable]": "false",
-                "columns[2][search][value]": "",
-                "columns[2][search][regex]": "false",
-                "columns[3][data]": "codigoValidacion",
-                "columns[3][searchable]": "false",
-                "columns[3][orderable]": "false",
-                "columns[3][search][value]": "",
-                "columns[3][search][regex]": "false",
-                "search[value]": "",
-                "search[regex]": "false",
-            }
-
-            url = f"{self.base_url}{page_request.endpoint}"
-            response = self.session.post(
-                url,
-                data=payload,
-                headers=self._csrf_headers() | {"Accept": "application/json"},
-                timeout=self.timeout,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            entries: List[Dict] = data.get("data", [])
-            if not entries:
-                break
-
-            yield data
-            start += page_request.length
+        def launch(offset: int, length: int, first: bool = False) -> None:
+            nonlocal draw
+            request = replace(page_request, length=length)
+            if executor is not None:
+                future = executor.submit(self._fetch_timed, request, offset, draw)
+            else:
+                future = Future()
+                try:
+                    future.set_result(self._fetch_timed(request, offset, draw))
+                except Exception as exc:  # pylint: disable=broad-except
+                    future.set_exception(exc)
             draw += 1
+            if first:
+                pending.appendleft((offset, length, future))
+            else:
+                pending.append((offset, length, future))
+
+        def fill() -> None:
+            # Sin recordsTotal no se sabe dónde termina: una página a la vez
+            window = concurrency if plan.total is not None else 1
+            while len(pending) < window and (request := plan.next_request()) is not None:
+                launch(*request)
+
+        try:
+            launch(*plan.next_request())
+            while pending:
+                offset, length, future = pending.popleft()
+                data, elapsed = future.result()
+                entries: List[Dict] = data.get("data", [])
+                if not entries:
+                    break
+
+                gap = plan.observe(offset, length, data, elapsed)
+                if gap is not None:
+                    launch(*gap, first=True)
+                reached = bool(page_request.stop_at) and _reaches_mark(entries, page_request.stop_at)
+                # Con hilos, las páginas siguientes se piden mientras se procesa
+                # esta; sin ellos, solo cuando se pide la próxima.
+                if executor is not None and not reached:
+                    fill()
+                yield data
+                if reached:
+                    break
+                if executor is None:
+                    fill()
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def seek(self, endpoint: str, newest: str) -> SeekResult:
+        """Offset del primer remate publicado en ``newest`` o antes (fecha ISO).
+
+        Usa búsqueda binaria sobre ``recordsTotal`` con páginas de un solo
+        registro, en vez de recorrer todas las páginas más recientes.
+        """
+        probe = PageRequest(endpoint=endpoint, length=1)
+        steps = _seek_steps(newest)
+        offset = next(steps)
+        probes = total = 0
+        try:
+            while True:
+                data = self.fetch_page(probe, offset, probes + 1)
+                probes += 1
+                total = int(data.get("recordsTotal") or 0)
+                offset = steps.send((total, _first_fecha(data)))
+        except StopIteration as done:
+            return SeekResult(offset=done.value, probes=probes, total=total)
 
     # ------------------------------------------------------------------
     # Descarga de PDF
     # ------------------------------------------------------------------
     def download_pdf(self, codigo_validacion: str) -> bytes:
+        """Descarga el PDF de un remate, consultando antes la cache en disco."""
+        if self.pdf_cache is not None:
+            cached = self.pdf_cache.get(codigo_validacion)
+            if cached is not None:
+                return cached
+
         url = f"{self.base_url}/boletin/downloadDocumentoByCodigo"
         headers = self._csrf_headers() | {
             "Accept": "application/pdf,application/octet-stream",
@@ -146,7 +305,139 @@ class BoletinClient:
             timeout=self.timeout,
         )
         response.raise_for_status()
-        return response.content
+        content = response.content
+        # Solo se guardan respuestas que realmente son PDF (no páginas de error)
+        if self.pdf_cache is not None and content.startswith(b"%PDF"):
+            self.pdf_cache.put(codigo_validacion, content)
+        return content
+
+
+class ThreadSafeBoletinClient(BoletinClient):
+    """Variante de BoletinClient que puede compartirse entre hilos.
+
+    Todos los hilos usan la misma sesión (cookies y token CSRF compartidos)
+    con un pool de conexiones del tamaño del número de workers.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        user_agent: str = DEFAULT_USER_AGENT,
+        timeout: int = 30,
+        pdf_cache: Optional[PdfCache] = None,
+        pool_size: int = 10,
+        page_concurrency: int = 1,
+    ) -> None:
+        super().__init__(base_url, user_agent, timeout, pdf_cache)
+        self.page_concurrency = page_concurrency
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+
+    def bootstrap(self) -> None:
+        with self._lock:
+            super().bootstrap()
+
+    def _csrf_headers(self) -> Dict[str, str]:
+        with self._lock:
+            return super()._csrf_headers()
+
+    def _page_executor(self) -> Optional[ThreadPoolExecutor]:
+        if self.page_concurrency <= 1:
+            return None
+        return ThreadPoolExecutor(max_workers=self.page_concurrency)
+
+
+def build_page_payload(page_request: PageRequest, start: int, draw: int) -> Dict[str, str]:
+    """Formulario DataTables que esperan los endpoints getRMP/getRIP."""
+    return {
+        "draw": str(draw),
+        "start": str(start),
+        "length": str(page_request.length),
+        "columns[0][data]": "deudorNombre",
+        "columns[0][searchable]": "false",
+        "columns[0][orderable]": "false",
+        "columns[0][search][value]": "",
+        "columns[0][search][regex]": "false",
+        "columns[1][data]": "fchPublicacion",
+        "columns[1][searchable]": "false",
+        "columns[1][orderable]": "false",
+        "columns[1][search][value]": "",
+        "columns[1][search][regex]": "false",
+        "columns[2][data]": "entePublicador",
+        "columns[2][searchable]": "false",
+        "columns[2][orderable]": "false",
+        "columns[2][search][value]": "",
+        "columns[2][search][regex]": "false",
+        "columns[3][data]": "codigoValidacion",
+        "columns[3][searchable]": "false",
+        "columns[3][orderable]": "false",
+        "columns[3][search][value]": "",
+        "columns[3][search][regex]": "false",
+        "search[value]": "",
+        "search[regex]": "false",
+    }
+
+
+_ISO_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _first_fecha(data: Dict) -> Optional[str]:
+    entries = data.get("data") or []
+    return entries[0].get("fchPublicacion") if entries else None
+
+
+def _seek_steps(newest: str) -> Generator[int, Tuple[int, Optional[str]], int]:
+    """Búsqueda binaria del primer registro con ``fchPublicacion <= newest``.
+
+    Genera los offsets a consultar y recibe ``(recordsTotal, fchPublicacion)``
+    de cada uno; el valor de retorno es el offset buscado. El listado viene
+    del más nuevo al más antiguo; si las fechas consultadas contradicen ese
+    orden se devuelve 0 y se recorre todo como antes.
+    """
+    total, fecha = yield 0
+    if not fecha or not _ISO_DATE_RE.fullmatch(fecha) or fecha <= newest or total <= 1:
+        return 0
+
+    probed = [(0, fecha)]
+    low, high = 1, total
+    while low < high:
+        middle = (low + high) // 2
+        _, fecha = yield middle
+        if fecha is None:
+            # El listado se achicó entre consultas: todo lo que sigue está vacío
+            high = middle
+            continue
+        if not _ISO_DATE_RE.fullmatch(fecha):
+            return 0
+        probed.append((middle, fecha))
+        if fecha <= newest:
+            high = middle
+        else:
+            low = middle + 1
+
+    fechas = [item for _, item in sorted(probed)]
+    if any(older < newer for older, newer in zip(fechas, fechas[1:])):
+        return 0
+    return low
+
+
+def _reaches_mark(entries: List[Dict], mark: Tuple[str, str]) -> bool:
+    """True si la página contiene la marca de agua o algo publicado antes."""
+    mark_date, mark_codigo = mark
+    for entry in entries:
+        fecha = entry.get("fchPublicacion") or ""
+        if entry.get("codigoValidacion") == mark_codigo or (fecha and fecha < mark_date):
+            return True
+    return False
 
 
-__all__ = ["BoletinClient", "PageRequest"]
+__all__ = [
+    "BoletinClient",
+    "PagePlan",
+    "PageRequest",
+    "SeekResult",
+    "ThreadSafeBoletinClient",
+    "build_page_payload",
+]
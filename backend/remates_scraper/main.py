@@ -1,19 +1,41 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import calendar
 import html
 import sys
 import textwrap
-import unicodedata
 from collections import Counter
+from dataclasses import dataclass, replace
 from datetime import UTC, date, datetime, timedelta
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
-
-from .client import BoletinClient, PageRequest
-from .parser import parse_remate_pdf
-from .storage import RemateRecord, write_dataset
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_AGE_DAYS, DetailCache, PdfCache, content_digest
+from .client import BoletinClient, PageRequest, SeekResult, ThreadSafeBoletinClient
+from .parser import RemateDetail, parse_remate_pdf
+from .pipeline import OrderedPipeline, Outcome, PagePrefetcher, ParsePool
+from .alerts import main as alerts_main
+from .api import main as serve_main
+from .reparse import main as reparse_main
+from .search import DEFAULT_MATCH_FIELDS, HaystackCache, KeywordMatcher, normalize_text
+from .sqlstore import SqliteStore
+from .sqlstore import main as query_main
+from .storage import (
+    DATASET_FORMATS,
+    RemateRecord,
+    build_record,
+    load_dataset,
+    write_dataset,
+    write_delta,
+    write_shards,
+)
+from .textstore import DEFAULT_TEXT_DIR, DEFAULT_TEXT_MAX_AGE_DAYS, StoredText, TextStore
+
+if TYPE_CHECKING:
+    from .async_client import AsyncBoletinClient
 
 # Endpoints del boletín (muebles / inmuebles)
 ENDPOINTS: List[Dict[str, str]] = [
@@ -51,7 +73,7 @@ def parse_month(value: str) -> Tuple[date, date]:
         ) from exc
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Extrae remates del Boletín Concursal")
     parser.add_argument(
         "--output",
@@ -68,7 +90,26 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--start-date", type=parse_date, help="Fecha mínima de publicación (YYYY-MM-DD)")
     parser.add_argument("--end-date", type=parse_date, help="Fecha máxima de publicación (YYYY-MM-DD)")
     parser.add_argument("--month", type=parse_month, help="Mes objetivo YYYY-MM para acotar el periodo")
-    parser.add_argument("--page-size", type=int, default=100, help="Tamaño de página para DataTables")
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=100,
+        help="Tamaño de página inicial para DataTables (se ajusta solo, salvo con --fixed-page-size)",
+    )
+    parser.add_argument(
+        "--fixed-page-size",
+        action="store_true",
+        help="No ajusta el tamaño de página según los tiempos de respuesta del servidor",
+    )
+    parser.add_argument(
+        "--page-concurrency",
+        type=int,
+        default=None,
+        help=(
+            "Páginas del listado que se piden a la vez en cada endpoint (por defecto 4 con --async, "
+            "--workers > 1 o --prefetch-pages; 1 en el recorrido en serie)"
+        ),
+    )
     parser.add_argument("--limit", type=int, default=None, help="Límite máximo de remates (para pruebas)")
     parser.add_argument(
         "--keywords",
@@ -78,7 +119,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--match-fields",
         nargs="+",
-        default=["descripcion", "tipo_bienes", "tipo_bien", "tipo_procedimiento"],
+        default=list(DEFAULT_MATCH_FIELDS),
         help="Campos de RemateRecord a revisar al aplicar palabras clave",
     )
     parser.add_argument(
@@ -92,26 +133,162 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Si se usa, solo se guardan los remates que coincidan con las palabras clave",
     )
+    parser.add_argument(
+        "--output-format",
+        choices=DATASET_FORMATS,
+        default=None,
+        help=(
+            "Formato del JSON: pretty (indentado), compact (sin indentación, un remate por línea), "
+            "ndjson (un remate por línea, sin envoltorio) o columnar (columnas con diccionarios y "
+            "arreglos numéricos empaquetados). Por defecto, el del manifiesto del dataset existente o pretty"
+        ),
+    )
+    parser.add_argument(
+        "--shards-dir",
+        type=Path,
+        help=(
+            "Directorio donde escribir además un shard por mes y tipo de bien (formato columnar) "
+            "con su manifest.json, para que el frontend descargue solo lo que necesita (ej: data/shards)"
+        ),
+    )
+    parser.add_argument(
+        "--deltas-dir",
+        type=Path,
+        help=(
+            "Directorio donde publicar la versión del dataset y el delta (remates agregados, quitados "
+            "y modificados) respecto de la anterior, para la cache del frontend (ej: data/deltas)"
+        ),
+    )
+    parser.add_argument(
+        "--sqlite",
+        type=Path,
+        help=(
+            "Base SQLite donde insertar o actualizar además los remates guardados, para consultarlos "
+            "con el subcomando query (ej: data/remates.sqlite)"
+        ),
+    )
     parser.add_argument(
         "--html-output",
         type=Path,
         help="Ruta de un informe HTML opcional con los remates recopilados",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reutiliza los remates ya presentes en --output y solo descarga los códigos nuevos",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Descargas/parseos de PDF simultáneos (por defecto 1, sin concurrencia)",
+    )
+    parser.add_argument(
+        "--prefetch-pages",
+        type=int,
+        default=0,
+        help=(
+            "Páginas del listado que se piden por adelantado en cada endpoint, en un hilo por "
+            "endpoint (por defecto 0, sin adelanto)"
+        ),
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Usa el cliente asyncio: ambos endpoints y sus PDFs en vuelo en un solo event loop (ver --connections)",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=None,
+        help=(
+            "Conexiones simultáneas del cliente --async, compartidas entre páginas y PDFs "
+            "(por defecto el mayor entre --workers y las páginas en vuelo de ambos endpoints más una)"
+        ),
+    )
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=0,
+        help="Procesos para parsear PDFs en paralelo (por defecto 0, en el proceso principal)",
+    )
+    parser.add_argument(
+        "--parse-batch-size",
+        type=int,
+        default=32,
+        help="PDFs que se acumulan antes de enviarlos a los procesos de parseo (por defecto 32)",
+    )
+    parser.add_argument(
+        "--lazy-extract",
+        action="store_true",
+        help=(
+            "Extrae el texto de los PDFs página a página y se detiene cuando los campos obligatorios "
+            "(fecha del remate, rol, tribunal, comuna y valor mínimo) quedan definidos; los campos "
+            "que solo aparecen en páginas posteriores quedan vacíos y el texto guardado es parcial"
+        ),
+    )
+    parser.add_argument(
+        "--pdf-cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directorio de la cache de PDFs descargados (por defecto {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--pdf-cache-max-mb",
+        type=int,
+        default=500,
+        help="Tamaño máximo de la cache de PDFs en MB (por defecto 500)",
+    )
+    parser.add_argument(
+        "--pdf-cache-max-age-days",
+        type=int,
+        default=DEFAULT_MAX_AGE_DAYS,
+        help=f"Días que se conserva un PDF en cache (por defecto {DEFAULT_MAX_AGE_DAYS})",
+    )
+    parser.add_argument(
+        "--no-pdf-cache",
+        action="store_true",
+        help="Desactiva la cache de PDFs y descarga siempre desde el Boletín",
+    )
+    parser.add_argument(
+        "--text-store-dir",
+        type=Path,
+        default=DEFAULT_TEXT_DIR,
+        help=(
+            "Directorio donde se guarda el texto extraído de cada PDF, usado por el "
+            f"subcomando reparse (por defecto {DEFAULT_TEXT_DIR})"
+        ),
+    )
+    parser.add_argument(
+        "--text-store-max-mb",
+        type=int,
+        default=200,
+        help=(
+            "Tamaño máximo de los textos guardados en MB (por defecto 200); nunca se "
+            "borran los de remates que siguen en el dataset"
+        ),
+    )
+    parser.add_argument(
+        "--text-store-max-age-days",
+        type=int,
+        default=DEFAULT_TEXT_MAX_AGE_DAYS,
+        help=(
+            "Días que se conserva el texto de un remate que ya no está en el dataset "
+            f"(por defecto {DEFAULT_TEXT_MAX_AGE_DAYS})"
+        ),
+    )
+    parser.add_argument(
+        "--no-text-store",
+        action="store_true",
+        help="No guarda el texto extraído de los PDFs",
+    )
+    return parser.parse_args(argv)
 
 
 # ---------------------------------------------------------------------------
 # Normalización de texto / filtros
 # ---------------------------------------------------------------------------
-def normalize_text(value: str) -> str:
-    if not value:
-        return ""
-    normalized = unicodedata.normalize("NFKD", value)
-    ascii_text = normalized.encode("ascii", "ignore").decode()
-    ascii_text = ascii_text.replace("\n", " ")
-    return " ".join(ascii_text.lower().split())
-
-
 def resolve_match_fields(requested_fields: Sequence[str]) -> Tuple[List[str], List[str]]:
     dataclass_fields = set(RemateRecord.__dataclass_fields__)
     valid = [field for field in requested_fields if field in dataclass_fields]
@@ -121,39 +298,25 @@ def resolve_match_fields(requested_fields: Sequence[str]) -> Tuple[List[str], Li
     return valid, invalid
 
 
-def _field_to_text(record: RemateRecord, field: str) -> str:
-    value = getattr(record, field, None)
-    if value is None:
-        return ""
-    if isinstance(value, datetime):
-        return value.strftime("%Y-%m-%d %H:%M")
-    if isinstance(value, date):
-        return value.isoformat()
-    return str(value)
-
-
 def filter_records(
     records: List[RemateRecord],
     keywords: Sequence[str],
     fields: Sequence[str],
     match_mode: str,
+    haystacks: Optional[HaystackCache] = None,
 ) -> List[RemateRecord]:
-    normalized_keywords = [normalize_text(keyword) for keyword in keywords if normalize_text(keyword)]
-    if not normalized_keywords:
+    """Registros cuyo texto en ``fields`` contiene las palabras clave (``any`` o ``all``).
+
+    Para varias listas de palabras sobre los mismos registros conviene pasar
+    el mismo ``haystacks``: el texto normalizado de cada registro se arma una
+    sola vez.
+    """
+    matcher = KeywordMatcher(keywords, match_mode)
+    if not matcher:
         return []
-
-    filtered: List[RemateRecord] = []
-    for record in records:
-        haystack = normalize_text(" ".join(_field_to_text(record, field) for field in fields))
-        if not haystack:
-            continue
-        if match_mode == "all":
-            matched = all(keyword in haystack for keyword in normalized_keywords)
-        else:
-            matched = any(keyword in haystack for keyword in normalized_keywords)
-        if matched:
-            filtered.append(record)
-    return filtered
+    if haystacks is None:
+        haystacks = HaystackCache()
+    return [record for record in records if matcher.matches(haystacks.get(record, fields))]
 
 
 # ---------------------------------------------------------------------------
@@ -415,11 +578,442 @@ def render_html(
     path.write_text("\n".join(lines), encoding="utf-8")
 
 
+# ---------------------------------------------------------------------------
+# Modo incremental
+# ---------------------------------------------------------------------------
+def build_high_water_marks(records: Sequence[RemateRecord]) -> Dict[str, Tuple[str, str]]:
+    """Marca (fchPublicacion, codigo) más reciente de cada tipo_bien ya guardado."""
+    marks: Dict[str, Tuple[str, str]] = {}
+    for record in records:
+        mark = (record.fecha_publicacion.isoformat(), record.codigo_validacion)
+        current = marks.get(record.tipo_bien)
+        if current is None or mark > current:
+            marks[record.tipo_bien] = mark
+    return marks
+
+
+def in_period(fecha_publicacion: date, start: Optional[date], end: Optional[date]) -> bool:
+    if start and fecha_publicacion < start:
+        return False
+    if end and fecha_publicacion > end:
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Descarga y parseo de documentos
+# ---------------------------------------------------------------------------
+@dataclass
+class PendingDocument:
+    """PDF ya descargado que espera ser parseado por el ParsePool."""
+
+    entry: Dict
+    tipo_bien: str
+    fecha_publicacion: date
+    pdf_bytes: bytes
+    digest: str
+
+
+def load_detail(
+    client: BoletinClient,
+    codigo: str,
+    details_by_digest: DetailCache,
+    parse: Callable[[str, bytes], RemateDetail] = parse_remate_pdf,
+) -> RemateDetail:
+    """Descarga (o lee de cache) y parsea el PDF de un remate.
+
+    Los documentos idénticos publicados bajo otro código no se vuelven a
+    parsear: se reutiliza el detalle ya obtenido para el mismo contenido, en
+    esta corrida o (con la cache de PDFs) en una anterior.
+    """
+    pdf_bytes = client.download_pdf(codigo)
+    digest = content_digest(pdf_bytes)
+    cached_detail = details_by_digest.get(digest, codigo)
+    if cached_detail is not None:
+        return cached_detail
+    detail = parse(codigo, pdf_bytes)
+    details_by_digest.put(digest, detail)
+    return detail
+
+
+def make_record(
+    entry: Dict,
+    tipo_bien: str,
+    fecha_publicacion: date,
+    detail: RemateDetail,
+    text_store: Optional[TextStore],
+) -> RemateRecord:
+    """build_record, guardando además el texto del PDF para ``reparse``."""
+    if text_store is not None:
+        text_store.put(StoredText.from_detail(entry, tipo_bien, fecha_publicacion, detail))
+    return build_record(entry, tipo_bien, fecha_publicacion, detail)
+
+
+def fetch_record(
+    client: BoletinClient,
+    entry: Dict,
+    tipo_bien: str,
+    fecha_publicacion: date,
+    details_by_digest: DetailCache,
+    parse: Callable[[str, bytes], RemateDetail] = parse_remate_pdf,
+    text_store: Optional[TextStore] = None,
+) -> RemateRecord:
+    detail = load_detail(client, entry["codigoValidacion"], details_by_digest, parse)
+    return make_record(entry, tipo_bien, fecha_publicacion, detail, text_store)
+
+
+def fetch_document(
+    client: BoletinClient,
+    entry: Dict,
+    tipo_bien: str,
+    fecha_publicacion: date,
+    details_by_digest: DetailCache,
+    text_store: Optional[TextStore] = None,
+) -> RemateRecord | PendingDocument:
+    """Como fetch_record, pero deja el parseo para un ParsePool."""
+    codigo = entry["codigoValidacion"]
+    pdf_bytes = client.download_pdf(codigo)
+    digest = content_digest(pdf_bytes)
+    cached_detail = details_by_digest.get(digest, codigo)
+    if cached_detail is not None:
+        return make_record(entry, tipo_bien, fecha_publicacion, cached_detail, text_store)
+    return PendingDocument(entry, tipo_bien, fecha_publicacion, pdf_bytes, digest)
+
+
+def parse_entry_date(entry: Dict) -> Optional[date]:
+    try:
+        return datetime.strptime(entry["fchPublicacion"], "%Y-%m-%d").date()
+    except (KeyError, ValueError):
+        print(
+            f"[WARN] No se pudo procesar fecha de publicacion para codigo {entry.get('codigoValidacion')}",
+            file=sys.stderr,
+        )
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Recorrido de los endpoints
+# ---------------------------------------------------------------------------
+def report_seek(slug: str, seek: SeekResult, page_size: int) -> None:
+    print(
+        f"[{slug}] Búsqueda por fecha: {seek.pages_skipped(page_size)} páginas omitidas "
+        f"(offset {seek.offset} de {seek.total}, {seek.probes} consultas)"
+    )
+
+
+def iter_window_pages(
+    client: BoletinClient,
+    slug: str,
+    page_request: PageRequest,
+    end_date: Optional[date],
+) -> Iterator[Dict]:
+    """iter_pages, pero con ``end_date`` empieza en la primera página de la ventana.
+
+    Las páginas publicadas después de ``end_date`` se saltan con una búsqueda
+    binaria (BoletinClient.seek) en vez de recorrerlas una a una.
+    """
+    if end_date is not None:
+        seek = client.seek(page_request.endpoint, end_date.isoformat())
+        report_seek(slug, seek, page_request.length)
+        page_request = replace(page_request, start=seek.offset)
+    yield from client.iter_pages(page_request)
+
+
+def crawl_threaded(
+    client: BoletinClient,
+    *,
+    workers: int,
+    prefetch_pages: int,
+    page_size: int,
+    adaptive_pages: bool,
+    effective_start: Optional[date],
+    end_date: Optional[date],
+    known_records: Dict[str, RemateRecord],
+    high_water_marks: Dict[str, Tuple[str, str]],
+    details_by_digest: DetailCache,
+    defer_parse: bool,
+    parse: Callable[[str, bytes], RemateDetail],
+    text_store: Optional[TextStore],
+    consume: Callable[[Iterable[Outcome]], None],
+    should_stop: Callable[[], bool],
+) -> None:
+    """Recorre los endpoints y descarga los PDFs con hasta ``workers`` hilos.
+
+    Los resultados se entregan a ``consume`` en el orden del listado. Cuando
+    el pipeline de PDFs está lleno se deja de leer páginas y, con la cola de
+    adelanto llena, los hilos de listado también se detienen.
+    """
+    client.bootstrap()
+    if defer_parse:
+        fetch = partial(fetch_document, text_store=text_store)
+    else:
+        fetch = partial(fetch_record, parse=parse, text_store=text_store)
+    scheduled: set[str] = set()
+
+    def deliver(outcomes: Iterable[Outcome]) -> None:
+        # Un código que falló se vuelve a intentar si aparece de nuevo en el listado
+        outcomes = list(outcomes)
+        for outcome in outcomes:
+            if outcome.error is not None:
+                scheduled.discard(outcome.context)
+        consume(outcomes)
+
+    # Todos los endpoints empiezan a listar a la vez; cada uno en su hilo y
+    # con hasta ``prefetch_pages`` páginas de adelanto.
+    page_sources: List[Iterable[Dict]] = []
+    for config in ENDPOINTS:
+        pages = iter_window_pages(
+            client,
+            config["slug"],
+            PageRequest(
+                endpoint=config["endpoint"],
+                length=page_size,
+                stop_at=high_water_marks.get(config["tipo_bien"]),
+                adaptive=adaptive_pages,
+            ),
+            end_date,
+        )
+        page_sources.append(PagePrefetcher(pages, prefetch_pages) if prefetch_pages else pages)
+
+    pipeline = OrderedPipeline(workers)
+    try:
+        for config, pages in zip(ENDPOINTS, page_sources):
+            tipo_bien = config["tipo_bien"]
+            for page in pages:
+                entries = page.get("data", [])
+                if not entries:
+                    break
+
+                too_old_counter = 0
+                for entry in entries:
+                    codigo = entry.get("codigoValidacion")
+                    if not codigo or codigo in scheduled:
+                        continue
+
+                    fecha_publicacion = parse_entry_date(entry)
+                    if fecha_publicacion is None:
+                        continue
+
+                    if effective_start and fecha_publicacion < effective_start:
+                        too_old_counter += 1
+                        continue
+
+                    if end_date and fecha_publicacion > end_date:
+                        continue
+
+                    scheduled.add(codigo)
+                    known = known_records.get(codigo)
+                    if known is not None:
+                        deliver(pipeline.submit_result(known, context=codigo))
+                    else:
+                        deliver(
+                            pipeline.submit(
+                                fetch,
+                                client,
+                                entry,
+                                tipo_bien,
+                                fecha_publicacion,
+                                details_by_digest,
+                                context=codigo,
+                            )
+                        )
+
+                    if should_stop():
+                        break
+
+                if should_stop():
+                    break
+                if effective_start and too_old_counter == len(entries):
+                    break
+
+            if isinstance(pages, PagePrefetcher):
+                pages.close()
+            # Los fallos de este endpoint se conocen antes de listar el siguiente
+            deliver(pipeline.drain())
+            if should_stop():
+                break
+
+        deliver(pipeline.drain())
+    finally:
+        pipeline.close()
+        for source in page_sources:
+            if isinstance(source, PagePrefetcher):
+                source.close()
+
+
+# ---------------------------------------------------------------------------
+# Modo asyncio
+# ---------------------------------------------------------------------------
+async def fetch_record_async(
+    client: AsyncBoletinClient,
+    entry: Dict,
+    tipo_bien: str,
+    fecha_publicacion: date,
+    details_by_digest: DetailCache,
+    defer_parse: bool,
+    parse: Callable[[str, bytes], RemateDetail] = parse_remate_pdf,
+    text_store: Optional[TextStore] = None,
+) -> RemateRecord | PendingDocument:
+    codigo = entry["codigoValidacion"]
+    pdf_bytes = await client.download_pdf(codigo)
+    digest = content_digest(pdf_bytes)
+    # El texto guardado se lee del disco: en un hilo, como el parseo
+    cached_detail = await asyncio.to_thread(details_by_digest.get, digest, codigo)
+    # make_record comprime y escribe el texto guardado: también en un hilo
+    if cached_detail is not None:
+        return await asyncio.to_thread(make_record, entry, tipo_bien, fecha_publicacion, cached_detail, text_store)
+    if defer_parse:
+        return PendingDocument(entry, tipo_bien, fecha_publicacion, pdf_bytes, digest)
+    # pypdf bloquea: se parsea en un hilo para no detener el event loop
+    detail = await asyncio.to_thread(parse, codigo, pdf_bytes)
+    await asyncio.to_thread(details_by_digest.put, digest, detail)
+    return await asyncio.to_thread(make_record, entry, tipo_bien, fecha_publicacion, detail, text_store)
+
+
+async def crawl_async(
+    client: AsyncBoletinClient,
+    *,
+    page_size: int,
+    adaptive_pages: bool,
+    effective_start: Optional[date],
+    end_date: Optional[date],
+    known_records: Dict[str, RemateRecord],
+    high_water_marks: Dict[str, Tuple[str, str]],
+    details_by_digest: DetailCache,
+    defer_parse: bool,
+    parse: Callable[[str, bytes], RemateDetail],
+    text_store: Optional[TextStore],
+    consume: Callable[[Iterable[Outcome]], None],
+    should_stop: Callable[[], bool],
+    queue_size: int = 16,
+) -> None:
+    """Recorre todos los endpoints a la vez en un solo event loop.
+
+    Cada endpoint encola sus descargas en una cola acotada. Las colas se
+    consumen en el orden de ENDPOINTS y, dentro de cada una, en orden de
+    llegada, así que el resultado es el mismo que el del recorrido en serie.
+    Como en ``crawl_threaded``, cada código se descarga una sola vez aunque
+    lo listen ambos endpoints; aquí se lo queda el que lo lista primero.
+    """
+    await client.bootstrap()
+    queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=queue_size) for _ in ENDPOINTS]
+    scheduled: set[str] = set()
+
+    async def crawl_endpoint(config: Dict[str, str], queue: asyncio.Queue) -> None:
+        tipo_bien = config["tipo_bien"]
+        page_request = PageRequest(
+            endpoint=config["endpoint"],
+            length=page_size,
+            stop_at=high_water_marks.get(tipo_bien),
+            adaptive=adaptive_pages,
+        )
+        try:
+            if end_date is not None:
+                seek = await client.seek(page_request.endpoint, end_date.isoformat())
+                report_seek(config["slug"], seek, page_size)
+                page_request = replace(page_request, start=seek.offset)
+            async for page in client.iter_pages(page_request):
+                entries = page.get("data", [])
+                too_old_counter = 0
+                for entry in entries:
+                    codigo = entry.get("codigoValidacion")
+                    if not codigo or codigo in scheduled:
+                        continue
+                    fecha_publicacion = parse_entry_date(entry)
+                    if fecha_publicacion is None:
+                        continue
+                    if effective_start and fecha_publicacion < effective_start:
+                        too_old_counter += 1
+                        continue
+                    if end_date and fecha_publicacion > end_date:
+                        continue
+
+                    scheduled.add(codigo)
+                    known = known_records.get(codigo)
+                    if known is not None:
+                        job: asyncio.Future = asyncio.get_running_loop().create_future()
+                        job.set_result(known)
+                    else:
+                        job = asyncio.ensure_future(
+                            fetch_record_async(
+                                client,
+                                entry,
+                                tipo_bien,
+                                fecha_publicacion,
+                                details_by_digest,
+                                defer_parse,
+                                parse,
+                                text_store,
+                            )
+                        )
+                    await queue.put((codigo, job))
+                    if should_stop():
+                        return
+                if effective_start and too_old_counter == len(entries):
+                    return
+        finally:
+            await queue.put(None)
+
+    crawlers = [
+        asyncio.ensure_future(crawl_endpoint(config, queue)) for config, queue in zip(ENDPOINTS, queues)
+    ]
+    accepted: set[str] = set()
+    try:
+        for queue in queues:
+            while (item := await queue.get()) is not None:
+                codigo, job = item
+                if should_stop():
+                    job.cancel()
+                    continue
+                try:
+                    outcome = Outcome(context=codigo, result=await job)
+                except Exception as exc:  # pylint: disable=broad-except
+                    outcome = Outcome(context=codigo, error=exc)
+                    # Se vuelve a intentar si algún endpoint lo lista de nuevo
+                    scheduled.discard(codigo)
+                # Un código que se reintentó se queda con el primer resultado
+                if codigo in accepted:
+                    continue
+                if outcome.error is None:
+                    accepted.add(codigo)
+                consume([outcome])
+        await asyncio.gather(*crawlers)
+    finally:
+        for crawler in crawlers:
+            crawler.cancel()
+
+
+async def run_async_crawl(
+    pdf_cache: Optional[PdfCache],
+    max_connections: int,
+    page_concurrency: int,
+    **crawl_options,
+) -> None:
+    # aiohttp solo hace falta con --async
+    from .async_client import AsyncBoletinClient
+
+    async with AsyncBoletinClient(
+        pdf_cache=pdf_cache,
+        max_connections=max_connections,
+        page_concurrency=page_concurrency,
+    ) as client:
+        await crawl_async(client, queue_size=max(max_connections * 2, 16), **crawl_options)
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
-def main() -> int:
-    args = parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["reparse"]:
+        return reparse_main(argv[1:])
+    if argv[:1] == ["alerts"]:
+        return alerts_main(argv[1:])
+    if argv[:1] == ["query"]:
+        return query_main(argv[1:])
+    if argv[:1] == ["serve"]:
+        return serve_main(argv[1:])
+    args = parse_args(argv)
 
     start_date = args.start_date
     end_date = args.end_date
@@ -436,86 +1030,167 @@ def main() -> int:
     if start_date and cutoff_date:
         effective_start = max(start_date, cutoff_date)
 
-    client = BoletinClient()
-    client.bootstrap()
+    pdf_cache: Optional[PdfCache] = None
+    if not args.no_pdf_cache:
+        pdf_cache = PdfCache(
+            args.pdf_cache_dir,
+            max_bytes=args.pdf_cache_max_mb * 1024 * 1024 if args.pdf_cache_max_mb else None,
+            max_age_days=args.pdf_cache_max_age_days or None,
+        )
+
+    text_store: Optional[TextStore] = None
+    if not args.no_text_store:
+        text_store = TextStore(
+            args.text_store_dir,
+            max_bytes=args.text_store_max_mb * 1024 * 1024 if args.text_store_max_mb else None,
+            max_age_days=args.text_store_max_age_days or None,
+        )
 
     records: List[RemateRecord] = []
     seen_codigos: set[str] = set()
-
-    for config in ENDPOINTS:
-        endpoint = config["endpoint"]
-        tipo_bien = config["tipo_bien"]
-        page_request = PageRequest(endpoint=endpoint, length=args.page_size)
-
-        for page in client.iter_pages(page_request):
-            entries = page.get("data", [])
-            if not entries:
-                break
-
-            too_old_counter = 0
-            for entry in entries:
-                codigo = entry.get("codigoValidacion")
-                if not codigo or codigo in seen_codigos:
-                    continue
-
-                try:
-                    fecha_publicacion = datetime.strptime(entry["fchPublicacion"], "%Y-%m-%d").date()
-                except (KeyError, ValueError):
-                    print(f"[WARN] No se pudo procesar fecha de publicacion para codigo {codigo}", file=sys.stderr)
-                    continue
-
-                if effective_start and fecha_publicacion < effective_start:
-                    too_old_counter += 1
-                    continue
-
-                if end_date and fecha_publicacion > end_date:
-                    continue
-
-                try:
-                    pdf_bytes = client.download_pdf(codigo)
-                    detail = parse_remate_pdf(codigo, pdf_bytes)
-                except Exception as exc:  # pylint: disable=broad-except
-                    print(f"[ERROR] No se pudo descargar/parsear PDF {codigo}: {exc}", file=sys.stderr)
+    details_by_digest = DetailCache(pdf_cache, accept_partial=args.lazy_extract)
+
+    known_records: Dict[str, RemateRecord] = {}
+    high_water_marks: Dict[str, Tuple[str, str]] = {}
+    # El dataset anterior sirve al modo incremental y para calcular el delta
+    previous: List[RemateRecord] = []
+    if args.incremental or args.deltas_dir:
+        try:
+            previous = load_dataset(args.output)
+        except (OSError, ValueError, KeyError, TypeError) as exc:
+            print(f"[WARN] No se pudo leer el dataset anterior {args.output}: {exc}", file=sys.stderr)
+    if args.incremental:
+        known_records = {record.codigo_validacion: record for record in previous}
+        high_water_marks = build_high_water_marks(previous)
+        print(f"Modo incremental: {len(known_records)} remates previos en {args.output}")
+
+    def limit_reached() -> bool:
+        return bool(args.limit) and len(records) >= args.limit
+
+    parse_buffer: List[Outcome] = []
+
+    def should_stop() -> bool:
+        # Lo que espera en el buffer de parseo también cuenta para el límite
+        return bool(args.limit) and len(records) + len(parse_buffer) >= args.limit
+
+    def accept(outcome: Outcome) -> None:
+        if limit_reached():
+            return
+        codigo = outcome.context
+        if outcome.error is not None:
+            print(f"[ERROR] No se pudo descargar/parsear PDF {codigo}: {outcome.error}", file=sys.stderr)
+            return
+        records.append(outcome.result)
+        seen_codigos.add(codigo)
+
+    parse = partial(parse_remate_pdf, lazy=True) if args.lazy_extract else parse_remate_pdf
+    parse_pool = ParsePool(args.parse_processes, parse=parse) if args.parse_processes > 1 else None
+
+    def flush_parse_buffer() -> None:
+        pending = [outcome for outcome in parse_buffer if isinstance(outcome.result, PendingDocument)]
+        if parse_pool is not None and pending:
+            # Un mismo contenido bajo varios códigos se parsea una sola vez
+            first_by_digest: Dict[str, Outcome] = {}
+            for outcome in pending:
+                first_by_digest.setdefault(outcome.result.digest, outcome)
+            parsed = parse_pool.parse(
+                [(outcome.context, outcome.result.pdf_bytes) for outcome in first_by_digest.values()]
+            )
+            results = dict(zip(first_by_digest, parsed))
+            for digest, result in results.items():
+                if result.error is None:
+                    details_by_digest.put(digest, result.result)
+            for outcome in pending:
+                document: PendingDocument = outcome.result
+                result = results[document.digest]
+                if result.error is not None:
+                    outcome.result, outcome.error = None, result.error
                     continue
-
-                record = RemateRecord(
-                    codigo_validacion=codigo,
-                    tipo_bien=tipo_bien,
-                    fecha_publicacion=fecha_publicacion,
-                    fecha_remate=detail.fecha_remate,
-                    tipo_procedimiento=detail.tipo_procedimiento or entry.get("tipoProcedimiento"),
-                    rol_causa=detail.rol_causa,
-                    tribunal=detail.tribunal,
-                    deudor_nombre=detail.deudor or entry.get("deudorNombre"),
-                    deudor_rut=detail.deudor_rut,
-                    liquidador=detail.liquidador,
-                    region=detail.region,
-                    comuna=detail.comuna,
-                    direccion=detail.direccion,
-                    descripcion=detail.descripcion,
-                    tipo_bienes=detail.tipo_bienes,
-                    valor_minimo=detail.valor_minimo,
-                    comision=detail.comision,
-                    ente_publicador=entry.get("entePublicador"),
-                    procedimiento=entry.get("procedimiento"),
-                    fuente_url=f"https://boletinconcursal.cl/boletin/downloadDocumentoByCodigo?codigoValidacion={codigo}",
+                detail = replace(result.result, codigo_validacion=outcome.context)
+                outcome.result = make_record(
+                    document.entry, document.tipo_bien, document.fecha_publicacion, detail, text_store
                 )
-                records.append(record)
-                seen_codigos.add(codigo)
-
-                if args.limit and len(records) >= args.limit:
-                    break
-
-            if args.limit and len(records) >= args.limit:
-                break
-            if effective_start and too_old_counter == len(entries):
-                break
-
-        if args.limit and len(records) >= args.limit:
+        for outcome in parse_buffer:
+            accept(outcome)
+        parse_buffer.clear()
+
+    def consume(outcomes: Iterable[Outcome]) -> None:
+        # Los resultados llegan en el mismo orden en que se encolaron
+        for outcome in outcomes:
+            if should_stop():
+                return
+            if parse_pool is None:
+                accept(outcome)
+                continue
+            parse_buffer.append(outcome)
+            # Al completar el límite se parsea de inmediato: si algún PDF
+            # falla, el recorrido sigue hasta reemplazarlo
+            if len(parse_buffer) >= args.parse_batch_size or should_stop():
+                flush_parse_buffer()
+
+    crawl_options = dict(
+        page_size=args.page_size,
+        adaptive_pages=not args.fixed_page_size,
+        effective_start=effective_start,
+        end_date=end_date,
+        known_records=known_records,
+        high_water_marks=high_water_marks,
+        details_by_digest=details_by_digest,
+        defer_parse=parse_pool is not None,
+        parse=parse,
+        text_store=text_store,
+        consume=consume,
+        should_stop=should_stop,
+    )
+    page_concurrency = args.page_concurrency
+    if page_concurrency is None:
+        page_concurrency = 4 if args.use_async or args.workers > 1 or args.prefetch_pages else 1
+    try:
+        if args.use_async:
+            # Con las páginas de ambos endpoints en vuelo siempre queda al
+            # menos una conexión para los PDFs, aun con --workers 1
+            connections = args.connections or max(args.workers, page_concurrency * len(ENDPOINTS) + 1)
+            asyncio.run(run_async_crawl(pdf_cache, connections, page_concurrency, **crawl_options))
+        else:
+            client: BoletinClient
+            if args.workers > 1 or args.prefetch_pages or page_concurrency > 1:
+                client = ThreadSafeBoletinClient(
+                    pdf_cache=pdf_cache,
+                    pool_size=args.workers + len(ENDPOINTS) * max(1, page_concurrency),
+                    page_concurrency=page_concurrency,
+                )
+            else:
+                client = BoletinClient(pdf_cache=pdf_cache)
+            crawl_threaded(
+                client,
+                workers=args.workers,
+                prefetch_pages=args.prefetch_pages,
+                **crawl_options,
+            )
+        flush_parse_buffer()
+    finally:
+        if parse_pool is not None:
+            parse_pool.close()
+
+    # Remates previos que ya no se listaron (quedaron bajo la marca de agua)
+    for codigo, known in known_records.items():
+        if limit_reached():
             break
+        if codigo in seen_codigos or not in_period(known.fecha_publicacion, effective_start, end_date):
+            continue
+        records.append(known)
+        seen_codigos.add(codigo)
 
     records.sort(key=lambda item: (item.fecha_publicacion, item.codigo_validacion), reverse=True)
 
+    if pdf_cache is not None:
+        pdf_cache.close()
+        print(f"Cache de PDFs: {pdf_cache.stats.summary()}")
+    if details_by_digest.reused:
+        print(f"Documentos repetidos sin volver a parsear: {details_by_digest.reused}")
+    if text_store is not None:
+        print(f"Textos guardados para reparse: {text_store.stores} en {text_store.root}")
+
     print_summary(records, "Remates obtenidos en el periodo")
     tipo_bien_counts, tipo_bienes_counts = build_category_stats(records)
     print_category_summary("Tipos de bien", tipo_bien_counts)
@@ -551,8 +1226,29 @@ def main() -> int:
         else:
             records_to_persist = keyword_matches
 
-    write_dataset(args.output, records_to_persist)
-    print(f"Se guardaron {len(records_to_persist)} remates en {args.output}")
+    if write_dataset(args.output, records_to_persist, output_format=args.output_format):
+        print(f"Se guardaron {len(records_to_persist)} remates en {args.output}")
+    else:
+        print(f"Sin cambios en los {len(records_to_persist)} remates de {args.output}; no se reescribe")
+    if text_store is not None:
+        # Con el dataset ya guardado: se conservan los textos de todos sus remates
+        evicted = text_store.evict(keep=[record.codigo_validacion for record in records])
+        if evicted:
+            print(f"Textos guardados eliminados por antigüedad o tamaño: {evicted}")
+    if args.shards_dir:
+        touched = write_shards(args.shards_dir, records_to_persist)
+        print(f"Shards en {args.shards_dir}: {touched} archivos actualizados")
+    if args.deltas_dir:
+        version = write_delta(args.deltas_dir, previous, records_to_persist)
+        if version is None:
+            print(f"Versiones en {args.deltas_dir}: sin cambios")
+        else:
+            print(f"Versiones en {args.deltas_dir}: publicada la versión {version}")
+
+    if args.sqlite:
+        with SqliteStore(args.sqlite) as store:
+            changed = store.upsert(records_to_persist)
+            print(f"Base SQLite {args.sqlite}: {changed} remates nuevos o actualizados ({store.count()} en total)")
 
     if args.html_output:
         html_records = records_to_persist if args.only_matching and args.keywords else records
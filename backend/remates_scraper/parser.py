@@ -5,7 +5,7 @@ import re
 import unicodedata
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 
 from pypdf import PdfReader
 
@@ -28,33 +28,91 @@ class RemateDetail:
     valor_minimo: Optional[int]
     comision: Optional[str]
     raw_text: str
+    # False si raw_text no cubre todas las páginas (extracción perezosa)
+    text_complete: bool = True
 
 
-def _to_ascii(text: str) -> str:
+# Súbelo cuando cambie lo que se obtiene a partir del texto de un PDF: los
+# textos guardados con una versión anterior se vuelven a parsear con
+# ``python -m backend.remates_scraper.main reparse``.
+PARSER_VERSION = 1
+
+
+_BLANK_LINES_RE = re.compile(r"\n{2,}")
+_NON_DIGITS_RE = re.compile(r"[^0-9]")
+_TRAILING_LABEL_RE = re.compile(r"\n[A-Z ]+?:$")
+
+# Etiquetas "Campo: valor" del PDF. El orden importa solo cuando una etiqueta
+# es prefijo de otra ("Deudor Rut" antes que "Deudor").
+_FIELD_LABELS = (
+    ("fecha_remate", "Fecha del Remate"),
+    ("tipo_procedimiento", "Tipo Procedimiento"),
+    ("rol_causa", "Rol Causa"),
+    ("tribunal", "Tribunal"),
+    ("deudor_rut", "Deudor Rut"),
+    ("deudor", "Deudor"),
+    ("liquidador", "Liquidador"),
+    ("region", "Region"),
+    ("comuna", "Comuna"),
+    ("direccion", "Direccion"),
+    ("valor_minimo", "Valor Minimo (pesos)"),
+    ("comision", "Comision"),
+)
+_LABEL_KEYS = tuple((field, label.lower() + ":") for field, label in _FIELD_LABELS)
+_LABEL_RES = {field: re.compile(re.escape(label) + ":", re.IGNORECASE) for field, label in _FIELD_LABELS}
+_VALUE_RE = re.compile(r"\s*(.+)")
+_VALOR_RE = re.compile(r"\s*([0-9\.\s]*)")
+_REGION_COMUNA_TAIL_RE = re.compile(r"\s*(.+?)\s+Comuna:\s*(.+)", re.IGNORECASE)
+_REGION_COMUNA_RE = re.compile(r"Region:\s*(.+?)\s+Comuna:\s*(.+)", re.IGNORECASE)
+
+_SECTION_RES = {
+    start: re.compile(
+        rf"{re.escape(start)}\n(?P<body>.+?)(?:\n{re.escape(end)}|$)",
+        re.IGNORECASE | re.DOTALL,
+    )
+    for start, end in (("Detalle", "Tipo Bienes"), ("Tipo Bienes", "Valor Minimo"))
+}
+
+_DATETIME_FAST_RE = re.compile(r"(\d{2})/(\d{2})/(\d{4})(?: (\d{2}):(\d{2}))?")
+_DATETIME_FORMATS = ("%d/%m/%Y %H:%M", "%d-%m-%Y %H:%M", "%d/%m/%Y")
+
+
+def _fold_ascii(text: str) -> str:
     normalized = unicodedata.normalize("NFKD", text)
-    ascii_text = normalized.encode("ascii", "ignore").decode()
-    ascii_text = ascii_text.replace("\r", "\n")
-    ascii_text = re.sub(r"\n{2,}", "\n", ascii_text)
+    return normalized.encode("ascii", "ignore").decode().replace("\r", "\n")
+
+
+def _to_ascii(text: str) -> str:
+    ascii_text = _BLANK_LINES_RE.sub("\n", _fold_ascii(text))
     return ascii_text.strip()
 
 
-def extract_text(pdf_bytes: bytes) -> str:
-    reader = PdfReader(io.BytesIO(pdf_bytes))
-    text = "\n".join(page.extract_text() or "" for page in reader.pages)
-    return _to_ascii(text)
+def iter_page_texts(pdf_bytes: bytes) -> Iterator[str]:
+    """Texto crudo de cada página; cada una se extrae recién cuando se pide."""
+    yield from _iter_pages(PdfReader(io.BytesIO(pdf_bytes)))
 
 
-def _search(pattern: str, text: str) -> Optional[str]:
-    match = re.search(pattern, text, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    return None
+def _iter_pages(reader: PdfReader) -> Iterator[str]:
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def extract_text(pdf_bytes: bytes) -> str:
+    return _to_ascii("\n".join(iter_page_texts(pdf_bytes)))
 
 
 def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
     if not value:
         return None
-    for fmt in ("%d/%m/%Y %H:%M", "%d-%m-%Y %H:%M", "%d/%m/%Y"):
+    # Camino rápido para el formato habitual "dd/mm/aaaa hh:mm"
+    match = _DATETIME_FAST_RE.fullmatch(value)
+    if match:
+        day, month, year, hour, minute = match.groups()
+        try:
+            return datetime(int(year), int(month), int(day), int(hour or 0), int(minute or 0))
+        except ValueError:
+            return None
+    for fmt in _DATETIME_FORMATS:
         try:
             return datetime.strptime(value, fmt)
         except ValueError:
@@ -65,7 +123,7 @@ def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
 def _parse_valor_minimo(value: Optional[str]) -> Optional[int]:
     if not value:
         return None
-    digits = re.sub(r"[^0-9]", "", value)
+    digits = _NON_DIGITS_RE.sub("", value)
     if not digits:
         return None
     try:
@@ -74,64 +132,201 @@ def _parse_valor_minimo(value: Optional[str]) -> Optional[int]:
         return None
 
 
-def _extract_section(text: str, start_label: str, end_label: str) -> Optional[str]:
-    pattern = rf"{re.escape(start_label)}\n(?P<body>.+?)(?:\n{re.escape(end_label)}|$)"
-    match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-    if not match:
-        return None
-    body = match.group("body").strip()
-    body = re.sub(r"\n[A-Z ]+?:$", "", body)
+def _extract_section(text: str, lowered: Optional[str], start_label: str, end_label: str) -> Optional[str]:
+    """Texto entre la línea ``start_label`` y la siguiente ``end_label`` (o el final).
+
+    ``lowered`` es ``text.lower()``; solo se usa si el texto es ASCII, porque
+    en otro caso ``lower()`` puede cambiar el largo y desalinear los índices.
+    """
+    if lowered is None:
+        match = _SECTION_RES[start_label].search(text)
+        if not match:
+            return None
+        body = match.group("body").strip()
+    else:
+        start = lowered.find(start_label.lower() + "\n")
+        if start == -1:
+            return None
+        body_start = start + len(start_label) + 1
+        if body_start >= len(text):
+            return None
+        end = lowered.find("\n" + end_label.lower(), body_start + 1)
+        body = text[body_start : end if end != -1 else len(text)].strip()
+    body = _TRAILING_LABEL_RE.sub("", body)
     return body.strip() or None
 
 
-def parse_remate_pdf(codigo_validacion: str, pdf_bytes: bytes) -> RemateDetail:
-    text = extract_text(pdf_bytes)
+def extract_fields(text: str) -> Dict[str, Optional[str]]:
+    """Devuelve el valor crudo de cada etiqueta.
+
+    Para cada campo se usa la primera aparición de su etiqueta, igual que
+    una búsqueda ``re.search(r"Etiqueta:\s*(.+)")`` por campo. Con texto
+    ASCII (el caso normal tras ``_to_ascii``) cada etiqueta se ubica con un
+    ``str.find`` sobre el texto en minúsculas en lugar de una regex: sigue
+    siendo una búsqueda por etiqueta, pero mucho más barata. El valor se lee
+    con una regex anclada en esa posición; región/comuna y las secciones
+    Detalle y Tipo Bienes agregan una búsqueda cada una.
+    """
+    lowered = text.lower() if text.isascii() else None
+    positions: Dict[str, int] = {}
+    for field, key in _LABEL_KEYS:
+        if lowered is not None:
+            index = lowered.find(key)
+            if index != -1:
+                positions[field] = index + len(key)
+        else:
+            match = _LABEL_RES[field].search(text)
+            if match:
+                positions[field] = match.end()
 
-    fecha_remate = _parse_datetime(_search(r"Fecha del Remate:\s*(.+)", text))
-    tipo_procedimiento = _search(r"Tipo Procedimiento:\s*(.+)", text)
-    rol_causa = _search(r"Rol Causa:\s*(.+)", text)
-    tribunal = _search(r"Tribunal:\s*(.+)", text)
-    deudor = _search(r"Deudor:\s*(.+)", text)
-    deudor_rut = _search(r"Deudor Rut:\s*(.+)", text)
-    liquidador = _search(r"Liquidador:\s*(.+)", text)
+    values: Dict[str, Optional[str]] = {}
+    for field, _ in _FIELD_LABELS:
+        position = positions.get(field)
+        if position is None:
+            values[field] = None
+        elif field == "valor_minimo":
+            values[field] = _VALOR_RE.match(text, position).group(1)
+        else:
+            value_match = _VALUE_RE.match(text, position)
+            values[field] = value_match.group(1).strip() if value_match else None
 
-    region = comuna = None
-    region_match = re.search(r"Region:\s*(.+?)\s+Comuna:\s*(.+)", text, re.IGNORECASE)
-    if region_match:
-        region = region_match.group(1).strip()
-        comuna = region_match.group(2).strip()
-    if not region:
-        region = _search(r"Region:\s*(.+)", text)
-    if not comuna:
-        comuna = _search(r"Comuna:\s*(.+)", text)
+    # "Region: X Comuna: Y" en una misma línea (o en líneas seguidas)
+    region_position = positions.get("region")
+    if region_position is not None:
+        combined = _REGION_COMUNA_TAIL_RE.match(text, region_position)
+        if combined is None:
+            combined = _REGION_COMUNA_RE.search(text, region_position)
+        if combined is not None:
+            region = combined.group(1).strip()
+            comuna = combined.group(2).strip()
+            values["region"] = region or values["region"]
+            values["comuna"] = comuna or values["comuna"]
 
-    direccion = _search(r"Direccion:\s*(.+)", text)
-    descripcion = _extract_section(text, "Detalle", "Tipo Bienes")
-    tipo_bienes = _extract_section(text, "Tipo Bienes", "Valor Minimo")
+    values["descripcion"] = _extract_section(text, lowered, "Detalle", "Tipo Bienes")
+    values["tipo_bienes"] = _extract_section(text, lowered, "Tipo Bienes", "Valor Minimo")
+    return values
 
-    valor_match = re.search(r"Valor Minimo \(pesos\):\s*([0-9\.\s]*)", text, re.IGNORECASE)
-    valor_minimo = _parse_valor_minimo(valor_match.group(1) if valor_match else None)
 
-    comision = _search(r"Comision:\s*(.+)", text)
+# Campos que la extracción perezosa espera antes de detenerse. Los demás
+# (región, dirección, comisión...) se toman de las páginas ya leídas: si su
+# etiqueta falta en el documento no obligan a leerlo entero.
+REQUIRED_FIELDS = ("fecha_remate", "rol_causa", "tribunal", "comuna", "valor_minimo")
+_REQUIRED_KEYS = {field: key for field, key in _LABEL_KEYS if field in REQUIRED_FIELDS}
+_SECTIONS = (("Detalle", "Tipo Bienes"), ("Tipo Bienes", "Valor Minimo"))
+
+
+def extract_fields_lazy(pdf_bytes: bytes) -> Tuple[Dict[str, Optional[str]], str, bool]:
+    """Extrae páginas de a una y se detiene cuando los campos obligatorios tienen valor.
+
+    Se deja de leer cuando cada campo de ``REQUIRED_FIELDS`` tiene su
+    etiqueta con el valor ya terminado y las secciones Detalle y Tipo Bienes,
+    si empezaron, ya encontraron la etiqueta que las cierra (solo ellas
+    siguen en las páginas siguientes). Cada página nueva se agrega al texto
+    acumulado y solo se busca en lo que agrega. Los campos se obtienen con
+    ``extract_fields`` sobre las páginas leídas; el texto devuelto cubre solo
+    esas páginas y el tercer valor indica si se leyeron todas.
+    """
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    text = ""
+    lowered = ""
+    waiting = dict(_REQUIRED_KEYS)  # campo -> etiqueta, hasta que su valor termina
+    positions: Dict[str, int] = {}
+    # Inicio del cuerpo de cada sección abierta (None: aún no aparece)
+    open_sections: Dict[str, Optional[int]] = {start: None for start, _ in _SECTIONS}
+    pages_read = 0
+    for page_text in _iter_pages(reader):
+        pages_read += 1
+        # Igual que _to_ascii sobre el documento completo: NFKD no combina a
+        # través de "\n" y las líneas en blanco entre páginas se colapsan al unir
+        chunk = _BLANK_LINES_RE.sub("\n", _fold_ascii(page_text)).strip("\n")
+        if not text:
+            chunk = chunk.lstrip()
+        if not chunk:
+            continue
+        scan_from = len(text)
+        text = f"{text}\n{chunk}" if text else chunk
+        lowered = f"{lowered}\n{chunk.lower()}" if lowered else chunk.lower()
 
+        for field, key in list(waiting.items()):
+            position = positions.get(field)
+            if position is None:
+                index = lowered.find(key, scan_from)
+                if index == -1:
+                    continue
+                position = positions[field] = index + len(key)
+            value_re = _VALOR_RE if field == "valor_minimo" else _VALUE_RE
+            value_match = value_re.match(text, position)
+            if value_match is not None and value_match.end() < len(text):
+                del waiting[field]
+
+        for start_label, end_label in _SECTIONS:
+            if start_label not in open_sections:
+                continue
+            body_start = open_sections[start_label]
+            if body_start is None:
+                header = lowered.find(start_label.lower() + "\n", max(0, scan_from - len(start_label)))
+                if header == -1:
+                    continue
+                body_start = open_sections[start_label] = header + len(start_label) + 1
+            closing = lowered.find("\n" + end_label.lower(), max(body_start + 1, scan_from - len(end_label)))
+            if closing != -1:
+                del open_sections[start_label]
+
+        if not waiting and all(body_start is None for body_start in open_sections.values()):
+            break
+    text = text.rstrip()
+    return extract_fields(text), text, pages_read == len(reader.pages)
+
+
+def parse_remate_text(codigo_validacion: str, text: str) -> RemateDetail:
+    return _build_detail(codigo_validacion, extract_fields(text), text)
+
+
+def _build_detail(codigo_validacion: str, fields: Dict[str, Optional[str]], text: str) -> RemateDetail:
     return RemateDetail(
         codigo_validacion=codigo_validacion,
-        fecha_remate=fecha_remate,
-        tipo_procedimiento=tipo_procedimiento,
-        rol_causa=rol_causa,
-        tribunal=tribunal,
-        deudor=deudor,
-        deudor_rut=deudor_rut,
-        liquidador=liquidador,
-        region=region,
-        comuna=comuna,
-        direccion=direccion,
-        descripcion=descripcion,
-        tipo_bienes=tipo_bienes,
-        valor_minimo=valor_minimo,
-        comision=comision,
+        fecha_remate=_parse_datetime(fields["fecha_remate"]),
+        tipo_procedimiento=fields["tipo_procedimiento"],
+        rol_causa=fields["rol_causa"],
+        tribunal=fields["tribunal"],
+        deudor=fields["deudor"],
+        deudor_rut=fields["deudor_rut"],
+        liquidador=fields["liquidador"],
+        region=fields["region"],
+        comuna=fields["comuna"],
+        direccion=fields["direccion"],
+        descripcion=fields["descripcion"],
+        tipo_bienes=fields["tipo_bienes"],
+        valor_minimo=_parse_valor_minimo(fields["valor_minimo"]),
+        comision=fields["comision"],
         raw_text=text,
     )
 
 
-__all__ = ["RemateDetail", "parse_remate_pdf", "extract_text"]
+def parse_remate_pdf(codigo_validacion: str, pdf_bytes: bytes, *, lazy: bool = False) -> RemateDetail:
+    """Parsea un PDF de remate.
+
+    Con ``lazy=True`` se deja de extraer páginas en cuanto los campos
+    obligatorios quedan definidos (ver extract_fields_lazy); ``raw_text``
+    contiene entonces solo las páginas leídas y ``text_complete`` queda en
+    False si faltaron páginas.
+    """
+    if not lazy:
+        return parse_remate_text(codigo_validacion, extract_text(pdf_bytes))
+    fields, text, text_complete = extract_fields_lazy(pdf_bytes)
+    detail = _build_detail(codigo_validacion, fields, text)
+    detail.text_complete = text_complete
+    return detail
+
+
+__all__ = [
+    "PARSER_VERSION",
+    "REQUIRED_FIELDS",
+    "RemateDetail",
+    "extract_fields",
+    "extract_fields_lazy",
+    "extract_text",
+    "iter_page_texts",
+    "parse_remate_pdf",
+    "parse_remate_text",
+]
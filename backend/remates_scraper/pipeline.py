@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .parser import RemateDetail, parse_remate_pdf
+
+
+@dataclass
+class Outcome:
+    context: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+class OrderedPipeline:
+    """Ejecuta tareas con concurrencia acotada y entrega los resultados en orden.
+
+    ``submit`` devuelve los resultados que ya pueden consumirse respetando el
+    orden de envío. Cuando hay ``max_pending`` tareas en vuelo se espera a la
+    más antigua antes de aceptar otra (contrapresión). Con ``workers <= 1``
+    las tareas se ejecutan en el mismo hilo, sin executor.
+    """
+
+    def __init__(self, workers: int = 1, max_pending: Optional[int] = None) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or self.workers * 2
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self.workers > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._pending: Deque[tuple[Any, Future]] = deque()
+
+    def submit(self, fn: Callable[..., Any], *args: Any, context: Any = None) -> List[Outcome]:
+        if self._executor is None:
+            return [_run(fn, args, context)]
+        self._pending.append((context, self._executor.submit(fn, *args)))
+        return self._collect()
+
+    def submit_result(self, result: Any, *, context: Any = None) -> List[Outcome]:
+        """Encola un resultado ya disponible sin perder el orden respecto al resto."""
+        if self._executor is None:
+            return [Outcome(context=context, result=result)]
+        future: Future = Future()
+        future.set_result(result)
+        self._pending.append((context, future))
+        return self._collect()
+
+    def _collect(self) -> List[Outcome]:
+        ready: List[Outcome] = []
+        while len(self._pending) >= self.max_pending or (self._pending and self._pending[0][1].done()):
+            ready.append(self._pop())
+        return ready
+
+    def drain(self) -> Iterator[Outcome]:
+        while self._pending:
+            yield self._pop()
+
+    def _pop(self) -> Outcome:
+        context, future = self._pending.popleft()
+        try:
+            return Outcome(context=context, result=future.result())
+        except Exception as exc:  # pylint: disable=broad-except
+            return Outcome(context=context, error=exc)
+
+    def close(self) -> None:
+        """Cancela lo pendiente y libera los hilos."""
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+class PagePrefetcher:
+    """Consume un iterador de páginas en un hilo propio, con ``depth`` páginas de adelanto.
+
+    La cola acotada hace de contrapresión: si quien consume las páginas se
+    detiene (por ejemplo porque el pipeline de PDFs está lleno), el hilo deja
+    de pedir páginas nuevas al servidor.
+    """
+
+    _DONE = object()
+
+    def __init__(self, pages: Iterable[Any], depth: int = 2) -> None:
+        self._pages = pages
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, depth))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _produce(self) -> None:
+        iterator = iter(self._pages)
+        try:
+            for page in iterator:
+                if not self._put(page):
+                    return
+            self._put(self._DONE)
+        except Exception as exc:  # pylint: disable=broad-except
+            self._put(exc)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self._queue.get()
+            if item is self._DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def close(self) -> None:
+        """Detiene el hilo productor aunque queden páginas por leer."""
+        self._stop.set()
+        self._thread.join()
+
+
+class ParsePool:
+    """Parsea PDFs en un ProcessPoolExecutor (pypdf no libera el GIL).
+
+    Los documentos se envían en trozos para que cada viaje entre procesos
+    lleve varios PDFs. Los lotes con menos de ``min_parallel`` documentos se
+    parsean en el proceso actual, donde el costo de IPC no compensa.
+    ``parse`` debe poder serializarse con pickle (una función de módulo o un
+    ``functools.partial`` de ella).
+    """
+
+    def __init__(
+        self,
+        processes: int,
+        *,
+        chunk_size: Optional[int] = None,
+        min_parallel: int = 4,
+        parse: Callable[[str, bytes], RemateDetail] = parse_remate_pdf,
+    ) -> None:
+        self.processes = max(1, processes)
+        self.chunk_size = chunk_size
+        self.min_parallel = min_parallel
+        self.parse_document = parse
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def parse(self, items: Sequence[Tuple[str, bytes]]) -> List[Outcome]:
+        """Parsea (codigo, pdf_bytes) y devuelve un Outcome por documento, en orden."""
+        if self.processes <= 1 or len(items) < self.min_parallel:
+            return [_run(self.parse_document, item, item[0]) for item in items]
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        chunk_size = self.chunk_size or max(1, -(-len(items) // self.processes))
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+        outcomes: List[Outcome] = []
+        for chunk, results in zip(chunks, self._executor.map(partial(_parse_chunk, self.parse_document), chunks)):
+            for (codigo, _), (detail, error) in zip(chunk, results):
+                if error is not None:
+                    outcomes.append(Outcome(context=codigo, error=RuntimeError(error)))
+                else:
+                    outcomes.append(Outcome(context=codigo, result=detail))
+        return outcomes
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _parse_chunk(
+    parse: Callable[[str, bytes], RemateDetail],
+    chunk: Sequence[Tuple[str, bytes]],
+) -> List[Tuple[Optional[RemateDetail], Optional[str]]]:
+    # Se ejecuta en el proceso hijo: las excepciones vuelven como texto
+    results: List[Tuple[Optional[RemateDetail], Optional[str]]] = []
+    for codigo, pdf_bytes in chunk:
+        try:
+            results.append((parse(codigo, pdf_bytes), None))
+        except Exception as exc:  # pylint: disable=broad-except
+            results.append((None, f"{type(exc).__name__}: {exc}"))
+    return results
+
+
+def _run(fn: Callable[..., Any], args: tuple, context: Any) -> Outcome:
+    try:
+        return Outcome(context=context, result=fn(*args))
+    except Exception as exc:  # pylint: disable=broad-except
+        return Outcome(context=context, error=exc)
+
+
+__all__ = ["OrderedPipeline", "Outcome", "PagePrefetcher", "ParsePool"]
@@ -0,0 +1,244 @@
+"""
+Reconstruye el dataset a partir de los textos guardados, sin red ni pypdf.
+
+    python3 -m backend.remates_scraper.main reparse --output data/remates.json \
+        --shards-dir data/shards --deltas-dir data/deltas
+
+Sirve para publicar una corrección de parser.py en segundos: cada remate
+del dataset se vuelve a parsear desde su texto en ``.cache/text``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from functools import partial
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .parser import PARSER_VERSION, parse_remate_text
+from .storage import RemateRecord, build_record, load_dataset, write_dataset, write_delta, write_shards
+from .textstore import DEFAULT_TEXT_DIR, TextStore
+
+
+@dataclass
+class ReparseStats:
+    total: int = 0
+    reparsed: int = 0
+    missing: int = 0
+    stale: int = 0
+    partial: int = 0
+    errors: int = 0
+    # Textos de una versión anterior que quedan al día si se guarda el dataset
+    outdated: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"{self.reparsed}/{self.total} remates reparseados "
+            f"({self.stale} de una versión anterior del parser), "
+            f"{self.missing} sin texto guardado, {self.partial} con texto parcial (se conservan), "
+            f"{self.errors} errores"
+        )
+
+
+# (record, versión del parser guardada, texto completo, error)
+_Result = Tuple[Optional[RemateRecord], Optional[int], bool, Optional[str]]
+
+
+def _reparse_chunk(root: Path, only_stale: bool, codigos: Sequence[str]) -> List[_Result]:
+    # Se ejecuta en el proceso hijo: cada uno lee sus textos desde el disco.
+    # No escribe nada: las versiones se actualizan después de guardar el dataset.
+    store = TextStore(root)
+    results: List[_Result] = []
+    for codigo in codigos:
+        stored = store.get(codigo)
+        if stored is None:
+            results.append((None, None, True, None))
+            continue
+        version = stored.parser_version
+        # Un texto parcial (--lazy-extract) no alcanza para reconstruir el remate
+        if not stored.complete or (only_stale and version == PARSER_VERSION):
+            results.append((None, version, stored.complete, None))
+            continue
+        try:
+            detail = parse_remate_text(codigo, stored.text)
+            record = build_record(
+                stored.entry, stored.tipo_bien, date.fromisoformat(stored.fecha_publicacion), detail
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            results.append((None, version, stored.complete, f"{type(exc).__name__}: {exc}"))
+            continue
+        results.append((record, version, stored.complete, None))
+    return results
+
+
+def _mark_chunk(root: Path, codigos: Sequence[str]) -> int:
+    # Se ejecuta en el proceso hijo
+    store = TextStore(root)
+    for codigo in codigos:
+        stored = store.get(codigo)
+        if stored is not None and stored.parser_version != PARSER_VERSION:
+            stored.parser_version = PARSER_VERSION
+            store.put(stored)
+    return store.stores
+
+
+def _chunks(codigos: Sequence[str], processes: int) -> List[Sequence[str]]:
+    chunk_size = max(1, -(-len(codigos) // (processes * 4)))
+    return [codigos[i : i + chunk_size] for i in range(0, len(codigos), chunk_size)]
+
+
+def mark_current(store: TextStore, codigos: Iterable[str], *, processes: int = 1) -> int:
+    """Marca con ``PARSER_VERSION`` los textos de ``codigos``. Devuelve los reescritos.
+
+    Se llama solo después de guardar el dataset reconstruido: si la escritura
+    falla, los textos siguen con su versión anterior y ``--only-stale`` los
+    vuelve a tomar en la próxima corrida.
+    """
+    processes = max(1, processes)
+    chunks = _chunks(list(codigos), processes)
+    work = partial(_mark_chunk, store.root)
+    if processes > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return sum(executor.map(work, chunks))
+    return sum(work(chunk) for chunk in chunks)
+
+
+def reparse_records(
+    records: Sequence[RemateRecord],
+    store: TextStore,
+    *,
+    processes: int = 1,
+    only_stale: bool = False,
+) -> Tuple[List[RemateRecord], ReparseStats]:
+    """Vuelve a parsear ``records`` desde ``store``, conservando el orden.
+
+    Los remates sin texto guardado, con texto parcial o que fallan se
+    mantienen tal como estaban. Con ``only_stale`` solo se reparsean los
+    textos guardados con una versión anterior del parser. No modifica
+    ``store``: los códigos cuyos textos hay que pasar a la versión actual
+    quedan en ``stats.outdated`` para ``mark_current``.
+    """
+    codigos = [record.codigo_validacion for record in records]
+    processes = max(1, processes)
+    chunks = _chunks(codigos, processes)
+
+    work = partial(_reparse_chunk, store.root, only_stale)
+    if processes > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            chunk_results = list(executor.map(work, chunks))
+    else:
+        chunk_results = [work(chunk) for chunk in chunks]
+
+    stats = ReparseStats(total=len(records))
+    rebuilt: List[RemateRecord] = []
+    results = (result for chunk in chunk_results for result in chunk)
+    for record, (new_record, version, complete, error) in zip(records, results):
+        if version is None:
+            stats.missing += 1
+        else:
+            stats.stale += version != PARSER_VERSION
+            stats.partial += not complete
+        if error is not None:
+            stats.errors += 1
+            print(f"[ERROR] No se pudo reparsear {record.codigo_validacion}: {error}", file=sys.stderr)
+        if new_record is None:
+            rebuilt.append(record)
+        else:
+            stats.reparsed += 1
+            rebuilt.append(new_record)
+            if version != PARSER_VERSION:
+                stats.outdated.append(record.codigo_validacion)
+    return rebuilt, stats
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main reparse",
+        description="Reconstruye el dataset desde los textos guardados, sin descargar PDFs",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/remates.json"),
+        help="Dataset a reconstruir (por defecto data/remates.json)",
+    )
+    parser.add_argument(
+        "--text-store-dir",
+        type=Path,
+        default=DEFAULT_TEXT_DIR,
+        help=f"Directorio de textos guardados (por defecto {DEFAULT_TEXT_DIR})",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Procesos de parseo en paralelo (por defecto, uno por CPU)",
+    )
+    parser.add_argument(
+        "--only-stale",
+        action="store_true",
+        help=f"Solo reparsea los textos guardados con una versión del parser distinta de {PARSER_VERSION}",
+    )
+    parser.add_argument(
+        "--shards-dir",
+        type=Path,
+        help=(
+            "Directorio de shards del frontend que se reescribe junto con el dataset "
+            "(ej: data/shards); usar siempre que el crawler escriba shards"
+        ),
+    )
+    parser.add_argument(
+        "--deltas-dir",
+        type=Path,
+        help="Directorio de versiones y deltas del frontend que se actualiza junto con el dataset (ej: data/deltas)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    try:
+        records = load_dataset(args.output)
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        print(f"[ERROR] No se pudo leer {args.output}: {exc}", file=sys.stderr)
+        return 1
+    if not records:
+        print(f"[WARN] {args.output} no tiene remates que reparsear", file=sys.stderr)
+        return 0
+
+    store = TextStore(args.text_store_dir)
+    rebuilt, stats = reparse_records(
+        records,
+        store,
+        processes=args.processes,
+        only_stale=args.only_stale,
+    )
+    print(f"Parser versión {PARSER_VERSION}: {stats.summary()}")
+    try:
+        changed = write_dataset(args.output, rebuilt)
+    except OSError as exc:
+        print(f"[ERROR] No se pudo guardar {args.output}: {exc}", file=sys.stderr)
+        return 1
+    if changed:
+        print(f"Dataset reconstruido en {args.output}")
+    else:
+        print(f"El reparseo no cambió ningún remate; {args.output} queda igual")
+    if stats.outdated:
+        marked = mark_current(store, stats.outdated, processes=args.processes)
+        print(f"Textos marcados con la versión {PARSER_VERSION}: {marked}")
+    if args.shards_dir:
+        touched = write_shards(args.shards_dir, rebuilt)
+        print(f"Shards en {args.shards_dir}: {touched} archivos actualizados")
+    if args.deltas_dir:
+        version = write_delta(args.deltas_dir, records, rebuilt)
+        if version is not None:
+            print(f"Versiones en {args.deltas_dir}: publicada la versión {version}")
+    return 0
+
+
+__all__ = ["ReparseStats", "main", "mark_current", "reparse_records"]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import unicodedata
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from .storage import RemateRecord
+
+# Campos que revisa el buscador de palabras del frontend
+SEARCH_FIELDS = (
+    "tipo_bien",
+    "deudor_nombre",
+    "region",
+    "comuna",
+    "direccion",
+    "tipo_procedimiento",
+    "procedimiento",
+    "fecha_publicacion",
+    "fecha_remate",
+    "valor_minimo",
+    "descripcion",
+    "tipo_bienes",
+)
+
+# Campos que revisan --keywords por defecto (--match-fields)
+DEFAULT_MATCH_FIELDS = ("descripcion", "tipo_bienes", "tipo_bien", "tipo_procedimiento")
+
+
+def normalize_text(value: str) -> str:
+    if not value:
+        return ""
+    normalized = unicodedata.normalize("NFKD", value)
+    ascii_text = normalized.encode("ascii", "ignore").decode()
+    ascii_text = ascii_text.replace("\n", " ")
+    return " ".join(ascii_text.lower().split())
+
+
+def field_to_text(record: "RemateRecord", field: str) -> str:
+    value = getattr(record, field, None)
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M")
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+def record_haystack(record: "RemateRecord", fields: Sequence[str]) -> str:
+    """Texto normalizado en el que se buscan las palabras clave de un registro."""
+    return normalize_text(" ".join(field_to_text(record, field) for field in fields))
+
+
+class HaystackCache:
+    """Textos de ``record_haystack`` ya normalizados, por registro y conjunto de campos.
+
+    Sirve para correr muchas listas de palabras clave sobre los mismos
+    registros sin volver a armar y normalizar su texto cada vez. Los
+    registros se identifican por identidad (no se modifican después de
+    creados: las correcciones usan ``dataclasses.replace``).
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[str, ...], Dict[int, Tuple["RemateRecord", str]]] = {}
+
+    def get(self, record: "RemateRecord", fields: Sequence[str]) -> str:
+        entries = self._entries.setdefault(tuple(fields), {})
+        entry = entries.get(id(record))
+        # Se guarda el registro junto al texto: su id no se reutiliza mientras viva
+        if entry is None or entry[0] is not record:
+            entry = (record, record_haystack(record, fields))
+            entries[id(record)] = entry
+        return entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class KeywordMatcher:
+    """Palabras clave normalizadas una sola vez, para probarlas en muchos textos.
+
+    Se descartan las repetidas y las que otra ya implica: con ``all``, una
+    palabra contenida en otra se cumple siempre que esa otra aparece; con
+    ``any``, una que contiene a otra nunca es la única en aparecer. Las
+    restantes se prueban en el orden que corta antes: las más cortas primero
+    con ``any`` y las más largas primero con ``all``.
+    """
+
+    def __init__(self, keywords: Iterable[str], match_mode: str = "any") -> None:
+        normalized = list(dict.fromkeys(keyword for keyword in map(normalize_text, keywords) if keyword))
+        if match_mode == "all":
+            kept = [k for k in normalized if not any(k != other and k in other for other in normalized)]
+        else:
+            kept = [k for k in normalized if not any(k != other and other in k for other in normalized)]
+        kept.sort(key=len, reverse=match_mode == "all")
+        self.keywords: Tuple[str, ...] = tuple(kept)
+        self.match_mode = match_mode
+
+    def __bool__(self) -> bool:
+        return bool(self.keywords)
+
+    def matches(self, haystack: str) -> bool:
+        if self.match_mode == "all":
+            return all(keyword in haystack for keyword in self.keywords)
+        return any(keyword in haystack for keyword in self.keywords)
+
+
+def build_search_index(records: Sequence["RemateRecord"], fields: Sequence[str] = SEARCH_FIELDS) -> Dict[str, List]:
+    """Índice invertido: cada token normalizado con los registros que lo contienen.
+
+    Los tokens son las palabras de ``record_haystack`` (separadas por
+    espacios), así que una palabra clave sin espacios aparece en el texto de
+    un registro si y solo si es parte de alguno de sus tokens: buscarla en el
+    vocabulario y unir las listas de esos tokens da lo mismo que
+    ``filter_records``. ``tokens`` va ordenado; ``postings[i]`` son las
+    posiciones (en ``records``) de los registros con ``tokens[i]``, en orden.
+    """
+    postings: Dict[str, List[int]] = {}
+    for position, record in enumerate(records):
+        for token in set(record_haystack(record, fields).split(" ")):
+            if token:
+                postings.setdefault(token, []).append(position)
+    tokens = sorted(postings)
+    return {"fields": list(fields), "tokens": tokens, "postings": [postings[token] for token in tokens]}
+
+
+__all__ = [
+    "DEFAULT_MATCH_FIELDS",
+    "SEARCH_FIELDS",
+    "HaystackCache",
+    "KeywordMatcher",
+    "build_search_index",
+    "field_to_text",
+    "normalize_text",
+    "record_haystack",
+]
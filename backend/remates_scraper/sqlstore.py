@@ -0,0 +1,346 @@
+"""
+Almacén SQLite de remates, para consultar sin cargar todo el JSON.
+
+    python3 -m backend.remates_scraper.main query --db data/remates.sqlite \\
+        --tipo-bien inmueble --region Valparaíso --max-price 50000000 \\
+        --remate-from 2026-11-01 --remate-to 2026-11-30
+
+Los remates se insertan o actualizan por ``codigo_validacion`` (con
+``--sqlite`` en el scraper o ``query --import``). Hay índices sobre las
+fechas, la región, la comuna y el valor mínimo, y una tabla FTS5 sobre
+``descripcion`` y ``tipo_bienes`` para las palabras clave. El almacén
+acumula: los remates que salen del periodo del JSON siguen consultables.
+Región y comuna se buscan sin tildes ni mayúsculas ("Valparaíso" encuentra
+el "Valparaiso" que guarda el parser), con columnas normalizadas aparte.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import time
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from .search import normalize_text
+from .storage import DATASET_FORMATS, RemateRecord, load_dataset, write_dataset
+
+DEFAULT_DB_PATH = Path("data/remates.sqlite")
+
+_COLUMNS = tuple(RemateRecord.__dataclass_fields__)
+# Columnas con region y comuna normalizadas (normalize_text), para filtrar
+# sin depender de tildes ni mayúsculas
+_KEY_COLUMNS = ("region_key", "comuna_key")
+_ALL_COLUMNS = _COLUMNS + _KEY_COLUMNS
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS remates (
+    {", ".join(f"{name} {'INTEGER' if name == 'valor_minimo' else 'TEXT'}" for name in _ALL_COLUMNS)},
+    UNIQUE (codigo_validacion)
+);
+-- También da el orden del dataset sin ordenar los resultados
+CREATE INDEX IF NOT EXISTS remates_fecha_publicacion ON remates (fecha_publicacion, codigo_validacion);
+CREATE INDEX IF NOT EXISTS remates_fecha_remate ON remates (fecha_remate);
+DROP INDEX IF EXISTS remates_region_comuna;
+DROP INDEX IF EXISTS remates_comuna;
+CREATE INDEX IF NOT EXISTS remates_region_key ON remates (region_key, comuna_key);
+CREATE INDEX IF NOT EXISTS remates_comuna_key ON remates (comuna_key);
+CREATE INDEX IF NOT EXISTS remates_valor_minimo ON remates (valor_minimo);
+CREATE VIRTUAL TABLE IF NOT EXISTS remates_fts USING fts5(
+    descripcion, tipo_bienes, content='remates', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS remates_ai AFTER INSERT ON remates BEGIN
+    INSERT INTO remates_fts (rowid, descripcion, tipo_bienes)
+    VALUES (new.rowid, new.descripcion, new.tipo_bienes);
+END;
+CREATE TRIGGER IF NOT EXISTS remates_ad AFTER DELETE ON remates BEGIN
+    INSERT INTO remates_fts (remates_fts, rowid, descripcion, tipo_bienes)
+    VALUES ('delete', old.rowid, old.descripcion, old.tipo_bienes);
+END;
+CREATE TRIGGER IF NOT EXISTS remates_au AFTER UPDATE OF descripcion, tipo_bienes ON remates BEGIN
+    INSERT INTO remates_fts (remates_fts, rowid, descripcion, tipo_bienes)
+    VALUES ('delete', old.rowid, old.descripcion, old.tipo_bienes);
+    INSERT INTO remates_fts (rowid, descripcion, tipo_bienes)
+    VALUES (new.rowid, new.descripcion, new.tipo_bienes);
+END;
+"""
+
+_UPSERT = (
+    f"INSERT INTO remates ({', '.join(_ALL_COLUMNS)}) VALUES ({', '.join('?' for _ in _ALL_COLUMNS)}) "
+    f"ON CONFLICT (codigo_validacion) DO UPDATE SET "
+    + ", ".join(f"{name} = excluded.{name}" for name in _ALL_COLUMNS if name != "codigo_validacion")
+    # Sin cambios no se escribe la fila (ni se toca el índice FTS)
+    + " WHERE "
+    + " OR ".join(f"{name} IS NOT excluded.{name}" for name in _COLUMNS if name != "codigo_validacion")
+)
+
+
+_FECHA_PUBLICACION = _COLUMNS.index("fecha_publicacion")
+_FECHA_REMATE = _COLUMNS.index("fecha_remate")
+
+
+def _row_values(record: RemateRecord) -> Tuple:
+    # Igual que as_serializable, sin la copia profunda de asdict
+    values = [getattr(record, name) for name in _COLUMNS]
+    values[_FECHA_PUBLICACION] = record.fecha_publicacion.isoformat()
+    values[_FECHA_REMATE] = record.fecha_remate.isoformat() if record.fecha_remate else None
+    values.extend((_place_key(record.region), _place_key(record.comuna)))
+    return tuple(values)
+
+
+def _record_from_row(row: Sequence) -> RemateRecord:
+    values = list(row)
+    values[_FECHA_PUBLICACION] = date.fromisoformat(values[_FECHA_PUBLICACION])
+    fecha_remate = values[_FECHA_REMATE]
+    values[_FECHA_REMATE] = datetime.fromisoformat(fecha_remate) if fecha_remate else None
+    return RemateRecord(*values)
+
+
+def _place_key(value: Optional[str]) -> Optional[str]:
+    # Región o comuna como se guarda en region_key/comuna_key
+    return normalize_text(value or "") or None
+
+
+def fts_query(keywords: Sequence[str], match_mode: str = "any") -> Optional[str]:
+    """Expresión FTS5 para ``keywords``: cada una como frase, con la última palabra como prefijo.
+
+    A diferencia de ``filter_records`` (que busca subcadenas), FTS5 encuentra
+    palabras que empiezan con lo buscado: "camion" encuentra "camiones" pero
+    "amion" no encuentra "camion".
+    """
+    phrases = []
+    for keyword in keywords:
+        tokens = "".join(ch if ch.isalnum() else " " for ch in normalize_text(keyword)).split()
+        if tokens:
+            phrases.append(f'"{" ".join(tokens)}"*')
+    if not phrases:
+        return None
+    return (" AND " if match_mode == "all" else " OR ").join(phrases)
+
+
+class SqliteStore:
+    """Remates en SQLite, insertados o actualizados por ``codigo_validacion``."""
+
+    def __init__(self, path: Path = DEFAULT_DB_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        try:
+            self._migrate()
+            self._conn.executescript(_SCHEMA)
+        except sqlite3.OperationalError as exc:
+            self._conn.close()
+            raise RuntimeError(f"SQLite {sqlite3.sqlite_version} sin soporte para FTS5: {exc}") from exc
+
+    def _migrate(self) -> None:
+        # Bases creadas antes de region_key/comuna_key: se agregan y se llenan
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(remates)")}
+        if not existing or set(_KEY_COLUMNS) <= existing:
+            return
+        with self._conn:
+            for name in _KEY_COLUMNS:
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE remates ADD COLUMN {name} TEXT")
+            rows = self._conn.execute("SELECT rowid, region, comuna FROM remates").fetchall()
+            self._conn.executemany(
+                "UPDATE remates SET region_key = ?, comuna_key = ? WHERE rowid = ?",
+                ((_place_key(region), _place_key(comuna), rowid) for rowid, region, comuna in rows),
+            )
+
+    def __enter__(self) -> "SqliteStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def upsert(self, records: Iterable[RemateRecord]) -> int:
+        """Inserta o actualiza los remates. Devuelve cuántas filas cambiaron."""
+        with self._conn:
+            # rowcount no cuenta las filas que escriben los triggers del FTS
+            cursor = self._conn.executemany(_UPSERT, (_row_values(record) for record in records))
+            return max(cursor.rowcount, 0)
+
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM remates").fetchone()[0]
+
+    def query(
+        self,
+        *,
+        tipo_bien: Optional[str] = None,
+        region: Optional[str] = None,
+        comuna: Optional[str] = None,
+        min_price: Optional[int] = None,
+        max_price: Optional[int] = None,
+        published_from: Optional[date] = None,
+        published_to: Optional[date] = None,
+        remate_from: Optional[date] = None,
+        remate_to: Optional[date] = None,
+        keywords: Sequence[str] = (),
+        match_mode: str = "any",
+        limit: Optional[int] = None,
+    ) -> List[RemateRecord]:
+        """Remates que cumplen todos los criterios dados, en el orden del dataset.
+
+        Las fechas son inclusivas. Los criterios de precio o de fecha de
+        remate descartan los remates sin ese dato. Región y comuna se
+        comparan sin tildes ni mayúsculas.
+        """
+        conditions: List[str] = []
+        params: List[object] = []
+        if tipo_bien:
+            conditions.append("tipo_bien = ?")
+            params.append(tipo_bien)
+        for column, value in (("region_key", region), ("comuna_key", comuna)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(_place_key(value))
+        if min_price is not None:
+            conditions.append("valor_minimo >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            conditions.append("valor_minimo <= ?")
+            params.append(max_price)
+        if published_from:
+            conditions.append("fecha_publicacion >= ?")
+            params.append(published_from.isoformat())
+        if published_to:
+            conditions.append("fecha_publicacion <= ?")
+            params.append(published_to.isoformat())
+        # fecha_remate se guarda como YYYY-MM-DDTHH:MM:SS: el día completo
+        # queda entre "YYYY-MM-DD" y "YYYY-MM-DDU"
+        if remate_from:
+            conditions.append("fecha_remate >= ?")
+            params.append(remate_from.isoformat())
+        if remate_to:
+            conditions.append("fecha_remate < ?")
+            params.append(f"{remate_to.isoformat()}U")
+        match = fts_query(keywords, match_mode)
+        if match:
+            conditions.append("rowid IN (SELECT rowid FROM remates_fts WHERE remates_fts MATCH ?)")
+            params.append(match)
+
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM remates"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY fecha_publicacion DESC, codigo_validacion DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [_record_from_row(row) for row in self._conn.execute(sql, params)]
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main query",
+        description="Consulta el almacén SQLite de remates (--sqlite del scraper)",
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=DEFAULT_DB_PATH,
+        help=f"Base SQLite (por defecto {DEFAULT_DB_PATH})",
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_dataset",
+        type=Path,
+        help="Dataset JSON (cualquier formato de write_dataset) a insertar o actualizar antes de consultar",
+    )
+    parser.add_argument("--tipo-bien", help="mueble / inmueble")
+    parser.add_argument("--region", help="Región, sin importar tildes ni mayúsculas (ej: Valparaíso)")
+    parser.add_argument("--comuna", help="Comuna, sin importar tildes ni mayúsculas (ej: Viña del Mar)")
+    parser.add_argument("--min-price", type=int, help="Valor mínimo desde (pesos)")
+    parser.add_argument("--max-price", type=int, help="Valor mínimo hasta (pesos)")
+    parser.add_argument("--start-date", type=date.fromisoformat, help="Fecha mínima de publicación (YYYY-MM-DD)")
+    parser.add_argument("--end-date", type=date.fromisoformat, help="Fecha máxima de publicación (YYYY-MM-DD)")
+    parser.add_argument("--remate-from", type=date.fromisoformat, help="Fecha mínima del remate (YYYY-MM-DD)")
+    parser.add_argument("--remate-to", type=date.fromisoformat, help="Fecha máxima del remate (YYYY-MM-DD)")
+    parser.add_argument(
+        "--keywords",
+        nargs="+",
+        default=[],
+        help="Palabras clave en descripcion y tipo_bienes (FTS5: palabras que empiezan así)",
+    )
+    parser.add_argument(
+        "--match-mode",
+        choices=("any", "all"),
+        default="any",
+        help="Modo de coincidencia para palabras clave: any (alguna) / all (todas)",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Máximo de remates a devolver")
+    parser.add_argument("--output", type=Path, help="Exporta los resultados como dataset JSON")
+    parser.add_argument(
+        "--output-format",
+        choices=DATASET_FORMATS,
+        default=None,
+        help="Formato del JSON exportado (por defecto pretty)",
+    )
+    parser.add_argument("--html-output", type=Path, help="Exporta los resultados como informe HTML")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    # Los resúmenes y el informe HTML viven en main, que importa este módulo
+    from .main import build_category_stats, print_summary, render_html
+
+    args = parse_args(argv)
+    try:
+        store = SqliteStore(args.db)
+    except (OSError, sqlite3.Error, RuntimeError) as exc:
+        print(f"[ERROR] No se pudo abrir {args.db}: {exc}", file=sys.stderr)
+        return 1
+
+    with store:
+        if args.import_dataset:
+            try:
+                records = load_dataset(args.import_dataset)
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                print(f"[ERROR] No se pudo leer {args.import_dataset}: {exc}", file=sys.stderr)
+                return 1
+            changed = store.upsert(records)
+            print(f"{changed} remates nuevos o actualizados desde {args.import_dataset} ({store.count()} en {args.db})")
+
+        started = time.perf_counter()
+        results = store.query(
+            tipo_bien=args.tipo_bien,
+            region=args.region,
+            comuna=args.comuna,
+            min_price=args.min_price,
+            max_price=args.max_price,
+            published_from=args.start_date,
+            published_to=args.end_date,
+            remate_from=args.remate_from,
+            remate_to=args.remate_to,
+            keywords=args.keywords,
+            match_mode=args.match_mode,
+            limit=args.limit,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+    print_summary(results, f"Consulta en {args.db} ({elapsed_ms:.1f} ms)")
+    if args.output:
+        write_dataset(args.output, results, output_format=args.output_format)
+        print(f"Se guardaron {len(results)} remates en {args.output}")
+    if args.html_output:
+        tipo_bien_counts, tipo_bienes_counts = build_category_stats(results)
+        render_html(
+            args.html_output,
+            results,
+            title=f"Remates boletin concursal ({len(results)})",
+            generated_at=datetime.now(UTC),
+            keywords=args.keywords or None,
+            match_fields=["descripcion", "tipo_bienes"],
+            tipo_bien_counts=tipo_bien_counts,
+            tipo_bienes_counts=tipo_bienes_counts,
+        )
+        print(f"Se generó el informe HTML en {args.html_output}")
+    return 0
+
+
+__all__ = ["DEFAULT_DB_PATH", "SqliteStore", "fts_query", "main"]
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import base64
+import calendar
+import hashlib
 import json
+import os
+import re
+import sys
+import textwrap
+import unicodedata
+from array import array
+from collections import Counter
 from dataclasses import asdict, dataclass
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from .parser import RemateDetail
+from .search import build_search_index
+
+FUENTE_URL_PREFIX = "https://boletinconcursal.cl/boletin/downloadDocumentoByCodigo?codigoValidacion="
 
 
 @dataclass
@@ -36,14 +51,639 @@ class RemateRecord:
         payload["fecha_remate"] = self.fecha_remate.isoformat() if self.fecha_remate else None
         return payload
 
+    @classmethod
+    def from_serializable(cls, payload: dict) -> "RemateRecord":
+        data = {name: payload.get(name) for name in cls.__dataclass_fields__}
+        data["fecha_publicacion"] = date.fromisoformat(payload["fecha_publicacion"])
+        fecha_remate = payload.get("fecha_remate")
+        data["fecha_remate"] = datetime.fromisoformat(fecha_remate) if fecha_remate else None
+        return cls(**data)
+
+
+def build_record(entry: Dict, tipo_bien: str, fecha_publicacion: date, detail: RemateDetail) -> RemateRecord:
+    """Combina una fila del listado con el detalle parseado de su PDF."""
+    codigo = detail.codigo_validacion
+    return RemateRecord(
+        codigo_validacion=codigo,
+        tipo_bien=tipo_bien,
+        fecha_publicacion=fecha_publicacion,
+        fecha_remate=detail.fecha_remate,
+        tipo_procedimiento=detail.tipo_procedimiento or entry.get("tipoProcedimiento"),
+        rol_causa=detail.rol_causa,
+        tribunal=detail.tribunal,
+        deudor_nombre=detail.deudor or entry.get("deudorNombre"),
+        deudor_rut=detail.deudor_rut,
+        liquidador=detail.liquidador,
+        region=detail.region,
+        comuna=detail.comuna,
+        direccion=detail.direccion,
+        descripcion=detail.descripcion,
+        tipo_bienes=detail.tipo_bienes,
+        valor_minimo=detail.valor_minimo,
+        comision=detail.comision,
+        ente_publicador=entry.get("entePublicador"),
+        procedimiento=entry.get("procedimiento"),
+        fuente_url=f"{FUENTE_URL_PREFIX}{codigo}",
+    )
+
+
+# Formatos de salida de write_dataset
+DATASET_FORMATS = ("pretty", "compact", "ndjson", "columnar")
+
+
+def manifest_path_for(path: Path) -> Path:
+    """Manifiesto que acompaña al dataset: ``data/remates.json`` -> ``data/remates.manifest.json``."""
+    return path.with_name(f"{path.stem}.manifest.json")
+
+
+def facets_path_for(path: Path) -> Path:
+    """Resumen de facetas del dataset: ``data/remates.json`` -> ``data/remates.facets.json``."""
+    return path.with_name(f"{path.stem}.facets.json")
+
+
+def load_manifest(path: Path) -> Dict:
+    """Lee el manifiesto de un dataset. Devuelve {} si no existe o no se puede leer."""
+    try:
+        payload = json.loads(manifest_path_for(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _canonical_line(payload: dict) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def dataset_digest(records: Iterable[RemateRecord]) -> str:
+    """sha256 del contenido de los registros, sin importar el formato del archivo."""
+    digest = hashlib.sha256()
+    for record in records:
+        digest.update(_canonical_line(record.as_serializable()).encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def write_dataset(path: Path, records: Iterable[RemateRecord], *, output_format: Optional[str] = None) -> bool:
+    """Escribe el dataset de a un registro por vez y lo reemplaza de forma atómica.
+
+    - ``pretty``: ``{"records": [...]}`` con indentación.
+    - ``compact``: el mismo objeto sin indentación, un registro por línea.
+    - ``ndjson``: un registro JSON por línea, sin envoltorio.
+    - ``columnar``: columnas codificadas (ver ``encode_columns``).
+
+    Sin ``output_format`` se mantiene el formato del manifiesto (o ``pretty``).
+    Se escribe en un archivo temporal junto al destino que luego se renombra,
+    así que un corte a mitad de camino nunca deja un archivo truncado. Si el
+    hash de los registros y el formato coinciden con el manifiesto, no se toca
+    ningún archivo y se devuelve False; si no, se reescriben el dataset, el
+    manifiesto (con ``updated_at``) y el resumen de facetas, y se devuelve
+    True.
+    """
+    manifest = load_manifest(path)
+    output_format = output_format or manifest.get("format") or "pretty"
+    if output_format not in DATASET_FORMATS:
+        raise ValueError(f"Formato de dataset desconocido: {output_format}")
+
+    previous_sha256 = manifest.get("sha256") if _same_encoding(manifest, output_format) else None
+    facets = FacetCounter()
+    changed, sha256, count = _replace_if_changed(path, facets.track(records), output_format, previous_sha256)
+    if changed:
+        _write_manifest(path, sha256, count, output_format)
+    if changed or not facets_path_for(path).exists():
+        _write_json_atomic(facets_path_for(path), facets.as_dict())
+    return changed
+
+
+def _replace_if_changed(
+    path: Path,
+    records: Iterable[RemateRecord],
+    output_format: str,
+    previous_sha256: Optional[str],
+) -> Tuple[bool, str, int]:
+    """Escribe en un temporal y lo renombra sobre ``path``, salvo que el hash no cambie.
+
+    Devuelve (se reemplazó el archivo, sha256 canónico, cantidad de registros).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8", newline="\n") as handle:
+            sha256, count = _write_records(handle, records, output_format)
+            handle.flush()
+            os.fsync(handle.fileno())
+        if path.exists() and previous_sha256 == sha256:
+            tmp_path.unlink()
+            return False, sha256, count
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True, sha256, count
+
 
-def write_dataset(path: Path, records: Iterable[RemateRecord]) -> None:
-    payload = {
+def _write_records(handle: TextIO, records: Iterable[RemateRecord], output_format: str) -> Tuple[str, int]:
+    """Escribe los registros y devuelve (sha256 canónico, cantidad)."""
+    digest = hashlib.sha256()
+    count = 0
+    if output_format == "columnar":
+        # Las columnas necesitan todos los registros antes de escribir
+        collected: List[RemateRecord] = []
+        for record in records:
+            digest.update(_canonical_line(record.as_serializable()).encode("utf-8") + b"\n")
+            collected.append(record)
+        json.dump(encode_columns(collected), handle, ensure_ascii=False, separators=(",", ":"))
+        handle.write("\n")
+        return digest.hexdigest(), len(collected)
+
+    separator = "\n"
+    if output_format == "compact":
+        handle.write('{"records":[')
+    elif output_format == "pretty":
+        handle.write('{\n  "records": [')
+
+    for record in records:
+        payload = record.as_serializable()
+        line = _canonical_line(payload)
+        digest.update(line.encode("utf-8") + b"\n")
+        count += 1
+        if output_format == "ndjson":
+            handle.write(line + "\n")
+            continue
+        handle.write(separator)
+        if output_format == "compact":
+            handle.write(line)
+        else:
+            handle.write(textwrap.indent(json.dumps(payload, ensure_ascii=False, indent=2), "    "))
+        separator = ",\n"
+
+    if output_format == "compact":
+        handle.write("\n]}\n" if count else "]}\n")
+    elif output_format == "pretty":
+        handle.write("\n  ]\n}\n" if count else "]\n}\n")
+    return digest.hexdigest(), count
+
+
+def _encoding(output_format: str) -> dict:
+    """Formato (y versión del formato columnar) que se anota en los manifiestos."""
+    if output_format == "columnar":
+        return {"format": output_format, "format_version": COLUMNAR_VERSION}
+    return {"format": output_format}
+
+
+def _same_encoding(manifest: dict, output_format: str) -> bool:
+    # Con otro formato (o versión) el hash de los registros no alcanza para
+    # saber si el archivo está al día
+    return all(manifest.get(key) == value for key, value in _encoding(output_format).items())
+
+
+def _write_manifest(path: Path, sha256: str, count: int, output_format: str) -> None:
+    manifest = {
         "updated_at": datetime.now(UTC).isoformat() + "Z",
-        "records": [record.as_serializable() for record in records],
+        "records": count,
+        "sha256": sha256,
+        **_encoding(output_format),
     }
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    _write_json_atomic(manifest_path_for(path), manifest)
+
+
+def _write_json_atomic(target: Path, payload: dict) -> None:
+    tmp_path = target.with_name(f".{target.name}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp_path, target)
+
+
+# ---------------------------------------------------------------------------
+# Resumen de facetas (para los filtros del frontend)
+# ---------------------------------------------------------------------------
+class FacetCounter:
+    """Cuenta remates por tipo de bien, región, comuna dentro de cada región y mes.
+
+    El mes es el de ``shard_date``, la fecha por la que filtra el frontend.
+    Con ``track`` se cuenta mientras los registros se escriben, sin otra
+    pasada por el dataset.
+    """
+
+    def __init__(self) -> None:
+        self.records = 0
+        self.tipo_bien: Counter = Counter()
+        self.region: Counter = Counter()
+        self.comunas: Dict[Optional[str], Counter] = {}
+        self.month: Counter = Counter()
+
+    def add(self, record: RemateRecord) -> None:
+        self.records += 1
+        self.tipo_bien[record.tipo_bien] += 1
+        self.region[record.region] += 1
+        self.comunas.setdefault(record.region, Counter())[record.comuna] += 1
+        self.month[shard_date(record).strftime("%Y-%m")] += 1
+
+    def track(self, records: Iterable[RemateRecord]) -> Iterator[RemateRecord]:
+        for record in records:
+            self.add(record)
+            yield record
+
+    def as_dict(self) -> dict:
+        def items(counter: Counter) -> List[dict]:
+            # Los valores faltantes (None) van primero
+            return [
+                {"value": value, "records": counter[value]}
+                for value in sorted(counter, key=lambda value: (value is not None, value or ""))
+            ]
+
+        return {
+            "records": self.records,
+            "tipo_bien": items(self.tipo_bien),
+            "region": [{**item, "comunas": items(self.comunas[item["value"]])} for item in items(self.region)],
+            "month": items(self.month),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Formato columnar (para el frontend)
+# ---------------------------------------------------------------------------
+# 2: agrega el índice de búsqueda ("search"), opcional al leer
+# 3: fecha_remate pasa de uint32 a float64 (NaN si falta)
+COLUMNAR_VERSION = 3
+
+# Campos con pocos valores distintos: se guardan como índices a un diccionario
+DICTIONARY_FIELDS = (
+    "tipo_bien",
+    "tipo_procedimiento",
+    "tribunal",
+    "liquidador",
+    "region",
+    "comuna",
+    "comision",
+    "ente_publicador",
+    "procedimiento",
+)
+TEXT_FIELDS = (
+    "codigo_validacion",
+    "rol_causa",
+    "deudor_nombre",
+    "deudor_rut",
+    "direccion",
+    "descripcion",
+    "tipo_bienes",
+)
+
+# fecha_remate sin valor en las versiones 1 y 2 (segundos desde 1970 en un uint32)
+_NULL_SECONDS = 0xFFFFFFFF
+_EPOCH = date(1970, 1, 1)
+
+
+def _pack(typecode: str, values: Sequence) -> str:
+    packed = array(typecode, values)
+    if packed.itemsize > 1 and sys.byteorder != "little":
+        packed.byteswap()
+    return base64.b64encode(packed.tobytes()).decode("ascii")
+
+
+def _unpack(typecode: str, data: str) -> array:
+    packed = array(typecode)
+    packed.frombytes(base64.b64decode(data))
+    if packed.itemsize > 1 and sys.byteorder != "little":
+        packed.byteswap()
+    return packed
+
+
+_DTYPES = {"uint8": "B", "uint16": "H", "uint32": "I", "int32": "i", "float64": "d"}
+
+
+def _numeric_column(dtype: str, values: Sequence) -> dict:
+    return {"dtype": dtype, "data": _pack(_DTYPES[dtype], values)}
+
+
+def _dictionary_column(values: Sequence[Optional[str]]) -> dict:
+    index: Dict[Optional[str], int] = {}
+    codes = [index.setdefault(value, len(index)) for value in values]
+    dtype = "uint8" if len(index) <= 0x100 else "uint16" if len(index) <= 0x10000 else "uint32"
+    return {"values": list(index), **_numeric_column(dtype, codes)}
+
+
+def _remate_seconds(value: Optional[datetime]) -> float:
+    # float64: cualquier año de datetime (un typo del PDF como 2205, o
+    # anterior a 1970) cabe sin perder el segundo; las fechas con zona
+    # horaria se pasan a UTC
+    if value is None:
+        return float("nan")
+    return calendar.timegm(value.utctimetuple()) + value.microsecond / 1_000_000
+
+
+def encode_columns(records: Sequence[RemateRecord]) -> dict:
+    """Codifica los registros por columnas, en el mismo orden.
+
+    - Los ``DICTIONARY_FIELDS`` guardan la lista de valores distintos y un
+      arreglo de índices.
+    - ``fecha_publicacion`` son días desde 1970 (int32), ``fecha_remate``
+      segundos desde 1970 (float64, NaN si falta) y ``valor_minimo`` un
+      float64 (NaN si falta; exacto hasta 2**53).
+    - ``fuente_url`` se deriva de ``codigo_validacion`` con ``url_prefix``;
+      solo se guardan las que no siguen ese patrón.
+    - ``search`` es el índice invertido de ``build_search_index``: la lista
+      de cada token ocupa ``postings[offsets[i]:offsets[i + 1]]`` y guarda
+      la diferencia con la posición anterior.
+
+    Los arreglos numéricos van en base64, little-endian, listos para
+    convertirse en arreglos tipados en el navegador.
+    """
+    columns: Dict[str, object] = {}
+    for name in TEXT_FIELDS:
+        columns[name] = [getattr(record, name) for record in records]
+    for name in DICTIONARY_FIELDS:
+        columns[name] = _dictionary_column([getattr(record, name) for record in records])
+    columns["fecha_publicacion"] = _numeric_column(
+        "int32", [(record.fecha_publicacion - _EPOCH).days for record in records]
+    )
+    columns["fecha_remate"] = _numeric_column("float64", [_remate_seconds(record.fecha_remate) for record in records])
+    columns["valor_minimo"] = _numeric_column(
+        "float64",
+        [float("nan") if record.valor_minimo is None else float(record.valor_minimo) for record in records],
+    )
+    url_overrides = {
+        str(index): record.fuente_url
+        for index, record in enumerate(records)
+        if record.fuente_url != f"{FUENTE_URL_PREFIX}{record.codigo_validacion}"
+    }
+    return {
+        "format": "columnar",
+        "version": COLUMNAR_VERSION,
+        "count": len(records),
+        "url_prefix": FUENTE_URL_PREFIX,
+        "url_overrides": url_overrides,
+        "columns": columns,
+        "search": _pack_search_index(build_search_index(records), len(records)),
+    }
+
+
+def _pack_search_index(index: Dict[str, List], count: int) -> dict:
+    offsets = [0]
+    for postings in index["postings"]:
+        offsets.append(offsets[-1] + len(postings))
+    # Cada lista va como diferencias con la posición anterior: números chicos
+    # y repetidos que gzip comprime mucho mejor
+    gaps: List[int] = []
+    for postings in index["postings"]:
+        gaps.extend(position - previous for previous, position in zip([0] + postings, postings))
+    dtype = "uint16" if count <= 0x10000 else "uint32"
+    return {
+        "fields": index["fields"],
+        "tokens": index["tokens"],
+        "offsets": _numeric_column("uint32", offsets),
+        "postings": _numeric_column(dtype, gaps),
+    }
+
+
+def _decode_column(column: object, count: int) -> List:
+    if isinstance(column, list):
+        values = column
+    elif "values" in column:
+        dictionary = column["values"]
+        values = [dictionary[code] for code in _unpack(_DTYPES[column["dtype"]], column["data"])]
+    else:
+        values = list(_unpack(_DTYPES[column["dtype"]], column["data"]))
+    if len(values) != count:
+        raise ValueError(f"Columna con {len(values)} valores; se esperaban {count}")
+    return values
+
+
+def decode_columns(payload: dict) -> List[RemateRecord]:
+    """Inverso de ``encode_columns``."""
+    if not 1 <= payload.get("version", 0) <= COLUMNAR_VERSION:
+        raise ValueError(f"Versión de formato columnar no soportada: {payload.get('version')}")
+    count = payload["count"]
+    columns = {name: _decode_column(column, count) for name, column in payload["columns"].items()}
+    # Hasta la versión 2, uint32 con 0xFFFFFFFF como nulo
+    null_seconds = _NULL_SECONDS if payload["columns"]["fecha_remate"]["dtype"] == "uint32" else None
+    prefix = payload.get("url_prefix", FUENTE_URL_PREFIX)
+    overrides = payload.get("url_overrides", {})
+
+    records: List[RemateRecord] = []
+    for index in range(count):
+        seconds = columns["fecha_remate"][index]
+        valor = columns["valor_minimo"][index]
+        codigo = columns["codigo_validacion"][index]
+        records.append(
+            RemateRecord(
+                **{name: columns[name][index] for name in TEXT_FIELDS + DICTIONARY_FIELDS},
+                fecha_publicacion=_EPOCH + timedelta(days=columns["fecha_publicacion"][index]),
+                fecha_remate=(
+                    None
+                    if seconds != seconds or seconds == null_seconds
+                    else datetime(1970, 1, 1) + timedelta(seconds=seconds)
+                ),
+                valor_minimo=None if valor != valor else int(valor),
+                fuente_url=overrides.get(str(index), f"{prefix}{codigo}"),
+            )
+        )
+    return records
+
+
+# ---------------------------------------------------------------------------
+# Shards por mes y tipo de bien (para el frontend)
+# ---------------------------------------------------------------------------
+SHARDS_MANIFEST = "manifest.json"
+_SHARD_NAME_RE = re.compile(r"\d{4}-\d{2}-[0-9a-z-]+\.json")
+
+
+def shard_date(record: RemateRecord) -> date:
+    """Fecha por la que filtra el frontend: la del remate o, si falta, la de publicación."""
+    return record.fecha_remate.date() if record.fecha_remate else record.fecha_publicacion
+
+
+def shard_name(month: str, tipo_bien: str) -> str:
+    ascii_tipo = unicodedata.normalize("NFKD", tipo_bien or "otro").encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^0-9a-z]+", "-", ascii_tipo.lower()).strip("-") or "otro"
+    return f"{month}-{slug}.json"
+
+
+def write_shards(directory: Path, records: Iterable[RemateRecord], *, output_format: str = "columnar") -> int:
+    """Divide los registros en un archivo por mes y ``tipo_bien`` más un manifiesto.
+
+    El mes es el de ``shard_date``. ``manifest.json`` lista cada shard con su
+    URL (relativa al manifiesto), cantidad de registros y rango de fechas, para
+    que el frontend descargue solo los que se cruzan con los filtros. Los
+    shards y el manifiesto se reescriben únicamente si su contenido cambió, y
+    se borran los shards que ya no corresponden. Devuelve cuántos archivos de
+    shard se escribieron o borraron.
+    """
+    if output_format not in DATASET_FORMATS:
+        raise ValueError(f"Formato de dataset desconocido: {output_format}")
+
+    groups: Dict[Tuple[str, str], List[RemateRecord]] = {}
+    for record in records:
+        key = (shard_date(record).strftime("%Y-%m"), record.tipo_bien)
+        groups.setdefault(key, []).append(record)
+
+    manifest_path = directory / SHARDS_MANIFEST
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+    previous_shards = {item.get("url"): item for item in previous.get("shards", [])}
+
+    directory.mkdir(parents=True, exist_ok=True)
+    shards: List[dict] = []
+    touched = 0
+    # Los meses más recientes primero: el frontend los pide en este orden
+    for month, tipo_bien in sorted(groups, reverse=True):
+        group = groups[(month, tipo_bien)]
+        name = shard_name(month, tipo_bien)
+        old = previous_shards.get(name, {})
+        previous_sha256 = old.get("sha256") if _same_encoding(previous, output_format) else None
+        changed, sha256, count = _replace_if_changed(directory / name, group, output_format, previous_sha256)
+        touched += changed
+        fechas = [shard_date(record) for record in group]
+        shards.append(
+            {
+                "url": name,
+                "month": month,
+                "tipo_bien": tipo_bien,
+                "records": count,
+                "date_from": min(fechas).isoformat(),
+                "date_to": max(fechas).isoformat(),
+                "sha256": sha256,
+            }
+        )
+
+    current = {shard["url"] for shard in shards}
+    for path in directory.glob("*.json"):
+        if _SHARD_NAME_RE.fullmatch(path.name) and path.name not in current:
+            path.unlink()
+            touched += 1
+
+    manifest = {
+        "records": sum(shard["records"] for shard in shards),
+        **_encoding(output_format),
+        "shards": shards,
+    }
+    if {key: value for key, value in previous.items() if key != "updated_at"} != manifest:
+        _write_json_atomic(manifest_path, {"updated_at": datetime.now(UTC).isoformat() + "Z", **manifest})
+    return touched
+
+
+# ---------------------------------------------------------------------------
+# Versiones y deltas (para la cache del frontend)
+# ---------------------------------------------------------------------------
+DELTAS_MANIFEST = "manifest.json"
+# Deltas que se conservan; un cliente con una versión más antigua descarga
+# el dataset completo
+DELTAS_KEPT = 30
+_DELTA_NAME_RE = re.compile(r"\d+\.json")
+
+
+def write_delta(
+    directory: Path,
+    previous: Sequence[RemateRecord],
+    records: Sequence[RemateRecord],
+    *,
+    keep: int = DELTAS_KEPT,
+) -> Optional[int]:
+    """Publica una nueva versión del dataset con el delta desde ``previous``.
+
+    ``manifest.json`` tiene el número de versión, el sha256 y la cantidad de
+    registros del dataset vigente, y la lista de deltas disponibles. Cada
+    delta (``<versión>.json``) trae los códigos quitados y, en formato
+    columnar, los remates agregados o modificados respecto de la versión
+    anterior. Si ``previous`` no es la versión del manifiesto (el dataset se
+    escribió sin publicar su delta), la cadena se corta: solo se anota la
+    nueva versión y los clientes con una anterior descargan todo. Devuelve la
+    nueva versión, o None si los registros no cambiaron.
+    """
+    manifest_path = directory / DELTAS_MANIFEST
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        manifest = {}
+
+    sha256 = dataset_digest(records)
+    if manifest.get("sha256") == sha256:
+        return None
+    version = int(manifest.get("version", 0)) + 1
+
+    directory.mkdir(parents=True, exist_ok=True)
+    deltas: List[dict] = []
+    if manifest and manifest.get("sha256") == dataset_digest(previous):
+        before = {record.codigo_validacion: _canonical_line(record.as_serializable()) for record in previous}
+        current = {record.codigo_validacion for record in records}
+        upserts = [
+            record
+            for record in records
+            if _canonical_line(record.as_serializable()) != before.get(record.codigo_validacion)
+        ]
+        removed = sorted(codigo for codigo in before if codigo not in current)
+        name = f"{version}.json"
+        payload = {"from": version - 1, "version": version, "removed": removed, "upserts": encode_columns(upserts)}
+        _write_json_atomic(directory / name, payload)
+        added = sum(record.codigo_validacion not in before for record in upserts)
+        deltas = manifest.get("deltas", []) + [
+            {
+                "from": version - 1,
+                "version": version,
+                "url": name,
+                "added": added,
+                "changed": len(upserts) - added,
+                "removed": len(removed),
+            }
+        ]
+    deltas = deltas[-keep:] if keep > 0 else []
+
+    current_files = {delta["url"] for delta in deltas}
+    for path in directory.glob("*.json"):
+        if _DELTA_NAME_RE.fullmatch(path.name) and path.name not in current_files:
+            path.unlink()
+
+    _write_json_atomic(
+        manifest_path,
+        {
+            "updated_at": datetime.now(UTC).isoformat() + "Z",
+            "version": version,
+            "records": len(records),
+            "sha256": sha256,
+            **_encoding("columnar"),
+            "deltas": deltas,
+        },
+    )
+    return version
+
+
+def load_dataset(path: Path) -> List[RemateRecord]:
+    """Lee un archivo generado por write_dataset (cualquier formato). Devuelve [] si no existe."""
+    if not path.exists():
+        return []
+    text = path.read_text(encoding="utf-8")
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        # NDJSON: un registro por línea
+        payload = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(payload, dict) and payload.get("format") == "columnar":
+        return decode_columns(payload)
+    if isinstance(payload, dict) and "records" not in payload and "codigo_validacion" in payload:
+        payload = [payload]  # NDJSON con un solo registro
+    items = payload if isinstance(payload, list) else payload.get("records", [])
+    return [RemateRecord.from_serializable(item) for item in items]
 
 
-__all__ = ["RemateRecord", "write_dataset"]
+__all__ = [
+    "COLUMNAR_VERSION",
+    "DATASET_FORMATS",
+    "DELTAS_KEPT",
+    "DICTIONARY_FIELDS",
+    "FacetCounter",
+    "FUENTE_URL_PREFIX",
+    "RemateRecord",
+    "TEXT_FIELDS",
+    "build_record",
+    "dataset_digest",
+    "decode_columns",
+    "encode_columns",
+    "facets_path_for",
+    "load_dataset",
+    "load_manifest",
+    "manifest_path_for",
+    "shard_date",
+    "shard_name",
+    "write_dataset",
+    "write_delta",
+    "write_shards",
+]
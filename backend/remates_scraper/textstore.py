@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import Collection, Dict, Optional
+
+from .parser import PARSER_VERSION, RemateDetail
+
+DEFAULT_TEXT_DIR = Path(".cache/text")
+DEFAULT_TEXT_MAX_BYTES = 200 * 1024 * 1024
+DEFAULT_TEXT_MAX_AGE_DAYS = 180
+
+_SAFE_NAME_RE = re.compile(r"[0-9A-Za-z_-]+")
+
+
+@dataclass
+class StoredText:
+    """Texto extraído de un PDF junto con los datos del listado que lo acompañaban."""
+
+    codigo_validacion: str
+    parser_version: int
+    tipo_bien: str
+    fecha_publicacion: str
+    entry: Dict
+    text: str
+    complete: bool = True
+
+    @classmethod
+    def from_detail(cls, entry: Dict, tipo_bien: str, fecha_publicacion: date, detail: RemateDetail) -> "StoredText":
+        return cls(
+            codigo_validacion=detail.codigo_validacion,
+            parser_version=PARSER_VERSION,
+            tipo_bien=tipo_bien,
+            fecha_publicacion=fecha_publicacion.isoformat(),
+            entry=entry,
+            text=detail.raw_text,
+            complete=detail.text_complete,
+        )
+
+
+class TextStore:
+    """Textos de PDFs comprimidos con gzip, uno por ``codigo_validacion``.
+
+    Cada archivo guarda la versión del parser que lo generó, de modo que el
+    subcomando ``reparse`` pueda reconstruir el dataset sin red ni pypdf
+    cuando cambia la extracción de campos.
+
+    ``evict`` nunca borra los textos de los remates que se le indican como
+    vigentes (los del dataset); de los demás quita los más antiguos que
+    ``max_age_days`` y, si aún se supera ``max_bytes``, los de escritura más
+    vieja primero.
+    """
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_TEXT_DIR,
+        *,
+        max_bytes: Optional[int] = DEFAULT_TEXT_MAX_BYTES,
+        max_age_days: Optional[int] = DEFAULT_TEXT_MAX_AGE_DAYS,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+        self.stores = 0
+
+    def _path(self, codigo_validacion: str) -> Path:
+        name = codigo_validacion
+        if not _SAFE_NAME_RE.fullmatch(name):
+            name = hashlib.sha256(codigo_validacion.encode("utf-8")).hexdigest()
+        return self.root / name[:2] / f"{name}.json.gz"
+
+    def get(self, codigo_validacion: str) -> Optional[StoredText]:
+        try:
+            raw = gzip.decompress(self._path(codigo_validacion).read_bytes())
+            return StoredText(**json.loads(raw))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, stored: StoredText) -> None:
+        path = self._path(stored.codigo_validacion)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(asdict(stored), ensure_ascii=False).encode("utf-8")
+        # mtime=0: el mismo texto produce siempre los mismos bytes
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(gzip.compress(payload, mtime=0))
+        os.replace(tmp_path, path)
+        self.stores += 1
+
+    def evict(self, keep: Collection[str] = ()) -> int:
+        """Aplica las políticas de antigüedad y tamaño. Devuelve los textos borrados."""
+        if not self.root.exists():
+            return 0
+        kept = {self._path(codigo) for codigo in keep}
+        now = time.time()
+        total = 0
+        candidates = []
+        for path in self.root.glob("*/*.json.gz"):
+            try:
+                info = path.stat()
+            except OSError:
+                continue
+            total += info.st_size
+            if path not in kept:
+                candidates.append((info.st_mtime, info.st_size, path))
+
+        removed = 0
+        candidates.sort()
+        for mtime, size, path in candidates:
+            expired = self.max_age_seconds is not None and now - mtime > self.max_age_seconds
+            oversized = self.max_bytes is not None and total > self.max_bytes
+            if not (expired or oversized):
+                # Ordenados por antigüedad: los que siguen tampoco vencieron
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+__all__ = [
+    "DEFAULT_TEXT_DIR",
+    "DEFAULT_TEXT_MAX_AGE_DAYS",
+    "DEFAULT_TEXT_MAX_BYTES",
+    "StoredText",
+    "TextStore",
+]
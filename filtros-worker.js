@@ -0,0 +1,916 @@
+// Motor de filtros de app.js, en un Web Worker: descarga y decodifica los
+// datos, arma los índices y responde cada consulta con los ids de las filas
+// que la cumplen. El hilo de la página solo pinta.
+//
+// Los visitantes que vuelven no descargan todo otra vez: el dataset queda
+// en IndexedDB con su versión y, al volver, solo se aplican los deltas
+// publicados desde esa versión (data/deltas).
+//
+// Mensajes que recibe:
+//   { tipo: "iniciar", datasetUrl, manifestUrl, shardsManifestUrl, versionesUrl }
+//   { tipo: "consulta", id, filtros }  -> "resultado" (parcial mientras llegan shards)
+//   { tipo: "filas", ids }             -> "filas" con los objetos de esas filas
+// y envía además "opciones" (valores de los selects), "actualizacion" y "error".
+
+// Shards que se piden a la vez; tras cada tanda se responde un resultado parcial
+const SHARDS_POR_TANDA = 4;
+// Filas que acompañan cada resultado, para pintar la primera pantalla sin
+// otro viaje de mensajes
+const FILAS_INICIALES = 30;
+
+// Manifiesto de shards por mes y tipo (null: se usa el dataset completo)
+let shardsManifest = null;
+const shardsCargados = new Set();
+// Descargas en curso por URL: dos consultas pueden necesitar el mismo shard
+const descargas = new Map();
+// Id de la última consulta recibida; las anteriores se abandonan
+let ultimaConsulta = 0;
+// Carga inicial (cache, manifiesto de shards o dataset completo)
+let listo = null;
+// Manifiesto de versiones y deltas (null: sin cache local)
+let versiones = null;
+let guardandoCache = false;
+
+// Base de IndexedDB con la tabla de la última versión vista
+const BASE_DATOS = "remates";
+const ALMACEN = "dataset";
+// Cambia si cambia la forma de la tabla guardada: las anteriores se descartan
+const ESQUEMA_CACHE = 1;
+
+self.addEventListener("message", (event) => {
+  const mensaje = event.data;
+  if (mensaje.tipo === "iniciar") {
+    listo = iniciar(mensaje);
+  } else if (mensaje.tipo === "consulta") {
+    ultimaConsulta = mensaje.id;
+    // Se cede un turno: si detrás venía otra consulta (escritura rápida),
+    // esta ya quedó vieja y no se calcula
+    setTimeout(() => responderConsulta(mensaje), 0);
+  } else if (mensaje.tipo === "filas") {
+    self.postMessage({ tipo: "filas", filas: mensaje.ids.filter((i) => i < tabla.n).map((i) => [i, fila(i)]) });
+  }
+});
+
+// --- Cargar datos: cache local, shards si existen, si no data/remates.json --- //
+async function iniciar({ datasetUrl, manifestUrl, shardsManifestUrl, versionesUrl }) {
+  try {
+    versiones = await cargarVersiones(versionesUrl);
+    if (await cargarDesdeCache(versionesUrl)) return;
+    shardsManifest = await cargarManifiestoShards(shardsManifestUrl);
+    if (shardsManifest) {
+      enviarOpciones();
+      self.postMessage({ tipo: "actualizacion", updatedAt: shardsManifest.updated_at });
+    } else {
+      await cargarDatasetCompleto(datasetUrl, manifestUrl);
+      guardarCache();
+    }
+  } catch (err) {
+    console.error(err);
+    self.postMessage({
+      tipo: "error",
+      mensaje: "No se pudo cargar data/remates.json. Verifica que exista y tenga formato correcto.",
+    });
+    throw err;
+  }
+}
+
+async function cargarManifiestoShards(url) {
+  try {
+    const res = await fetch(url, { cache: "no-cache" });
+    if (!res.ok) return null;
+    const manifest = await res.json();
+    if (!Array.isArray(manifest.shards)) return null;
+    // Las URLs del manifiesto son relativas al propio manifiesto
+    manifest.shards.forEach((shard) => {
+      shard.url = new URL(shard.url, url).href;
+    });
+    return manifest;
+  } catch (err) {
+    console.warn("Sin manifiesto de shards; se carga el dataset completo", err);
+    return null;
+  }
+}
+
+async function cargarDatasetCompleto(datasetUrl, manifestUrl) {
+  const res = await fetch(datasetUrl);
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+
+  const payload = parsearDataset(await res.text());
+
+  tabla = tablaVacia();
+  agregarBloque(bloqueDesdePayload(payload));
+  reconstruirIndices();
+  enviarOpciones();
+
+  // La fecha viene de data/remates.manifest.json. Los datasets antiguos
+  // traían updated_at dentro del propio JSON; se usa solo si el manifiesto
+  // no está disponible.
+  let updatedAt = payload.updated_at;
+  try {
+    const resManifest = await fetch(manifestUrl, { cache: "no-cache" });
+    if (resManifest.ok) {
+      const manifest = await resManifest.json();
+      updatedAt = manifest.updated_at || updatedAt;
+    }
+  } catch (err) {
+    console.warn("No se pudo leer data/remates.manifest.json", err);
+  }
+  self.postMessage({ tipo: "actualizacion", updatedAt });
+}
+
+// --- Cache local (IndexedDB) y deltas --- //
+async function cargarVersiones(url) {
+  if (!url || !self.indexedDB) return null;
+  try {
+    const res = await fetch(url, { cache: "no-cache" });
+    if (!res.ok) return null;
+    const manifest = await res.json();
+    return Number.isInteger(manifest.version) ? manifest : null;
+  } catch (err) {
+    // Sin red se usa lo que haya en la cache, sea cual sea su versión
+    console.warn("Sin manifiesto de versiones", err);
+    return null;
+  }
+}
+
+function abrirBase() {
+  return new Promise((resolve, reject) => {
+    const pedido = self.indexedDB.open(BASE_DATOS, 1);
+    pedido.onupgradeneeded = () => pedido.result.createObjectStore(ALMACEN);
+    pedido.onsuccess = () => resolve(pedido.result);
+    pedido.onerror = () => reject(pedido.error);
+  });
+}
+
+async function leerCache() {
+  const base = await abrirBase();
+  return new Promise((resolve, reject) => {
+    const pedido = base.transaction(ALMACEN, "readonly").objectStore(ALMACEN).get("actual");
+    pedido.onsuccess = () => resolve(pedido.result);
+    pedido.onerror = () => reject(pedido.error);
+  });
+}
+
+async function escribirCache(contenido) {
+  const base = await abrirBase();
+  return new Promise((resolve, reject) => {
+    const transaccion = base.transaction(ALMACEN, "readwrite");
+    transaccion.objectStore(ALMACEN).put(contenido, "actual");
+    transaccion.oncomplete = () => resolve();
+    transaccion.onerror = () => reject(transaccion.error);
+  });
+}
+
+// Usa la tabla guardada, aplicando los deltas que falten. Devuelve false si
+// no hay cache utilizable (y entonces se descarga todo).
+async function cargarDesdeCache(versionesUrl) {
+  if (!self.indexedDB) return false;
+  let guardada;
+  try {
+    guardada = await leerCache();
+  } catch (err) {
+    console.warn("No se pudo leer la cache local", err);
+    return false;
+  }
+  if (!guardada || guardada.esquema !== ESQUEMA_CACHE) return false;
+
+  const deltas = [];
+  if (versiones && versiones.version !== guardada.version) {
+    // Deltas desde la versión guardada hasta la vigente, sin saltos
+    let desde = guardada.version;
+    versiones.deltas.forEach((delta) => {
+      if (delta.from === desde) {
+        deltas.push(delta);
+        desde = delta.version;
+      }
+    });
+    if (desde !== versiones.version) return false;
+  }
+
+  tablaDesdeCache(guardada.tabla);
+  if (deltas.length) {
+    try {
+      const contenidos = await Promise.all(
+        deltas.map(async (delta) => {
+          const res = await fetch(new URL(delta.url, versionesUrl).href);
+          if (!res.ok) throw new Error(`HTTP ${res.status} en ${delta.url}`);
+          return res.json();
+        })
+      );
+      contenidos.forEach(aplicarDelta);
+    } catch (err) {
+      console.warn("No se pudieron aplicar los deltas; se descarga todo", err);
+      tabla = tablaVacia();
+      return false;
+    }
+    if (tabla.n !== versiones.records) {
+      tabla = tablaVacia();
+      return false;
+    }
+  }
+  reconstruirIndices();
+  enviarOpciones();
+  const updatedAt = versiones ? versiones.updated_at : guardada.updatedAt;
+  self.postMessage({ tipo: "actualizacion", updatedAt });
+  if (deltas.length) guardarCache();
+  return true;
+}
+
+// Guarda la tabla completa con la versión del manifiesto. Con shards se
+// espera a tenerlos todos (se descargan después del primer resultado).
+async function guardarCache() {
+  if (!versiones || guardandoCache) return;
+  guardandoCache = true;
+  try {
+    if (shardsManifest) {
+      await cargarShards(shardsManifest.shards, () => true, () => {});
+    }
+    // Un dataset publicado entre la lectura del manifiesto y la de los
+    // datos no corresponde a la versión anotada: mejor no guardarlo
+    if (tabla.n !== versiones.records) return;
+    await escribirCache({
+      esquema: ESQUEMA_CACHE,
+      version: versiones.version,
+      updatedAt: versiones.updated_at,
+      tabla: tablaParaCache(),
+    });
+  } catch (err) {
+    console.warn("No se pudo guardar la cache local", err);
+  }
+}
+
+// Quita los remates borrados o modificados y agrega los nuevos o modificados
+function aplicarDelta(delta) {
+  const bloque = bloqueDesdePayload(delta.upserts);
+  const quitar = new Set(delta.removed);
+  (bloque.texto.codigo_validacion || []).forEach((codigo) => quitar.add(codigo));
+  quitarFilas(quitar);
+  agregarBloque(bloque);
+}
+
+// Shards que pueden tener remates para los filtros (tipo y rango de fechas)
+function shardsParaFiltros(filtros) {
+  return shardsManifest.shards.filter((shard) => {
+    if (filtros.tipo && shard.tipo_bien !== filtros.tipo) return false;
+    if (filtros.desde && shard.date_to < filtros.desde) return false;
+    if (filtros.hasta && shard.date_from > filtros.hasta) return false;
+    return true;
+  });
+}
+
+function descargarShard(shard) {
+  if (!descargas.has(shard.url)) {
+    const descarga = fetch(shard.url)
+      .then(async (res) => {
+        if (!res.ok) throw new Error(`HTTP ${res.status} en ${shard.url}`);
+        return parsearDataset(await res.text());
+      })
+      .finally(() => descargas.delete(shard.url));
+    descargas.set(shard.url, descarga);
+  }
+  return descargas.get(shard.url);
+}
+
+// Descarga los shards que falten (los más recientes primero, por tandas).
+// Se detiene si la consulta que los pidió deja de estar vigente.
+async function cargarShards(shards, vigente, alAvanzar) {
+  const pendientes = shards.filter((shard) => !shardsCargados.has(shard.url));
+  for (let i = 0; i < pendientes.length && vigente(); i += SHARDS_POR_TANDA) {
+    const tanda = pendientes.slice(i, i + SHARDS_POR_TANDA);
+    const contenidos = await Promise.all(tanda.map(descargarShard));
+    let nuevos = 0;
+    tanda.forEach((shard, j) => {
+      if (shardsCargados.has(shard.url)) return;
+      shardsCargados.add(shard.url);
+      agregarBloque(bloqueDesdePayload(contenidos[j]));
+      nuevos += 1;
+    });
+    if (!nuevos) continue;
+    reconstruirIndices();
+    enviarOpciones();
+    alAvanzar();
+  }
+}
+
+// --- Consultas --- //
+async function responderConsulta({ id, filtros }) {
+  if (id !== ultimaConsulta) return;
+  try {
+    await listo;
+  } catch (err) {
+    return;
+  }
+  const vigente = () => id === ultimaConsulta;
+  const consulta = {
+    ...filtros,
+    // Sin acentos ni mayúsculas, como --keywords en la línea de comandos
+    palabras: normalizarTexto(filtros.busqueda).split(" ").filter(Boolean),
+  };
+
+  if (shardsManifest) {
+    // Solo se descargan los shards que se cruzan con el tipo y las fechas;
+    // se responde tras cada tanda, así la primera vista no espera a todo.
+    try {
+      await cargarShards(shardsParaFiltros(consulta), vigente, () => {
+        if (vigente()) enviarResultado(id, consulta, true);
+      });
+    } catch (err) {
+      console.error(err);
+      self.postMessage({
+        tipo: "error",
+        mensaje: "No se pudieron cargar todos los remates; se muestran los disponibles.",
+      });
+    }
+  }
+  if (vigente()) enviarResultado(id, consulta, false);
+}
+
+function enviarResultado(id, consulta, parcial) {
+  // Tras el primer resultado completo se bajan los shards que falten para
+  // guardar el dataset en la cache local
+  if (!parcial && shardsManifest) guardarCache();
+  const ids = Uint32Array.from(filtrarFilas(consulta));
+  const filasIniciales = Array.from(ids.subarray(0, FILAS_INICIALES), (i) => [i, fila(i)]);
+  self.postMessage({ tipo: "resultado", id, parcial, ids, filas: filasIniciales }, [ids.buffer]);
+}
+
+// Valores de los selects de tipo, región y comuna
+function enviarOpciones() {
+  const tipos = new Set();
+  // Con shards, los tipos salen del manifiesto aunque aún no se hayan cargado
+  if (shardsManifest) {
+    shardsManifest.shards.forEach((shard) => {
+      if (shard.tipo_bien) tipos.add(shard.tipo_bien);
+    });
+  }
+  // Los diccionarios de la tabla ya tienen los valores distintos
+  const valores = (campo, destino = new Set()) => {
+    tabla.diccionarios[campo].valores.forEach((v) => {
+      if (v) destino.add(v);
+    });
+    return Array.from(destino);
+  };
+  self.postMessage({
+    tipo: "opciones",
+    tipos: valores("tipo_bien", tipos),
+    regiones: valores("region"),
+    comunas: valores("comuna"),
+  });
+}
+
+// --- Interpretar el texto del dataset: JSON o NDJSON --- //
+function parsearDataset(texto) {
+  try {
+    return JSON.parse(texto);
+  } catch (err) {
+    return texto
+      .split("\n")
+      .filter((linea) => linea.trim())
+      .map((linea) => JSON.parse(linea));
+  }
+}
+
+// --- Almacén columnar --- //
+// Los remates cargados viven en columnas: los campos repetidos como códigos
+// de un diccionario y las fechas y el valor mínimo en arreglos tipados. Los
+// filtros de fecha y precio usan búsqueda binaria sobre índices ordenados y
+// los objetos por remate se arman solo para los resultados.
+const CAMPOS_DICCIONARIO = [
+  "tipo_bien",
+  "tipo_procedimiento",
+  "tribunal",
+  "liquidador",
+  "region",
+  "comuna",
+  "comision",
+  "ente_publicador",
+  "procedimiento",
+];
+const CAMPOS_TEXTO = [
+  "codigo_validacion",
+  "rol_causa",
+  "deudor_nombre",
+  "deudor_rut",
+  "direccion",
+  "descripcion",
+  "tipo_bienes",
+];
+// Mismos campos que SEARCH_FIELDS en backend/remates_scraper/search.py
+const CAMPOS_BUSQUEDA = [
+  "tipo_bien",
+  "deudor_nombre",
+  "region",
+  "comuna",
+  "direccion",
+  "tipo_procedimiento",
+  "procedimiento",
+  "fecha_publicacion",
+  "fecha_remate",
+  "valor_minimo",
+  "descripcion",
+  "tipo_bienes",
+];
+const SEGUNDOS_DIA = 86400;
+// fecha_remate sin valor en el formato columnar hasta la versión 2 (uint32);
+// desde la 3 es float64 y llega como NaN
+const SIN_FECHA_REMATE = 0xffffffff;
+const ARREGLOS_TIPADOS = {
+  uint8: Uint8Array,
+  uint16: Uint16Array,
+  uint32: Uint32Array,
+  int32: Int32Array,
+  float64: Float64Array,
+};
+
+// Objetos ya armados, por fila de la tabla
+let filas = [];
+let tabla = tablaVacia();
+
+function tablaVacia() {
+  filas = [];
+  const diccionarios = {};
+  CAMPOS_DICCIONARIO.forEach((campo) => {
+    diccionarios[campo] = { valores: [], indice: new Map(), codigos: new Uint32Array(0) };
+  });
+  const texto = {};
+  CAMPOS_TEXTO.forEach((campo) => {
+    texto[campo] = [];
+  });
+  return {
+    n: 0,
+    texto,
+    diccionarios,
+    fuenteUrl: [],
+    // Índice de palabras de cada bloque: { inicio, tokens, offsets, postings, cache }
+    indices: [],
+    fechaPublicacion: new Float64Array(0), // días desde 1970
+    fechaRemate: new Float64Array(0), // segundos desde 1970 (NaN si falta)
+    valorMinimo: new Float64Array(0), // NaN si falta
+    // Derivados (reconstruirIndices)
+    fechaClave: new Float64Array(0),
+    orden: new Uint32Array(0),
+    posicion: new Uint32Array(0),
+    porFecha: new Uint32Array(0),
+    fechasOrdenadas: new Float64Array(0),
+    porValor: new Uint32Array(0),
+    valoresOrdenados: new Float64Array(0),
+  };
+}
+
+function diasDesdeIso(iso) {
+  if (!iso) return NaN;
+  return Date.UTC(+iso.slice(0, 4), +iso.slice(5, 7) - 1, +iso.slice(8, 10)) / 86400000;
+}
+
+function segundosDesdeIso(iso) {
+  if (!iso) return NaN;
+  return Date.parse(`${iso.slice(0, 19)}Z`) / 1000;
+}
+
+function decodificarNumeros(columna) {
+  const binario = atob(columna.data);
+  const bytes = new Uint8Array(binario.length);
+  for (let i = 0; i < binario.length; i++) bytes[i] = binario.charCodeAt(i);
+  return new ARREGLOS_TIPADOS[columna.dtype](bytes.buffer);
+}
+
+// Un bloque tiene las mismas columnas que la tabla, con diccionarios propios
+function bloqueDesdePayload(payload) {
+  if (payload && payload.format === "columnar") return bloqueColumnar(payload);
+  // array simple, objeto { records: [...] } o NDJSON (que parsearDataset
+  // convierte en array)
+  if (Array.isArray(payload)) return bloqueDesdeFilas(payload);
+  return bloqueDesdeFilas(Array.isArray(payload?.records) ? payload.records : []);
+}
+
+function bloqueColumnar(payload) {
+  const { columns, count } = payload;
+  const bloque = { n: count, texto: {}, diccionarios: {} };
+  Object.entries(columns).forEach(([campo, columna]) => {
+    if (Array.isArray(columna)) {
+      bloque.texto[campo] = columna;
+    } else if (Array.isArray(columna.values)) {
+      bloque.diccionarios[campo] = { valores: columna.values, codigos: decodificarNumeros(columna) };
+    }
+  });
+  bloque.fechaPublicacion = Float64Array.from(decodificarNumeros(columns.fecha_publicacion));
+  bloque.fechaRemate = Float64Array.from(decodificarNumeros(columns.fecha_remate), (s) =>
+    s === SIN_FECHA_REMATE ? NaN : s
+  );
+  bloque.valorMinimo = decodificarNumeros(columns.valor_minimo);
+  // La URL del PDF se deriva del código, salvo las excepciones guardadas
+  const excepciones = payload.url_overrides || {};
+  bloque.fuenteUrl = (bloque.texto.codigo_validacion || []).map(
+    (codigo, i) => excepciones[i] ?? `${payload.url_prefix}${codigo}`
+  );
+  bloque.busqueda = payload.search ? indiceColumnar(payload.search) : indiceDesdeBloque(bloque);
+  return bloque;
+}
+
+// Las listas de cada token vienen como diferencias con la posición anterior
+function indiceColumnar(busqueda) {
+  const offsets = decodificarNumeros(busqueda.offsets);
+  const saltos = decodificarNumeros(busqueda.postings);
+  const postings = new Uint32Array(saltos.length);
+  for (let t = 0; t + 1 < offsets.length; t++) {
+    let posicion = 0;
+    for (let p = offsets[t]; p < offsets[t + 1]; p++) {
+      posicion += saltos[p];
+      postings[p] = posicion;
+    }
+  }
+  return { tokens: busqueda.tokens, offsets, postings };
+}
+
+function bloqueDesdeFilas(lista) {
+  const n = lista.length;
+  const bloque = {
+    n,
+    texto: {},
+    diccionarios: {},
+    fechaPublicacion: new Float64Array(n),
+    fechaRemate: new Float64Array(n),
+    valorMinimo: new Float64Array(n),
+    fuenteUrl: lista.map((r) => r.fuente_url ?? null),
+  };
+  CAMPOS_TEXTO.forEach((campo) => {
+    bloque.texto[campo] = lista.map((r) => r[campo] ?? null);
+  });
+  CAMPOS_DICCIONARIO.forEach((campo) => {
+    const indice = new Map();
+    const codigos = new Uint32Array(n);
+    lista.forEach((r, i) => {
+      const valor = r[campo] ?? null;
+      if (!indice.has(valor)) indice.set(valor, indice.size);
+      codigos[i] = indice.get(valor);
+    });
+    bloque.diccionarios[campo] = { valores: Array.from(indice.keys()), codigos };
+  });
+  lista.forEach((r, i) => {
+    bloque.fechaPublicacion[i] = diasDesdeIso(r.fecha_publicacion);
+    bloque.fechaRemate[i] = segundosDesdeIso(r.fecha_remate);
+    bloque.valorMinimo[i] =
+      r.valor_minimo === null || r.valor_minimo === undefined || r.valor_minimo === ""
+        ? NaN
+        : Number(r.valor_minimo);
+  });
+  bloque.busqueda = indiceDesdeBloque(bloque);
+  return bloque;
+}
+
+// --- Búsqueda de palabras --- //
+// Igual que normalize_text en Python: sin acentos, minúsculas y un espacio
+// entre palabras.
+function normalizarTexto(valor) {
+  if (!valor) return "";
+  return valor
+    .normalize("NFKD")
+    .replace(/[^\x00-\x7f]/g, "")
+    .toLowerCase()
+    .split(/[\t\n\v\f\r \x1c-\x1f]+/)
+    .filter(Boolean)
+    .join(" ");
+}
+
+// Texto de un campo como lo arma field_to_text en Python
+function textoCampo(bloque, campo, i) {
+  if (campo === "fecha_publicacion") {
+    const dias = bloque.fechaPublicacion[i];
+    return Number.isNaN(dias) ? "" : isoDia(dias);
+  }
+  if (campo === "fecha_remate") {
+    const segundos = bloque.fechaRemate[i];
+    return Number.isNaN(segundos) ? "" : new Date(segundos * 1000).toISOString().slice(0, 16).replace("T", " ");
+  }
+  if (campo === "valor_minimo") {
+    const valor = bloque.valorMinimo[i];
+    return Number.isNaN(valor) ? "" : String(valor);
+  }
+  const dic = bloque.diccionarios[campo];
+  const valor = dic ? dic.valores[dic.codigos[i]] : bloque.texto[campo]?.[i];
+  return valor === null || valor === undefined ? "" : String(valor);
+}
+
+// Índice invertido armado en el navegador (datasets sin índice precalculado)
+function indiceDesdeBloque(bloque) {
+  const listas = new Map();
+  for (let i = 0; i < bloque.n; i++) {
+    const texto = normalizarTexto(CAMPOS_BUSQUEDA.map((campo) => textoCampo(bloque, campo, i)).join(" "));
+    new Set(texto.split(" ")).forEach((token) => {
+      if (!token) return;
+      if (!listas.has(token)) listas.set(token, []);
+      listas.get(token).push(i);
+    });
+  }
+  const tokens = Array.from(listas.keys());
+  const offsets = new Uint32Array(tokens.length + 1);
+  tokens.forEach((token, t) => {
+    offsets[t + 1] = offsets[t] + listas.get(token).length;
+  });
+  const postings = new Uint32Array(offsets[tokens.length]);
+  tokens.forEach((token, t) => postings.set(listas.get(token), offsets[t]));
+  return { tokens, offsets, postings };
+}
+
+// Tokens del índice que contienen la palabra (como en filter_records, la
+// palabra puede estar en cualquier parte del token, no solo al inicio)
+function tokensConPalabra(indice, palabra) {
+  let encontrados = indice.cache.get(palabra);
+  if (encontrados) return encontrados;
+  // Mientras se escribe, los tokens de la palabra sin su última letra ya
+  // incluyen a todos los candidatos: basta revisar esos
+  const previos = indice.cache.get(palabra.slice(0, -1));
+  encontrados = [];
+  if (previos) {
+    previos.forEach((t) => {
+      if (indice.tokens[t].includes(palabra)) encontrados.push(t);
+    });
+  } else {
+    indice.tokens.forEach((token, t) => {
+      if (token.includes(palabra)) encontrados.push(t);
+    });
+  }
+  if (indice.cache.size > 500) indice.cache.clear();
+  indice.cache.set(palabra, encontrados);
+  return encontrados;
+}
+
+// Filas que contienen todas las palabras: intersección de las listas del índice
+function filasConPalabras(palabras) {
+  // cumplidas[i] = cuántas palabras seguidas (desde la primera) tiene la fila i
+  const cumplidas = new Uint16Array(tabla.n);
+  const ids = [];
+  palabras.forEach((palabra, k) => {
+    tabla.indices.forEach((indice) => {
+      tokensConPalabra(indice, palabra).forEach((t) => {
+        for (let p = indice.offsets[t]; p < indice.offsets[t + 1]; p++) {
+          const i = indice.inicio + indice.postings[p];
+          if (cumplidas[i] !== k) continue;
+          cumplidas[i] = k + 1;
+          if (k + 1 === palabras.length) ids.push(i);
+        }
+      });
+    });
+  });
+  return {
+    filas: Uint32Array.from(ids),
+    contiene: (i) => cumplidas[i] === palabras.length,
+  };
+}
+
+function concatenar(Tipo, a, b) {
+  const resultado = new Tipo(a.length + b.length);
+  resultado.set(a);
+  resultado.set(b, a.length);
+  return resultado;
+}
+
+// Agrega un bloque al final de la tabla (las filas ya cargadas no cambian de índice)
+function agregarBloque(bloque) {
+  const inicio = tabla.n;
+  CAMPOS_TEXTO.forEach((campo) => {
+    tabla.texto[campo] = tabla.texto[campo].concat(bloque.texto[campo] || new Array(bloque.n).fill(null));
+  });
+  CAMPOS_DICCIONARIO.forEach((campo) => {
+    const global = tabla.diccionarios[campo];
+    const local = bloque.diccionarios[campo] || { valores: [null], codigos: new Uint8Array(bloque.n) };
+    // Traduce los códigos del bloque al diccionario de la tabla
+    const traduccion = local.valores.map((valor) => {
+      if (!global.indice.has(valor)) {
+        global.indice.set(valor, global.valores.length);
+        global.valores.push(valor);
+      }
+      return global.indice.get(valor);
+    });
+    const codigos = new Uint32Array(inicio + bloque.n);
+    codigos.set(global.codigos);
+    for (let i = 0; i < bloque.n; i++) codigos[inicio + i] = traduccion[local.codigos[i]];
+    global.codigos = codigos;
+  });
+  tabla.fuenteUrl = tabla.fuenteUrl.concat(bloque.fuenteUrl);
+  tabla.indices.push({ inicio, ...bloque.busqueda, cache: new Map() });
+  tabla.fechaPublicacion = concatenar(Float64Array, tabla.fechaPublicacion, bloque.fechaPublicacion);
+  tabla.fechaRemate = concatenar(Float64Array, tabla.fechaRemate, bloque.fechaRemate);
+  tabla.valorMinimo = concatenar(Float64Array, tabla.valorMinimo, bloque.valorMinimo);
+  tabla.n = inicio + bloque.n;
+}
+
+// Quita de la tabla las filas con esos códigos; las demás se renumeran
+function quitarFilas(codigos) {
+  const nuevas = new Int32Array(tabla.n).fill(-1);
+  const conservadas = [];
+  tabla.texto.codigo_validacion.forEach((codigo, i) => {
+    if (codigos.has(codigo)) return;
+    nuevas[i] = conservadas.length;
+    conservadas.push(i);
+  });
+  if (conservadas.length === tabla.n) return;
+
+  CAMPOS_TEXTO.forEach((campo) => {
+    const columna = tabla.texto[campo];
+    tabla.texto[campo] = conservadas.map((i) => columna[i]);
+  });
+  CAMPOS_DICCIONARIO.forEach((campo) => {
+    const dic = tabla.diccionarios[campo];
+    dic.codigos = Uint32Array.from(conservadas, (i) => dic.codigos[i]);
+  });
+  tabla.fuenteUrl = conservadas.map((i) => tabla.fuenteUrl[i]);
+  tabla.fechaPublicacion = Float64Array.from(conservadas, (i) => tabla.fechaPublicacion[i]);
+  tabla.fechaRemate = Float64Array.from(conservadas, (i) => tabla.fechaRemate[i]);
+  tabla.valorMinimo = Float64Array.from(conservadas, (i) => tabla.valorMinimo[i]);
+  // Las listas del índice de palabras pasan a posiciones absolutas nuevas
+  tabla.indices = tabla.indices.map((indice) => {
+    const offsets = new Uint32Array(indice.offsets.length);
+    const postings = [];
+    for (let t = 0; t + 1 < indice.offsets.length; t++) {
+      for (let p = indice.offsets[t]; p < indice.offsets[t + 1]; p++) {
+        const i = nuevas[indice.inicio + indice.postings[p]];
+        if (i >= 0) postings.push(i);
+      }
+      offsets[t + 1] = postings.length;
+    }
+    return { inicio: 0, tokens: indice.tokens, offsets, postings: Uint32Array.from(postings), cache: new Map() };
+  });
+  tabla.n = conservadas.length;
+  filas = [];
+}
+
+// Columnas de la tabla (sin los derivados ni los Map) para IndexedDB
+function tablaParaCache() {
+  const diccionarios = {};
+  CAMPOS_DICCIONARIO.forEach((campo) => {
+    const { valores, codigos } = tabla.diccionarios[campo];
+    diccionarios[campo] = { valores, codigos };
+  });
+  return {
+    n: tabla.n,
+    texto: tabla.texto,
+    diccionarios,
+    fuenteUrl: tabla.fuenteUrl,
+    indices: tabla.indices.map(({ inicio, tokens, offsets, postings }) => ({ inicio, tokens, offsets, postings })),
+    fechaPublicacion: tabla.fechaPublicacion,
+    fechaRemate: tabla.fechaRemate,
+    valorMinimo: tabla.valorMinimo,
+  };
+}
+
+function tablaDesdeCache(guardada) {
+  tabla = tablaVacia();
+  Object.assign(tabla, {
+    n: guardada.n,
+    texto: guardada.texto,
+    fuenteUrl: guardada.fuenteUrl,
+    indices: guardada.indices.map((indice) => ({ ...indice, cache: new Map() })),
+    fechaPublicacion: guardada.fechaPublicacion,
+    fechaRemate: guardada.fechaRemate,
+    valorMinimo: guardada.valorMinimo,
+  });
+  CAMPOS_DICCIONARIO.forEach((campo) => {
+    const { valores, codigos } = guardada.diccionarios[campo];
+    tabla.diccionarios[campo] = { valores, codigos, indice: new Map(valores.map((valor, i) => [valor, i])) };
+  });
+}
+
+// Filas ordenadas por clave (sin las que no tienen valor) y sus claves
+function indiceOrdenado(claves) {
+  const conValor = [];
+  for (let i = 0; i < claves.length; i++) if (!Number.isNaN(claves[i])) conValor.push(i);
+  const ids = Uint32Array.from(conValor).sort((a, b) => claves[a] - claves[b]);
+  return [ids, Float64Array.from(ids, (i) => claves[i])];
+}
+
+function reconstruirIndices() {
+  const n = tabla.n;
+  const publicacion = tabla.fechaPublicacion;
+  const codigos = tabla.texto.codigo_validacion;
+
+  // Mismo orden que el dataset: publicación y código, del más nuevo al más antiguo
+  const orden = new Uint32Array(n);
+  for (let i = 0; i < n; i++) orden[i] = i;
+  orden.sort((a, b) => {
+    if (publicacion[a] !== publicacion[b]) return publicacion[b] - publicacion[a];
+    if (codigos[a] === codigos[b]) return 0;
+    return codigos[a] < codigos[b] ? 1 : -1;
+  });
+  tabla.orden = orden;
+  tabla.posicion = new Uint32Array(n);
+  orden.forEach((fila, pos) => {
+    tabla.posicion[fila] = pos;
+  });
+
+  // Fecha del filtro: la del remate o, si falta, el inicio del día de publicación
+  tabla.fechaClave = new Float64Array(n);
+  for (let i = 0; i < n; i++) {
+    const remate = tabla.fechaRemate[i];
+    tabla.fechaClave[i] = Number.isNaN(remate) ? publicacion[i] * SEGUNDOS_DIA : remate;
+  }
+  [tabla.porFecha, tabla.fechasOrdenadas] = indiceOrdenado(tabla.fechaClave);
+  [tabla.porValor, tabla.valoresOrdenados] = indiceOrdenado(tabla.valorMinimo);
+}
+
+// Primer índice de ``claves`` (ordenadas) con valor >= x, o > x si ``estricto``
+function buscarBinario(claves, x, estricto) {
+  let bajo = 0;
+  let alto = claves.length;
+  while (bajo < alto) {
+    const medio = (bajo + alto) >>> 1;
+    if (claves[medio] < x || (estricto && claves[medio] === x)) bajo = medio + 1;
+    else alto = medio;
+  }
+  return bajo;
+}
+
+function rangoOrdenado(ids, ordenadas, claves, min, max) {
+  const desde = buscarBinario(ordenadas, min, false);
+  const hasta = buscarBinario(ordenadas, max, true);
+  return {
+    filas: ids.subarray(desde, Math.max(desde, hasta)),
+    contiene: (i) => claves[i] >= min && claves[i] <= max,
+  };
+}
+
+function isoDia(dias) {
+  return new Date(dias * 86400000).toISOString().slice(0, 10);
+}
+
+// Arma (y recuerda) el objeto de una fila, con los mismos campos del JSON
+function fila(i) {
+  if (filas[i]) return filas[i];
+  const r = {};
+  CAMPOS_TEXTO.forEach((campo) => {
+    r[campo] = tabla.texto[campo][i];
+  });
+  CAMPOS_DICCIONARIO.forEach((campo) => {
+    const dic = tabla.diccionarios[campo];
+    r[campo] = dic.valores[dic.codigos[i]];
+  });
+  const publicacion = tabla.fechaPublicacion[i];
+  const remate = tabla.fechaRemate[i];
+  const valor = tabla.valorMinimo[i];
+  r.fecha_publicacion = Number.isNaN(publicacion) ? null : isoDia(publicacion);
+  r.fecha_remate = Number.isNaN(remate) ? null : new Date(remate * 1000).toISOString().slice(0, 19);
+  r.valor_minimo = Number.isNaN(valor) ? null : valor;
+  r.fuente_url = tabla.fuenteUrl[i];
+  filas[i] = r;
+  return r;
+}
+
+
+// Índices de las filas que cumplen los filtros, en el orden del dataset
+function filtrarFilas({ tipo, region, comuna, desde, hasta, precioMin, precioMax, palabras }) {
+  // Candidatos: rangos de fecha y precio por búsqueda binaria y filas con
+  // las palabras según el índice invertido
+  const candidatos = [];
+  if (palabras.length > 0) candidatos.push(filasConPalabras(palabras));
+  if (desde || hasta) {
+    // fecha_remate o fecha_publicacion (inicio del día), en segundos
+    const min = desde ? diasDesdeIso(desde) * SEGUNDOS_DIA : -Infinity;
+    const max = hasta ? (diasDesdeIso(hasta) + 1) * SEGUNDOS_DIA - 1 : Infinity;
+    candidatos.push(rangoOrdenado(tabla.porFecha, tabla.fechasOrdenadas, tabla.fechaClave, min, max));
+  }
+  if (precioMin !== null || precioMax !== null) {
+    candidatos.push(
+      rangoOrdenado(
+        tabla.porValor,
+        tabla.valoresOrdenados,
+        tabla.valorMinimo,
+        precioMin ?? -Infinity,
+        precioMax ?? Infinity
+      )
+    );
+  }
+
+  // Tipo, región y comuna: se compara el código del diccionario
+  const columnas = [];
+  const buscados = [];
+  for (const [campo, valor] of [
+    ["tipo_bien", tipo],
+    ["region", region],
+    ["comuna", comuna],
+  ]) {
+    if (!valor) continue;
+    const dic = tabla.diccionarios[campo];
+    if (!dic.indice.has(valor)) return [];
+    columnas.push(dic.codigos);
+    buscados.push(dic.indice.get(valor));
+  }
+
+  // Se recorre el grupo de candidatos más chico; el resto se comprueba fila por fila
+  candidatos.sort((a, b) => a.filas.length - b.filas.length);
+  const base = candidatos.length ? candidatos[0].filas : tabla.orden;
+  const resultado = [];
+  recorrido: for (let k = 0; k < base.length; k++) {
+    const i = base[k];
+    for (let c = 0; c < columnas.length; c++) {
+      if (columnas[c][i] !== buscados[c]) continue recorrido;
+    }
+    for (let j = 1; j < candidatos.length; j++) {
+      if (!candidatos[j].contiene(i)) continue recorrido;
+    }
+    resultado.push(i);
+  }
+  if (candidatos.length) {
+    resultado.sort((a, b) => tabla.posicion[a] - tabla.posicion[b]);
+  }
+  return resultado;
+}
@@ -0,0 +1,54 @@
+// Service worker del sitio: guarda la página, los scripts y el logo para
+// abrir sin red y sin esperar al servidor. Los datos no pasan por aquí:
+// filtros-worker.js los guarda en IndexedDB y se actualiza con deltas.
+
+// Cambiar el nombre al cambiar la lista para que se borre la cache anterior
+const CACHE = "remates-app-v1";
+const ARCHIVOS = ["./", "index.html", "app.js", "filtros-worker.js", "assets/brc-logo.svg"];
+
+self.addEventListener("install", (event) => {
+  event.waitUntil(
+    caches
+      .open(CACHE)
+      .then((cache) => cache.addAll(ARCHIVOS))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener("activate", (event) => {
+  event.waitUntil(
+    caches
+      .keys()
+      .then((nombres) => Promise.all(nombres.filter((n) => n !== CACHE).map((n) => caches.delete(n))))
+      .then(() => self.clients.claim())
+  );
+});
+
+// Se responde con lo guardado y se actualiza en segundo plano: la próxima
+// visita ya trae la versión nueva de la página
+self.addEventListener("fetch", (event) => {
+  const { request } = event;
+  const url = new URL(request.url);
+  if (request.method !== "GET" || url.origin !== self.location.origin) return;
+  if (url.pathname.includes("/data/")) return;
+
+  event.respondWith(
+    caches.open(CACHE).then(async (cache) => {
+      const guardada = await cache.match(request);
+      const red = fetch(request)
+        .then((respuesta) => {
+          if (respuesta.ok) cache.put(request, respuesta.clone());
+          return respuesta;
+        })
+        .catch((err) => {
+          if (guardada) return guardada;
+          throw err;
+        });
+      if (guardada) {
+        event.waitUntil(red.catch(() => {}));
+        return guardada;
+      }
+      return red;
+    })
+  );
+});